@@ -4,7 +4,8 @@ Implements a minimal, PRD-aligned surface without introducing a framework.
 
 Routes:
 - GET  /v1/health
-- POST /v1/analyze
+- POST /v1/analyze  (optional "multi_card": true for binder pages / spreads,
+                     or "front_images": [...] for burst captures of one card)
 - POST /v1/grade
 
 Auth:
@@ -25,17 +26,22 @@ import os
 from datetime import datetime, timezone
 from typing import Any, Optional
 
-from api.http import decode_json_body, get_header, response, content_hash_str, content_hash_bytes
+from api.http import decode_json_body, get_header, response, content_hash_frames, content_hash_str
 from api.schemas import ErrorCode, ErrorResponse, AnalyzeResponse
 from api.schemas_grade import GradeResponse
-from domain.types import AnalysisResult, ConditionSignal, GatekeeperResult, ROIResult
-from services.card_identity import extract_card_identity_from_bytes
-from api.handler_grade import handle_grade
-from services.grading.canonical import load_image_from_bytes, canonicalize
+from domain.types import AnalysisResult, CardIdentity, ConditionSignal, GatekeeperResult, ROIResult
+from services.card_frame import CardFrame
+from services.card_identity import extract_card_identity_from_bytes, extract_card_identity_from_frame
+from services.card_warp import detect_card_quads
+from services.frame_selection import MAX_FRAMES, rank_frames, scale_quad
+from services.image_ingest import FULL_RESOLUTION, WORKING_MAX_SIDE, ImageTooLargeError
+from api.handler_grade import handle_grade, handle_grade_overlay, is_overlay_path
 from services.grading.corners import detect_corner_defects
 from services.grading.edges import detect_edge_defects
 from services.grading.surface import detect_surface_defects
-from services.grading.photo_quality import detect_photo_quality
+from services.grading.photo_quality import PrefilterResult, prefilter_photo
+from services.grading.stages import ANALYZE_FIELDS, parse_include, resolve_stages, skipped_fields
+from services.stage_cache import image_key, stage_cache
 
 
 _API_VERSION = "1.0"
@@ -62,21 +68,45 @@ def _severity_label(score: float) -> str:
     return "none"
 
 
-def _analyze_front_image_for_signals(image_bytes: bytes) -> tuple[ConditionSignal, ...]:
+def _frame_cache_key(frame: Optional[CardFrame]) -> Optional[str]:
+    """Stage-cache key of a whole-photo frame (seeded / windowed frames warp differently)."""
+    if frame is None or frame.seed is not None or frame.search_near is not None:
+        return None
+    return image_key(frame.content_hash)
+
+
+def _frame_identity(image_bytes: bytes, card_type: str, frame: Optional[CardFrame]) -> CardIdentity:
+    """Identity of a whole-photo frame, through the stage cache."""
+    cache, key = stage_cache(), _frame_cache_key(frame)
+    identity, source = cache.get_or_compute(
+        key,
+        f"identity:{card_type}",
+        lambda: extract_card_identity_from_bytes(image_bytes, requested_card_type=card_type, frame=frame),
+    )
+    if source == "computed" and key is not None:
+        # The warp is done now: keep its canonical image for a later /v1/grade.
+        cache.get_or_compute(key, "canonical", lambda: frame.canonical)
+    return identity
+
+
+def _analyze_front_image_for_signals(frame: Optional[CardFrame]) -> tuple[ConditionSignal, ...]:
     """Run defect detectors on front image and generate condition signals.
     
     This is a lightweight analysis for the /v1/analyze endpoint that only
-    has access to the front image.
+    has access to the front image. The frame's warp is shared with identity
+    extraction, so the canonical image here costs no additional warp.
+    Detector outputs go through the stage cache, shared with /v1/grade.
     """
+    if frame is None:
+        return ()
+
     try:
-        img = load_image_from_bytes(image_bytes)
-        canonical = canonicalize(img)
-        
-        # Run detectors
-        corners = detect_corner_defects(canonical.image)
-        edges = detect_edge_defects(canonical.image)
-        surface = detect_surface_defects(canonical.image)
-        photo_quality = detect_photo_quality(canonical.image)
+        cache, key = stage_cache(), _frame_cache_key(frame)
+
+        # Run detectors (sharing one set of derived planes)
+        corners, _ = cache.get_or_compute(key, "corners", lambda: detect_corner_defects(frame.canonical_features))
+        edges, _ = cache.get_or_compute(key, "edges", lambda: detect_edge_defects(frame.canonical_features))
+        surface, _ = cache.get_or_compute(key, "surface", lambda: detect_surface_defects(frame.canonical_features))
         
         signals = []
         
@@ -305,6 +335,9 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
     if method == "POST" and path == "/v1/grade":
         return handle_grade(event)
 
+    if method == "GET" and is_overlay_path(path):
+        return handle_grade_overlay(event, path)
+
     err = ErrorResponse(
         api_version=_API_VERSION,
         request_id=None,
@@ -319,111 +352,45 @@ def lambda_handler(event: dict[str, Any], context: Any) -> dict[str, Any]:
 # -----------------------------------------------------------------------------
 
 
-def _handle_analyze(event: dict[str, Any]) -> dict[str, Any]:
-    try:
-        payload = decode_json_body(event)
-    except Exception:
-        err = ErrorResponse(
-            api_version=_API_VERSION,
-            request_id=None,
-            error_code=ErrorCode.INVALID_REQUEST_FORMAT.value,
-            error_message="Invalid JSON body.",
-        )
-        return response(400, err.to_dict())
-
-    if not isinstance(payload, dict):
-        err = ErrorResponse(
-            api_version=_API_VERSION,
-            request_id=None,
-            error_code=ErrorCode.INVALID_REQUEST_FORMAT.value,
-            error_message="Request body must be a JSON object.",
-        )
-        return response(400, err.to_dict())
-
-    card_type = payload.get("card_type")
-    supported_types = {"pokemon", "trainer", "energy"}
-    if card_type not in supported_types:
-        err = ErrorResponse(
-            api_version=_API_VERSION,
-            request_id=None,
-            error_code=ErrorCode.UNSUPPORTED_CARD_TYPE.value,
-            error_message=f"Only card_type in {sorted(supported_types)} is supported.",
-        )
-        return response(400, err.to_dict())
-
-    front = payload.get("front_image")
-    if not isinstance(front, dict):
-        err = ErrorResponse(
-            api_version=_API_VERSION,
-            request_id=None,
-            error_code=ErrorCode.MISSING_REQUIRED_FIELD.value,
-            error_message="Missing required field: front_image.",
-        )
-        return response(400, err.to_dict())
-
-    encoding = front.get("encoding")
-    data = front.get("data")
-
-    if encoding not in {"base64", "url"}:
-        err = ErrorResponse(
-            api_version=_API_VERSION,
-            request_id=None,
-            error_code=ErrorCode.INVALID_FIELD_VALUE.value,
-            error_message="Only front_image.encoding in {'base64','url'} is supported in this milestone.",
-        )
-        return response(400, err.to_dict())
-
-    if not isinstance(data, str) or not data:
-        err = ErrorResponse(
-            api_version=_API_VERSION,
-            request_id=None,
-            error_code=ErrorCode.MISSING_REQUIRED_FIELD.value,
-            error_message="Missing required field: front_image.data.",
-        )
-        return response(400, err.to_dict())
+def _identity_unreadable(identity: CardIdentity) -> bool:
+    return identity.confidence == 0.0 and identity.card_name == ""
 
-    # Load image bytes
-    if encoding == "base64":
-        try:
-            image_bytes = base64.b64decode(data)
-        except Exception:
-            err = ErrorResponse(
-                api_version=_API_VERSION,
-                request_id=None,
-                error_code=ErrorCode.INVALID_IMAGE_FORMAT.value,
-                error_message="front_image.data must be valid base64.",
-            )
-            return response(400, err.to_dict())
-    else:
-        # encoding == 'url' (e.g., S3 presigned GET URL)
-        try:
-            from urllib.request import Request, urlopen
 
-            req = Request(data, headers={"user-agent": "pregrade/1.0"})
-            with urlopen(req, timeout=15) as r:
-                image_bytes = r.read(15 * 1024 * 1024)  # hard cap 15MB read
-        except Exception:
-            err = ErrorResponse(
-                api_version=_API_VERSION,
-                request_id=None,
-                error_code=ErrorCode.INVALID_IMAGE_FORMAT.value,
-                error_message="front_image.data URL could not be fetched.",
-            )
-            return response(400, err.to_dict())
+def _photo_rejection(request_id: str, check: PrefilterResult, skipped: tuple[str, ...] = ()) -> AnalysisResult:
+    """Gatekeeper rejection of an upload that failed the photo prefilter."""
+    return AnalysisResult(
+        request_id=request_id,
+        card_identity=None,
+        condition_signals=(),
+        gatekeeper_result=GatekeeperResult(
+            accepted=False,
+            reason_codes=check.reason_codes,
+            reasons=check.reasons,
+            explanation="Rejected: photo quality prefilter failed; retake the photo.",
+        ),
+        roi_result=None,
+        processed_at=_PROCESSED_AT,
+        skipped=skipped,
+    )
 
-    # Deterministic request_id based on image + key fields.
-    # Include card_type so the same bytes sent with different declared card_type
-    # cannot collide.
-    request_id = content_hash_bytes(image_bytes)[:24] + "_" + content_hash_str(str(card_type))[:8]
 
-    identity = extract_card_identity_from_bytes(image_bytes, requested_card_type=str(card_type))
+def _analyze_card(
+    request_id: str,
+    card_type: str,
+    identity: CardIdentity,
+    frame: Optional[CardFrame],
+    skipped: tuple[str, ...] = (),
+) -> AnalysisResult:
+    """Gatekeeper, ROI placeholder and condition signals for one card.
 
+    skipped: ANALYZE_FIELDS the request excluded; their stages are not run.
+    """
     # Gatekeeper: billable, first-class rejections with reason codes.
     reason_codes: list[str] = []
     reasons: list[str] = []
 
     # 1) Image unreadable / OCR could not run
-    if identity.confidence == 0.0 and identity.card_name == "":
+    if _identity_unreadable(identity):
         reason_codes.append("IMAGE_UNREADABLE")
         reasons.append("The submitted image could not be decoded or read reliably.")
 
@@ -479,17 +446,160 @@ def _handle_analyze(event: dict[str, Any]) -> dict[str, Any]:
         )
         
         # Run condition analysis on front image
-        condition_signals = _analyze_front_image_for_signals(image_bytes)
+        if "condition_signals" not in skipped:
+            condition_signals = _analyze_front_image_for_signals(frame)
 
-    analysis = AnalysisResult(
+    return AnalysisResult(
         request_id=request_id,
         card_identity=None if rejected else identity,
         condition_signals=condition_signals,
         gatekeeper_result=gatekeeper,
         roi_result=roi,
         processed_at=_PROCESSED_AT,
+        skipped=skipped,
     )
 
+
+def _handle_analyze(event: dict[str, Any]) -> dict[str, Any]:
+    try:
+        payload = decode_json_body(event)
+    except Exception:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.INVALID_REQUEST_FORMAT.value,
+            error_message="Invalid JSON body.",
+        )
+        return response(400, err.to_dict())
+
+    if not isinstance(payload, dict):
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.INVALID_REQUEST_FORMAT.value,
+            error_message="Request body must be a JSON object.",
+        )
+        return response(400, err.to_dict())
+
+    card_type = payload.get("card_type")
+    supported_types = {"pokemon", "trainer", "energy"}
+    if card_type not in supported_types:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.UNSUPPORTED_CARD_TYPE.value,
+            error_message=f"Only card_type in {sorted(supported_types)} is supported.",
+        )
+        return response(400, err.to_dict())
+
+    multi_card = payload.get("multi_card", False)
+    if not isinstance(multi_card, bool):
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+            error_message="multi_card must be a boolean.",
+        )
+        return response(400, err.to_dict())
+
+    front_images = payload.get("front_images")
+    if front_images is not None:
+        if multi_card:
+            err = ErrorResponse(
+                api_version=_API_VERSION,
+                request_id=None,
+                error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+                error_message="multi_card cannot be combined with front_images.",
+            )
+            return response(400, err.to_dict())
+        if (
+            not isinstance(front_images, list)
+            or not 1 <= len(front_images) <= MAX_FRAMES
+            or not all(isinstance(f, dict) for f in front_images)
+        ):
+            err = ErrorResponse(
+                api_version=_API_VERSION,
+                request_id=None,
+                error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+                error_message=f"front_images must be a list of 1..{MAX_FRAMES} image objects.",
+            )
+            return response(400, err.to_dict())
+        image_fields = [(f"front_images[{i}]", f) for i, f in enumerate(front_images)]
+    else:
+        front = payload.get("front_image")
+        if not isinstance(front, dict):
+            err = ErrorResponse(
+                api_version=_API_VERSION,
+                request_id=None,
+                error_code=ErrorCode.MISSING_REQUIRED_FIELD.value,
+                error_message="Missing required field: front_image.",
+            )
+            return response(400, err.to_dict())
+        image_fields = [("front_image", front)]
+
+    # Optional field selection. Identity always runs (the gatekeeper needs
+    # it); excluding condition_signals skips the defect detectors.
+    try:
+        include = parse_include(payload.get("include"), ANALYZE_FIELDS)
+    except ValueError as e:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+            error_message=str(e),
+        )
+        return response(400, err.to_dict())
+    skipped = skipped_fields(resolve_stages(include, ANALYZE_FIELDS, {}), ANALYZE_FIELDS)
+
+    frames_bytes: list[bytes] = []
+    for field, image_obj in image_fields:
+        loaded, err_resp = _read_image_bytes(image_obj, field)
+        if err_resp is not None:
+            return err_resp
+        frames_bytes.append(loaded)
+
+    # Deterministic request_id based on image + key fields.
+    # Include card_type so the same bytes sent with different declared card_type
+    # cannot collide.
+    # multi_card is folded in the same way: same bytes, different result shape.
+    request_key = f"{card_type}:multi" if multi_card else str(card_type)
+    if include is not None:
+        request_key += ":" + ",".join(sorted(include))
+    request_id = content_hash_frames(frames_bytes)[:24] + "_" + content_hash_str(request_key)[:8]
+
+    if len(frames_bytes) > 1:
+        return _handle_analyze_burst(payload, request_id, str(card_type), frames_bytes, skipped)
+
+    image_bytes = frames_bytes[0]
+
+    # Decode once; identity and condition signals share this frame (and its warp).
+    # A multi-card photo is decoded at full size: each card is a small part of it.
+    try:
+        frame: Optional[CardFrame] = CardFrame.from_bytes(
+            image_bytes, working_max_side=FULL_RESOLUTION if multi_card else WORKING_MAX_SIDE
+        )
+    except ImageTooLargeError as e:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=request_id,
+            error_code=ErrorCode.IMAGE_TOO_LARGE.value,
+            error_message=str(e),
+        )
+        return response(400, err.to_dict())
+    except Exception:
+        frame = None
+
+    if multi_card:
+        return _handle_analyze_multi(payload, request_id, str(card_type), frame, skipped)
+
+    # Clearly unusable photos are rejected from a thumbnail, before warp/OCR.
+    photo_check = prefilter_photo(frame.rgb) if frame is not None else None
+    if photo_check is not None and not photo_check.usable:
+        analysis = _photo_rejection(request_id, photo_check, skipped)
+    else:
+        identity = _frame_identity(image_bytes, str(card_type), frame)
+        analysis = _analyze_card(request_id, str(card_type), identity, frame, skipped)
+
     client_reference = payload.get("client_reference")
     if client_reference is not None and not isinstance(client_reference, str):
         client_reference = None
@@ -502,3 +612,193 @@ def _handle_analyze(event: dict[str, Any]) -> dict[str, Any]:
     )
 
     return response(200, resp.to_dict())
+
+
+def _read_image_bytes(image_obj: dict[str, Any], field: str) -> tuple[Optional[bytes], Optional[dict[str, Any]]]:
+    """Validate one image object and load its bytes.
+
+    Returns (bytes, None) on success or (None, error response).
+    """
+    encoding = image_obj.get("encoding")
+    data = image_obj.get("data")
+
+    if encoding not in {"base64", "url"}:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+            error_message=f"Only {field}.encoding in {{'base64','url'}} is supported in this milestone.",
+        )
+        return None, response(400, err.to_dict())
+
+    if not isinstance(data, str) or not data:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.MISSING_REQUIRED_FIELD.value,
+            error_message=f"Missing required field: {field}.data.",
+        )
+        return None, response(400, err.to_dict())
+
+    if encoding == "base64":
+        try:
+            return base64.b64decode(data), None
+        except Exception:
+            err = ErrorResponse(
+                api_version=_API_VERSION,
+                request_id=None,
+                error_code=ErrorCode.INVALID_IMAGE_FORMAT.value,
+                error_message=f"{field}.data must be valid base64.",
+            )
+            return None, response(400, err.to_dict())
+
+    # encoding == 'url' (e.g., S3 presigned GET URL)
+    try:
+        from urllib.request import Request, urlopen
+
+        req = Request(data, headers={"user-agent": "pregrade/1.0"})
+        with urlopen(req, timeout=15) as r:
+            return r.read(15 * 1024 * 1024), None  # hard cap 15MB read
+    except Exception:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.INVALID_IMAGE_FORMAT.value,
+            error_message=f"{field}.data URL could not be fetched.",
+        )
+        return None, response(400, err.to_dict())
+
+
+def _handle_analyze_burst(
+    payload: dict[str, Any],
+    request_id: str,
+    card_type: str,
+    frames_bytes: list[bytes],
+    skipped: tuple[str, ...] = (),
+) -> dict[str, Any]:
+    """Analyze a burst of frames of one card.
+
+    Frames are ranked on a thumbnail (blur/glare) and only the best one goes
+    through warp + OCR. If its identity is unreadable, the runner-up is tried,
+    with its quad search seeded from the best frame's quad.
+    """
+    decoded: list[tuple[int, CardFrame]] = []
+    for index, frame_bytes in enumerate(frames_bytes):
+        try:
+            decoded.append((index, CardFrame.from_bytes(frame_bytes)))
+        except ImageTooLargeError as e:
+            err = ErrorResponse(
+                api_version=_API_VERSION,
+                request_id=request_id,
+                error_code=ErrorCode.IMAGE_TOO_LARGE.value,
+                error_message=f"front_images[{index}]: {e}",
+            )
+            return response(400, err.to_dict())
+        except Exception:
+            continue
+
+    frames = dict(decoded)
+    ranks = rank_frames([(index, f.rgb) for index, f in decoded])
+    selection: dict[str, Any] = {
+        "frames_received": len(frames_bytes),
+        "frames_decoded": len(decoded),
+        "ranking": [r.to_dict() for r in ranks],
+        "selected_index": None,
+        "fallback_index": None,
+        "fallback_used": False,
+    }
+
+    frame: Optional[CardFrame] = None
+    photo_check: Optional[PrefilterResult] = None
+    if not ranks:
+        identity = extract_card_identity_from_bytes(frames_bytes[0], requested_card_type=card_type)
+    else:
+        best = ranks[0].index
+        frame = frames[best]
+        selection["selected_index"] = best
+        # The best frame failing the prefilter means every frame does.
+        photo_check = prefilter_photo(frame.rgb, ranks[0].quality)
+        identity = _frame_identity(frames_bytes[best], card_type, frame) if photo_check.usable else None
+
+        if identity is not None and _identity_unreadable(identity) and len(ranks) > 1:
+            runner_up = ranks[1].index
+            alt = frames[runner_up]
+            if frame.quad is not None:
+                alt = alt.with_search_window(scale_quad(frame.quad, frame.size, alt.size))
+            alt_identity = extract_card_identity_from_bytes(
+                frames_bytes[runner_up], requested_card_type=card_type, frame=alt
+            )
+            selection["fallback_index"] = runner_up
+            if alt_identity.confidence > identity.confidence:
+                identity, frame = alt_identity, alt
+                selection["selected_index"] = runner_up
+                selection["fallback_used"] = True
+
+    if identity is None:
+        analysis = _photo_rejection(request_id, photo_check, skipped)
+    else:
+        analysis = _analyze_card(request_id, card_type, identity, frame, skipped)
+
+    client_reference = payload.get("client_reference")
+    if client_reference is not None and not isinstance(client_reference, str):
+        client_reference = None
+
+    resp = AnalyzeResponse(
+        api_version=_API_VERSION,
+        request_id=request_id,
+        client_reference=client_reference,
+        result=analysis.to_dict() | {"frame_selection": selection},
+    )
+    return response(200, resp.to_dict())
+
+
+def _handle_analyze_multi(
+    payload: dict[str, Any],
+    request_id: str,
+    card_type: str,
+    frame: Optional[CardFrame],
+    skipped: tuple[str, ...] = (),
+) -> dict[str, Any]:
+    """Analyze every card in one photo.
+
+    The photo is decoded once and its edge maps are computed once for quad
+    detection; each card then gets a child frame that shares those arrays
+    and only warps its own quad. Cards come back in row-major order, each
+    keyed by its position in the photo.
+    """
+    if frame is None:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=request_id,
+            error_code=ErrorCode.INVALID_IMAGE_FORMAT.value,
+            error_message="front_image.data could not be decoded as an image.",
+        )
+        return response(400, err.to_dict())
+
+    positioned, detection = detect_card_quads(frame.rgb, gray=frame.gray)
+
+    cards: list[dict[str, Any]] = []
+    for pq in positioned:
+        card_frame = frame.for_quad(pq)
+        identity = extract_card_identity_from_frame(card_frame, requested_card_type=card_type)
+        analysis = _analyze_card(f"{request_id}_{pq.index:02d}", card_type, identity, card_frame, skipped)
+        cards.append({"position": pq.position(), **analysis.to_dict()})
+
+    client_reference = payload.get("client_reference")
+    if client_reference is not None and not isinstance(client_reference, str):
+        client_reference = None
+
+    resp = AnalyzeResponse(
+        api_version=_API_VERSION,
+        request_id=request_id,
+        client_reference=client_reference,
+        result={
+            "request_id": request_id,
+            "multi_card": True,
+            "cards_detected": len(cards),
+            "cards": cards,
+            "detection": detection,
+            "processed_at": _PROCESSED_AT,
+        },
+    )
+    return response(200, resp.to_dict())
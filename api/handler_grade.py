@@ -1,19 +1,54 @@
 from __future__ import annotations
 
 import base64
-from typing import Any
+import os
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
 
-from api.http import decode_json_body, response, content_hash_bytes, content_hash_str
-from api.schemas import ErrorCode, ErrorResponse
+from PIL import Image
+
+from api.http import binary_response, decode_json_body, get_query_param, response, content_hash_frames, content_hash_str
+from api.schemas import ErrorCode, ErrorDetail, ErrorResponse
 from api.schemas_grade import GradeResponse
-from api.image_store import save_png
+from api.image_store import IMAGE_FORMATS, encode_image, save_image
 
+from services.grading.centering import OVERLAY_SIDES, CenteringOverlaySource
 from services.grading.grade import grade_card
-from services.grading.canonical import load_image_from_bytes
+from services.grading.photo_quality import ThumbnailQuality, prefilter_photo
+from services.grading.canonical import PREVIEW_SCALES
+from services.grading.stages import GRADE_FIELDS, parse_include
+from services.frame_selection import MAX_FRAMES, rank_frames
+from services.image_ingest import ImageTooLargeError, IngestedImage, ingest_image_bytes
+from services.reference_store import load_card_reference, valid_reference_key
 
 
 _API_VERSION = "1.0"
 
+# Overlay sources of recent grades, by request_id, for GET .../overlays/<side>.
+# A source is only hashes + the centering result; the canonical images come
+# from the stage cache. In-process only: a request that lands on another
+# instance (or after its canonical images were evicted) gets a 404 and should
+# re-grade with include=["overlays"].
+DEFAULT_OVERLAY_CACHE_SIZE = 32
+_OVERLAY_SOURCES: "OrderedDict[str, CenteringOverlaySource]" = OrderedDict()
+_OVERLAY_LOCK = threading.Lock()
+
+_OVERLAY_PATH_RE = re.compile(r"^/v1/grade/([A-Za-z0-9_]+)/overlays/([a-z]+)$")
+
+
+def overlay_cache_size() -> int:
+    raw = os.environ.get("PREGRADE_OVERLAY_CACHE_SIZE", "").strip()
+    try:
+        return max(0, int(raw)) if raw else DEFAULT_OVERLAY_CACHE_SIZE
+    except ValueError:
+        return DEFAULT_OVERLAY_CACHE_SIZE
+
+
+def is_overlay_path(path: str) -> bool:
+    return _OVERLAY_PATH_RE.match(path) is not None
+
 
 def handle_grade(event: dict[str, Any]) -> dict[str, Any]:
     try:
@@ -46,10 +81,10 @@ def handle_grade(event: dict[str, Any]) -> dict[str, Any]:
         )
         return response(400, err.to_dict())
 
-    front = payload.get("front_image")
-    back = payload.get("back_image")
+    front_frames = _side_frames(payload, "front")
+    back_frames = _side_frames(payload, "back")
 
-    if not isinstance(front, dict) or not isinstance(back, dict):
+    if front_frames is None or back_frames is None:
         err = ErrorResponse(
             api_version=_API_VERSION,
             request_id=None,
@@ -58,19 +93,25 @@ def handle_grade(event: dict[str, Any]) -> dict[str, Any]:
         )
         return response(400, err.to_dict())
 
-    if front.get("encoding") != "base64" or back.get("encoding") != "base64":
+    if not front_frames or not back_frames:
         err = ErrorResponse(
             api_version=_API_VERSION,
             request_id=None,
             error_code=ErrorCode.INVALID_FIELD_VALUE.value,
-            error_message="Only image.encoding='base64' is supported in this milestone.",
+            error_message=f"front_images/back_images must be lists of 1..{MAX_FRAMES} image objects.",
         )
         return response(400, err.to_dict())
 
-    fdata = front.get("data")
-    bdata = back.get("data")
+    if any(f.get("encoding") != "base64" for f in front_frames + back_frames):
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+            error_message="Only image.encoding='base64' is supported in this milestone.",
+        )
+        return response(400, err.to_dict())
 
-    if not isinstance(fdata, str) or not fdata or not isinstance(bdata, str) or not bdata:
+    if any(not isinstance(f.get("data"), str) or not f.get("data") for f in front_frames + back_frames):
         err = ErrorResponse(
             api_version=_API_VERSION,
             request_id=None,
@@ -80,8 +121,8 @@ def handle_grade(event: dict[str, Any]) -> dict[str, Any]:
         return response(400, err.to_dict())
 
     try:
-        fbytes = base64.b64decode(fdata)
-        bbytes = base64.b64decode(bdata)
+        front_bytes = [base64.b64decode(f["data"]) for f in front_frames]
+        back_bytes = [base64.b64decode(f["data"]) for f in back_frames]
     except Exception:
         err = ErrorResponse(
             api_version=_API_VERSION,
@@ -91,26 +132,120 @@ def handle_grade(event: dict[str, Any]) -> dict[str, Any]:
         )
         return response(400, err.to_dict())
 
-    request_id = content_hash_bytes(fbytes + bbytes)[:24] + "_" + content_hash_str("pokemon")[:8]
+    # Optional printing (set_id/local_id from /v1/analyze card_identity.details):
+    # front centering then registers against the reference store's scan.
+    reference = payload.get("reference")
+    if reference is not None and (
+        not isinstance(reference, dict)
+        or not valid_reference_key(reference.get("set_id"), reference.get("local_id"))
+    ):
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+            error_message="reference must be an object with string set_id and local_id.",
+        )
+        return response(400, err.to_dict())
+
+    # Optional preview grading: canonicalize at a fraction of full size.
+    scale = payload.get("preview_scale", 1.0)
+    if isinstance(scale, bool) or not isinstance(scale, (int, float)) or (scale != 1.0 and scale not in PREVIEW_SCALES):
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+            error_message=f"preview_scale must be 1.0 or one of {list(PREVIEW_SCALES)}.",
+        )
+        return response(400, err.to_dict())
+    scale = float(scale)
+
+    overlay_format = payload.get("overlay_format", "png")
+    if overlay_format not in IMAGE_FORMATS:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+            error_message=f"overlay_format must be one of {sorted(IMAGE_FORMATS)}.",
+        )
+        return response(400, err.to_dict())
+
+    # Optional field selection: only the stages these fields need are run.
+    try:
+        include = parse_include(payload.get("include"), GRADE_FIELDS)
+    except ValueError as e:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=None,
+            error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+            error_message=str(e),
+        )
+        return response(400, err.to_dict())
+
+    key = "pokemon" if reference is None else f"pokemon:{reference['set_id']}/{reference['local_id']}"
+    if scale != 1.0:
+        key += f"@{scale}"
+    if include is not None:
+        key += ":" + ",".join(sorted(include))
+    request_id = content_hash_frames(front_bytes, back_bytes)[:24] + "_" + content_hash_str(key)[:8]
+
+    frame_selection: dict[str, Any] = {}
+    try:
+        front_img, front_hash, front_quality, frame_selection["front"] = _best_frame(front_bytes)
+        back_img, back_hash, back_quality, frame_selection["back"] = _best_frame(back_bytes)
+    except ImageTooLargeError as e:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=request_id,
+            error_code=ErrorCode.IMAGE_TOO_LARGE.value,
+            error_message=str(e),
+        )
+        return response(400, err.to_dict())
+    except Exception:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=request_id,
+            error_code=ErrorCode.INVALID_IMAGE_FORMAT.value,
+            error_message="image.data could not be decoded as an image.",
+        )
+        return response(400, err.to_dict())
+
+    # Clearly unusable photos are rejected from a thumbnail, before the warp.
+    issues: list[ErrorDetail] = []
+    for side, img, quality in (("front", front_img, front_quality), ("back", back_img, back_quality)):
+        check = prefilter_photo(img, quality)
+        issues.extend(
+            ErrorDetail(field=f"{side}_image", issue=f"{code}: {reason}")
+            for code, reason in zip(check.reason_codes, check.reasons)
+        )
+    if issues:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=request_id,
+            error_code=ErrorCode.PHOTO_UNUSABLE.value,
+            error_message="Photo quality prefilter failed; retake the photo.",
+            details=tuple(issues),
+        )
+        return response(400, err.to_dict())
 
-    front_img = load_image_from_bytes(fbytes)
-    back_img = load_image_from_bytes(bbytes)
+    front_reference = None
+    if reference is not None:
+        front_reference = load_card_reference(reference["set_id"], reference["local_id"])
 
-    result = grade_card(front_img, back_img)
+    result = grade_card(front_img, back_img, front_reference, scale, include, front_hash, back_hash)
 
-    # Save overlays to disk (dev)
+    # Overlays are drawn on demand from the cached source; they are only
+    # rendered and written now if the request included them.
     explanations = dict(result.explanations)
-    cent = explanations.get("centering") or {}
-    if isinstance(cent, dict):
-        fo = cent.get("front_overlay_image")
-        bo = cent.get("back_overlay_image")
-        if hasattr(fo, "save"):
-            cent["front_overlay_path"] = save_png(fo, request_id, "centering_front")
-        if hasattr(bo, "save"):
-            cent["back_overlay_path"] = save_png(bo, request_id, "centering_back")
-        # remove raw images from response
-        cent.pop("front_overlay_image", None)
-        cent.pop("back_overlay_image", None)
+    if result.overlay_source is not None:
+        _cache_overlay_source(request_id, result.overlay_source)
+        cent: dict[str, Any] = {
+            f"{side}_overlay_url": f"/v1/grade/{request_id}/overlays/{side}" for side in OVERLAY_SIDES
+        }
+        rendered = explanations.get("centering") or {}
+        for side in OVERLAY_SIDES:
+            img = rendered.get(f"{side}_overlay_image")
+            if hasattr(img, "save"):
+                cent[f"{side}_overlay_path"] = save_image(img, overlay_format)
         explanations["centering"] = cent
 
     client_reference = payload.get("client_reference")
@@ -121,7 +256,100 @@ def handle_grade(event: dict[str, Any]) -> dict[str, Any]:
         api_version=_API_VERSION,
         request_id=request_id,
         client_reference=client_reference,
-        result=result.to_dict() | {"explanations": explanations},
+        result=result.to_dict()
+        | {"explanations": explanations}
+        | ({"frame_selection": frame_selection} if any(frame_selection.values()) else {}),
     )
 
     return response(200, resp.to_dict())
+
+
+def handle_grade_overlay(event: dict[str, Any], path: str) -> dict[str, Any]:
+    """GET /v1/grade/<request_id>/overlays/<side>[?format=png|webp|jpeg]."""
+    match = _OVERLAY_PATH_RE.match(path)
+    request_id, side = (match.group(1), match.group(2)) if match else (None, None)
+    fmt = get_query_param(event, "format") or "png"
+    if side not in OVERLAY_SIDES or fmt not in IMAGE_FORMATS:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=request_id,
+            error_code=ErrorCode.INVALID_FIELD_VALUE.value,
+            error_message=f"side must be one of {list(OVERLAY_SIDES)} and format one of {sorted(IMAGE_FORMATS)}.",
+        )
+        return response(400, err.to_dict())
+
+    with _OVERLAY_LOCK:
+        source = _OVERLAY_SOURCES.get(request_id)
+        if source is not None:
+            _OVERLAY_SOURCES.move_to_end(request_id)
+    overlay = source.render(side) if source is not None else None
+    if overlay is None:
+        err = ErrorResponse(
+            api_version=_API_VERSION,
+            request_id=request_id,
+            error_code=ErrorCode.INVALID_REQUEST_FORMAT.value,
+            error_message="No overlay for this request_id here; re-grade with include=[\"overlays\"].",
+        )
+        return response(404, err.to_dict())
+
+    data, content_type = encode_image(overlay, fmt)
+    return binary_response(200, data, content_type)
+
+
+def _cache_overlay_source(request_id: str, source: CenteringOverlaySource) -> None:
+    size = overlay_cache_size()
+    with _OVERLAY_LOCK:
+        _OVERLAY_SOURCES[request_id] = source
+        _OVERLAY_SOURCES.move_to_end(request_id)
+        while len(_OVERLAY_SOURCES) > size:
+            _OVERLAY_SOURCES.popitem(last=False)
+
+
+def _side_frames(payload: dict[str, Any], side: str) -> Optional[list[dict[str, Any]]]:
+    """Image objects for one side: `<side>_images` (burst) or `<side>_image`.
+
+    Returns None if neither is present, [] if the list is malformed.
+    """
+    frames = payload.get(f"{side}_images")
+    if frames is None:
+        single = payload.get(f"{side}_image")
+        return [single] if isinstance(single, dict) else None
+    if isinstance(frames, list) and 1 <= len(frames) <= MAX_FRAMES and all(isinstance(f, dict) for f in frames):
+        return frames
+    return []
+
+
+def _best_frame(
+    frames_bytes: list[bytes],
+) -> tuple[Image.Image, str, Optional[ThumbnailQuality], Optional[dict[str, Any]]]:
+    """Decode a side's frames and keep the sharpest, least glary one.
+
+    Returns (image, content hash of its upload, its thumbnail quality from
+    the ranking, frame selection trace). A single frame is returned as-is
+    with no quality measured (decode errors propagate). For bursts,
+    undecodable frames are skipped; ValueError if none decode.
+    """
+    if len(frames_bytes) == 1:
+        ingested = ingest_image_bytes(frames_bytes[0])
+        return ingested.image, ingested.content_hash, None, None
+
+    decoded: list[tuple[int, IngestedImage]] = []
+    for index, frame_bytes in enumerate(frames_bytes):
+        try:
+            decoded.append((index, ingest_image_bytes(frame_bytes)))
+        except ImageTooLargeError:
+            raise
+        except Exception:
+            continue
+    if not decoded:
+        raise ValueError("no decodable frames")
+
+    ranks = rank_frames([(index, ingested.image) for index, ingested in decoded])
+    best = dict(decoded)[ranks[0].index]
+    selection = {
+        "frames_received": len(frames_bytes),
+        "frames_decoded": len(decoded),
+        "ranking": [r.to_dict() for r in ranks],
+        "selected_index": ranks[0].index,
+    }
+    return best.image, best.content_hash, ranks[0].quality, selection
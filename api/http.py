@@ -31,6 +31,13 @@ def get_header(event: dict[str, Any], name: str) -> Optional[str]:
     return headers.get(name.lower())
 
 
+def get_query_param(event: dict[str, Any], name: str) -> Optional[str]:
+    # v1 and v2 both provide queryStringParameters (None when empty).
+    params = event.get("queryStringParameters") or {}
+    value = params.get(name)
+    return None if value is None else str(value)
+
+
 def stable_json_dumps(obj: Any) -> str:
     """Deterministic JSON: stable key order + no whitespace."""
 
@@ -61,6 +68,16 @@ def response(status_code: int, body: Any, headers: Optional[dict[str, str]] = No
     }
 
 
+def binary_response(status_code: int, data: bytes, content_type: str) -> dict[str, Any]:
+    """Binary body (e.g. an image), base64-encoded as API Gateway expects."""
+    return {
+        "statusCode": status_code,
+        "headers": {"content-type": content_type},
+        "body": base64.b64encode(data).decode("ascii"),
+        "isBase64Encoded": True,
+    }
+
+
 def decode_json_body(event: dict[str, Any]) -> Any:
     raw = event.get("body")
     if raw is None:
@@ -82,3 +99,8 @@ def content_hash_bytes(data: bytes) -> str:
 
 def content_hash_str(data: str) -> str:
     return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def content_hash_frames(*sides: list[bytes]) -> str:
+    """Hash of one or more lists of images, unambiguous in how they split into frames and sides."""
+    return content_hash_str("|".join(",".join(content_hash_bytes(frame) for frame in frames) for frames in sides))
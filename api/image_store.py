@@ -3,22 +3,115 @@ from __future__ import annotations
 """Very small, local image store for API responses.
 
 In Lambda, you would replace this with S3 presigned URLs, etc.
-For local/dev we write to ./exports/.
+For local/dev we write under PREGRADE_IMAGE_STORE_DIR (default ./exports/grade).
 
-This keeps the API deterministic enough for testing while giving callers
-something to fetch.
+Images are content-addressed (<sha256>.<ext>), so re-grading the same card
+reuses the existing file. Encoding happens on the caller's thread (the path
+depends on the bytes); the file write and eviction run on one background
+writer thread so the request does not wait on disk. When the directory grows
+past PREGRADE_IMAGE_STORE_MAX_BYTES, the least recently written files are
+removed.
 """
 
+import hashlib
+import io
 import os
-from typing import Tuple
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Optional
 
 from PIL import Image
 
 
-def save_png(img: Image.Image, request_id: str, name: str) -> str:
-    out_dir = os.path.join(os.getcwd(), "exports", "grade")
-    os.makedirs(out_dir, exist_ok=True)
-    safe = "".join(ch for ch in name if ch.isalnum() or ch in {"_", "-"}).strip() or "img"
-    path = os.path.join(out_dir, f"{request_id}__{safe}.png")
-    img.save(path)
+# format -> (PIL format, content type, extension, save options).
+# PNG uses a fast compression level: overlays are debug visuals, not archives.
+IMAGE_FORMATS: dict[str, tuple[str, str, str, dict[str, Any]]] = {
+    "png": ("PNG", "image/png", "png", {"compress_level": 1}),
+    "webp": ("WEBP", "image/webp", "webp", {"quality": 85, "method": 4}),
+    "jpeg": ("JPEG", "image/jpeg", "jpg", {"quality": 90}),
+}
+
+DEFAULT_IMAGE_STORE_MAX_BYTES = 256 * 1024 * 1024
+
+_writer: Optional[ThreadPoolExecutor] = None
+_writer_lock = threading.Lock()
+_last_write: Optional[Future] = None
+
+
+def store_dir() -> str:
+    return os.environ.get("PREGRADE_IMAGE_STORE_DIR", "").strip() or os.path.join(os.getcwd(), "exports", "grade")
+
+
+def store_max_bytes() -> int:
+    raw = os.environ.get("PREGRADE_IMAGE_STORE_MAX_BYTES", "").strip()
+    try:
+        return max(0, int(raw)) if raw else DEFAULT_IMAGE_STORE_MAX_BYTES
+    except ValueError:
+        return DEFAULT_IMAGE_STORE_MAX_BYTES
+
+
+def encode_image(img: Image.Image, fmt: str = "png") -> tuple[bytes, str]:
+    """Encode an image; returns (bytes, content type).
+
+    Raises:
+        ValueError: unknown format
+    """
+    if fmt not in IMAGE_FORMATS:
+        raise ValueError(f"Unsupported image format {fmt!r}; expected one of {sorted(IMAGE_FORMATS)}.")
+    pil_format, content_type, _, options = IMAGE_FORMATS[fmt]
+    buf = io.BytesIO()
+    img.convert("RGB").save(buf, format=pil_format, **options)
+    return buf.getvalue(), content_type
+
+
+def save_image(img: Image.Image, fmt: str = "png") -> str:
+    """Encode and queue an image for writing; returns its (content-addressed) path."""
+    data, _ = encode_image(img, fmt)
+    path = os.path.join(store_dir(), f"{hashlib.sha256(data).hexdigest()}.{IMAGE_FORMATS[fmt][2]}")
+    _submit(_write, path, data, store_max_bytes())
     return path
+
+
+def flush() -> None:
+    """Block until every queued write has finished."""
+    last = _last_write
+    if last is not None:
+        last.result()
+
+
+def _submit(fn: Any, *args: Any) -> None:
+    global _writer, _last_write
+    with _writer_lock:
+        if _writer is None:
+            _writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="image-store")
+        # One worker: writes (and evictions) complete in submission order.
+        _last_write = _writer.submit(fn, *args)
+
+
+def _write(path: str, data: bytes, max_bytes: int) -> None:
+    if os.path.exists(path):
+        os.utime(path)  # still wanted: keep it out of the next eviction
+    else:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    _evict(os.path.dirname(path), max_bytes)
+
+
+def _evict(directory: str, max_bytes: int) -> None:
+    entries = []
+    for entry in os.scandir(directory):
+        if entry.is_file() and not entry.name.endswith(".tmp"):
+            st = entry.stat()
+            entries.append((st.st_mtime, st.st_size, entry.path))
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
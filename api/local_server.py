@@ -17,6 +17,7 @@ This is NOT production.
 from __future__ import annotations
 
 import argparse
+import base64
 import json
 import os
 import sys
@@ -31,6 +32,7 @@ if sys.path and os.path.abspath(sys.path[0]) == os.path.abspath(_api_dir):
     sys.path.pop(0)
 
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from urllib.parse import parse_qsl, urlsplit
 
 # Ensure repo root is importable for `api.handler`.
 REPO_ROOT = os.path.abspath(os.path.join(_api_dir, os.pardir))
@@ -48,9 +50,11 @@ def lambda_handler(event, context):
 
 
 def _make_v2_event(path: str, method: str, body_text: str | None) -> dict[str, Any]:
+    url = urlsplit(path)
     return {
         "version": "2.0",
-        "rawPath": path,
+        "rawPath": url.path,
+        "queryStringParameters": dict(parse_qsl(url.query)) or None,
         "requestContext": {"http": {"method": method}},
         "headers": {"content-type": "application/json"},
         "body": body_text,
@@ -61,19 +65,23 @@ def _make_v2_event(path: str, method: str, body_text: str | None) -> dict[str, A
 class Handler(BaseHTTPRequestHandler):
     server_version = "PregradeLocalServer/0.1"
 
-    def _send(self, status: int, body: str, headers: dict[str, str] | None = None) -> None:
+    def _send(self, status: int, body: str | bytes, headers: dict[str, str] | None = None) -> None:
         self.send_response(status)
-        self.send_header("content-type", "application/json")
-        if headers:
-            for k, v in headers.items():
-                self.send_header(k, v)
+        headers = {"content-type": "application/json", **(headers or {})}
+        for k, v in headers.items():
+            self.send_header(k, v)
         self.end_headers()
-        self.wfile.write(body.encode("utf-8"))
+        self.wfile.write(body if isinstance(body, bytes) else body.encode("utf-8"))
 
     def do_GET(self):  # noqa: N802
-        if self.path == "/v1/health":
-            resp = lambda_handler(_make_v2_event("/v1/health", "GET", None), None)
-            self._send(int(resp.get("statusCode", 500)), resp.get("body") or "{}")
+        # Health, and lazily rendered grade overlays (/v1/grade/<id>/overlays/<side>).
+        if self.path == "/v1/health" or self.path.startswith("/v1/grade/"):
+            resp = lambda_handler(_make_v2_event(self.path, "GET", None), None)
+            body = resp.get("body") or "{}"
+            if resp.get("isBase64Encoded"):
+                body = base64.b64decode(body)
+            content_type = (resp.get("headers") or {}).get("content-type", "application/json")
+            self._send(int(resp.get("statusCode", 500)), body, {"content-type": content_type})
             return
         self._send(404, json.dumps({"error": "not_found"}))
 
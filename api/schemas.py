@@ -63,6 +63,7 @@ class ErrorCode(str, Enum):
     INVALID_IMAGE_FORMAT = "INVALID_IMAGE_FORMAT"
     IMAGE_TOO_LARGE = "IMAGE_TOO_LARGE"
     UNSUPPORTED_CARD_TYPE = "UNSUPPORTED_CARD_TYPE"
+    PHOTO_UNUSABLE = "PHOTO_UNUSABLE"
     
     # Authentication errors (401)
     MISSING_API_KEY = "MISSING_API_KEY"
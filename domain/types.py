@@ -254,6 +254,12 @@ class AnalysisResult:
     processed_at: str
     """ISO 8601 timestamp of when analysis was completed."""
 
+    skipped: tuple[str, ...] = ()
+    """
+    Output fields the request excluded (include=...) and that were not
+    computed, e.g. condition_signals.
+    """
+
     def to_dict(self) -> dict:
         """Convert to JSON-serialisable dictionary."""
         return {
@@ -263,6 +269,7 @@ class AnalysisResult:
             'gatekeeper_result': self.gatekeeper_result.to_dict(),
             'roi_result': self.roi_result.to_dict() if self.roi_result else None,
             'processed_at': self.processed_at,
+            'skipped': list(self.skipped),
         }
 
     def to_json(self) -> str:
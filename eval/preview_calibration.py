@@ -0,0 +1,136 @@
+"""Calibrate preview grading (half / quarter canonical size) against full resolution.
+
+Every front photo in a folder is graded at full resolution and at each preview
+scale (all against the same back photo; back centering is not calibrated
+here). For each scale we report how far preview outputs are from the
+full-resolution ones and the CPU saved.
+
+The escalation margin is the 95th percentile of |preview p_psa10 - full
+p_psa10|: a partner screening at preview scale should re-grade at full
+resolution any card whose preview p_psa10 is within that margin of their
+decision threshold.
+
+Usage:
+  ./.venv/bin/python eval/preview_calibration.py --front /path/fronts --back /path/back.jpg \\
+      --out eval/preview_calibration.json
+
+Outputs a per-scale summary and, with --out, the summary plus per-card rows
+as JSON.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+from services.grading.canonical import PREVIEW_SCALES
+from services.grading.grade import grade_card
+
+
+_SIGNALS = ("p_psa10", "corners", "edges", "surface", "front_lr", "front_tb")
+
+
+def iter_images(dirp: Path):
+    for p in sorted(dirp.glob("**/*")):
+        if p.is_dir():
+            continue
+        if p.suffix.lower() not in {".jpg", ".jpeg", ".png", ".webp"}:
+            continue
+        yield p
+
+
+def signals(result) -> dict:
+    return {
+        "p_psa10": result.p_psa10,
+        "corners": result.defects.corners_severity,
+        "edges": result.defects.edges_severity,
+        "surface": result.defects.surface_severity,
+        "front_lr": result.centering.lr_ratio,
+        "front_tb": result.centering.tb_ratio,
+        "psa_centering_max": result.centering.psa_max,
+        "usable": result.photo_quality.usable,
+        "cpu_ms": sum(s["cpu_ms"] for s in result.trace["timings"]["stages"].values()),
+    }
+
+
+def summarize(rows: list[dict], scale: float) -> dict:
+    full = [r["scales"]["1.0"] for r in rows]
+    prev = [r["scales"][str(scale)] for r in rows]
+    out: dict = {"scale": scale, "cards": len(rows)}
+    for name in _SIGNALS:
+        a = np.array([f[name] for f in full], dtype=np.float64)
+        b = np.array([p[name] for p in prev], dtype=np.float64)
+        diff = np.abs(a - b)
+        corr = float(np.corrcoef(a, b)[0, 1]) if len(a) > 1 and a.std() > 0 and b.std() > 0 else None
+        out[name] = {
+            "mae": round(float(diff.mean()), 4),
+            "p95_abs_error": round(float(np.percentile(diff, 95)), 4),
+            "pearson_r": None if corr is None else round(corr, 4),
+        }
+    out["psa_centering_max_agreement"] = round(
+        float(np.mean([f["psa_centering_max"] == p["psa_centering_max"] for f, p in zip(full, prev)])), 4
+    )
+    out["usable_agreement"] = round(float(np.mean([f["usable"] == p["usable"] for f, p in zip(full, prev)])), 4)
+    out["escalation_margin_p_psa10"] = out["p_psa10"]["p95_abs_error"]
+    out["cpu_ratio"] = round(float(np.median([p["cpu_ms"] / max(f["cpu_ms"], 1e-6) for f, p in zip(full, prev)])), 4)
+    return out
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--front", required=True, help="Folder of front photos")
+    ap.add_argument("--back", required=True, help="Back photo used for every card")
+    ap.add_argument("--max", type=int, default=0, help="Limit number of cards (0 = no limit)")
+    ap.add_argument("--out", default="", help="Write summary + per-card rows as JSON")
+    args = ap.parse_args()
+
+    back = Image.open(args.back)
+    back.load()
+
+    rows = []
+    failures = []
+    for i, p in enumerate(iter_images(Path(args.front))):
+        if args.max and i >= args.max:
+            break
+        try:
+            im = Image.open(p)
+            im.load()
+            rows.append({
+                "path": p.as_posix(),
+                "scales": {str(s): signals(grade_card(im, back, scale=s)) for s in (1.0,) + PREVIEW_SCALES},
+            })
+        except Exception as e:
+            failures.append((p.as_posix(), repr(e)))
+
+    if not rows:
+        print("No cards graded.")
+        return
+
+    summary = [summarize(rows, s) for s in PREVIEW_SCALES]
+    print(f"Cards: {len(rows)}  Failures: {len(failures)}")
+    for s in summary:
+        print(
+            f"\nscale={s['scale']}  cpu_ratio={s['cpu_ratio']:.2f}  "
+            f"escalation_margin_p_psa10={s['escalation_margin_p_psa10']:.3f}  "
+            f"centering_max_agreement={s['psa_centering_max_agreement']:.3f}  "
+            f"usable_agreement={s['usable_agreement']:.3f}"
+        )
+        for name in _SIGNALS:
+            m = s[name]
+            r = "n/a" if m["pearson_r"] is None else f"{m['pearson_r']:.3f}"
+            print(f"  {name:<9} mae={m['mae']:.4f}  p95={m['p95_abs_error']:.4f}  r={r}")
+
+    for path, err in failures[:25]:
+        print(f"- failed path={path} error={err}")
+
+    if args.out:
+        Path(args.out).write_text(json.dumps({"summary": summary, "cards": rows}, indent=2))
+        print(f"\nWrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
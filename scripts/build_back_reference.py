@@ -0,0 +1,87 @@
+"""Build the reference card back used for back-centering registration.
+
+Every Pokemon card back is printed from the same design, so centering can be
+measured by registering a canonical back against one centered reference
+(services/grading/registration.py). This script builds that reference from a
+folder of back photos:
+
+1. Canonicalize every photo (warp to 744x1040) and convert to grayscale.
+2. Register each back to the first one and average the aligned backs.
+3. Shift the average by the mean offset, so the reference sits at the
+   population's mean centering (print miscentering averages out).
+4. Measure the reference border widths and write <out>.png + <out>.json.
+
+Usage:
+  PYTHONPATH=. python scripts/build_back_reference.py \
+    --images /path/to/backs --out assets/reference/pokemon_back.png
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+from services.grading.canonical import canonicalize, load_image_from_bytes
+from services.grading.centering import _measure_border_widths
+from services.grading.registration import register_translation
+
+_EXTS = {".jpg", ".jpeg", ".png", ".webp"}
+
+
+def _canonical_gray(path: Path) -> np.ndarray:
+    img = load_image_from_bytes(path.read_bytes())
+    return cv2.cvtColor(np.asarray(canonicalize(img).image), cv2.COLOR_RGB2GRAY)
+
+
+def _shift(gray: np.ndarray, dx: float, dy: float) -> np.ndarray:
+    m = np.float32([[1, 0, dx], [0, 1, dy]])
+    h, w = gray.shape
+    return cv2.warpAffine(gray.astype(np.float32), m, (w, h), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REPLICATE)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Build the reference back for back-centering registration")
+    parser.add_argument("--images", required=True, help="Folder of card back photos")
+    parser.add_argument("--out", default="assets/reference/pokemon_back.png", help="Output PNG (JSON written alongside)")
+    parser.add_argument("--min-response", type=float, default=0.2, help="Skip backs that register worse than this")
+    args = parser.parse_args()
+
+    paths = sorted(p for p in Path(args.images).iterdir() if p.suffix.lower() in _EXTS)
+    if len(paths) < 2:
+        raise SystemExit("Need at least two back images")
+
+    base = _canonical_gray(paths[0])
+    aligned = [base.astype(np.float32)]
+    offsets = [(0.0, 0.0)]
+    for p in paths[1:]:
+        gray = _canonical_gray(p)
+        reg = register_translation(gray, base)
+        if reg.response < args.min_response:
+            print(f"skip {p.name}: response {reg.response:.3f}")
+            continue
+        aligned.append(_shift(gray, -reg.dx, -reg.dy))
+        offsets.append((reg.dx, reg.dy))
+
+    mean = np.mean(aligned, axis=0)
+    mdx, mdy = np.mean(offsets, axis=0)
+    reference = np.clip(_shift(mean, float(mdx), float(mdy)), 0, 255).astype(np.uint8)
+
+    borders = _measure_border_widths(cv2.cvtColor(reference, cv2.COLOR_GRAY2RGB))
+    if borders is None:
+        raise SystemExit("Could not measure borders on the averaged reference")
+
+    out = Path(args.out)
+    out.parent.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(out.as_posix(), reference)
+    out.with_suffix(".json").write_text(
+        json.dumps({"borders": borders, "source_count": len(aligned), "mean_offset": [float(mdx), float(mdy)]}, indent=2)
+    )
+    print(f"wrote {out} from {len(aligned)} backs, borders={borders}")
+
+
+if __name__ == "__main__":
+    main()
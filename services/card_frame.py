@@ -0,0 +1,215 @@
+"""Request-scoped card frame.
+
+One uploaded photo is decoded, quad-detected and warped exactly once per
+request. Identity extraction (OCR on the warped card) and the grading
+detectors (on the canonical 744x1040 image) both read from the same frame
+instead of each re-running the warp on their own copy of the bytes.
+
+Everything derived from the photo is computed lazily and cached on the frame,
+so callers that only need e.g. the decoded image never pay for the warp.
+
+Internally the frame carries contiguous RGB arrays (plus cached gray views);
+PIL images are only materialized for OCR and overlays. Cached arrays are
+shared between consumers and therefore marked read-only.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from functools import cached_property
+from typing import Any, Optional
+
+import numpy as np
+from PIL import Image
+
+try:
+    import cv2
+except ImportError as e:
+    raise ImportError(
+        "opencv-python is required for card_frame. "
+        "Install with: pip install opencv-python>=4.9.0"
+    ) from e
+
+from services.card_warp import PositionedQuad, warp_card_array, warp_card_best_effort_array
+from services.grading.canonical import CANONICAL_H, CANONICAL_W, CanonicalImage, canonical_from_warp
+from services.grading.features import CanonicalFeatures
+from services.grading.photo_quality import ocr_glare_mask
+from services.image_arrays import as_rgb_array
+from services.image_ingest import WORKING_MAX_SIDE, IngestedImage, ingest_image_bytes
+from services.orientation import OrientationDecision, normalize_orientation, orientation_enabled
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+
+class CardFrame:
+    """Decoded photo plus its lazily computed warp/canonical planes.
+
+    Not thread-safe: a frame belongs to a single request.
+    """
+
+    def __init__(
+        self,
+        image: Image.Image,
+        ingest: Optional[IngestedImage] = None,
+        seed: Optional[PositionedQuad] = None,
+        search_near: Optional[np.ndarray] = None,
+    ) -> None:
+        self.image = image.convert("RGB") if image.mode != "RGB" else image
+        self.ingest = ingest
+        # When seeded (multi-card photos), the warp uses this quad instead of
+        # running single-card detection on the whole photo.
+        self.seed = seed
+        # Burst frames: search for the card near a quad found in another frame.
+        self.search_near = search_near
+
+    @classmethod
+    def from_bytes(cls, image_bytes: bytes, working_max_side: int = WORKING_MAX_SIDE) -> "CardFrame":
+        """Ingest image bytes (JPEG, PNG) into a frame.
+
+        working_max_side: see ingest_image_bytes; multi-card photos pass
+        FULL_RESOLUTION so each card keeps its native pixels.
+
+        Raises ImageTooLargeError for uploads over the pixel cap, and the PIL
+        error for undecodable payloads.
+        """
+        ingested = ingest_image_bytes(image_bytes, working_max_side=working_max_side)
+        return cls(ingested.image, ingest=ingested)
+
+    def for_quad(self, seed: PositionedQuad) -> "CardFrame":
+        """Child frame for one card of a multi-card photo.
+
+        The child shares this frame's decode and source arrays; only its warp
+        (and everything derived from it) is computed separately.
+        """
+        child = CardFrame(self.image, ingest=self.ingest, seed=seed)
+        child.__dict__["rgb"] = self.rgb
+        child.__dict__["gray"] = self.gray
+        return child
+
+    def with_search_window(self, quad: np.ndarray) -> "CardFrame":
+        """Copy of this frame whose quad search is limited to a window around quad.
+
+        Shares the decode and source arrays; any warp already computed on this
+        frame is not carried over.
+        """
+        child = CardFrame(self.image, ingest=self.ingest, search_near=quad)
+        child.__dict__["rgb"] = self.rgb
+        child.__dict__["gray"] = self.gray
+        return child
+
+    @property
+    def content_hash(self) -> Optional[str]:
+        """sha256 of the encoded upload, when the frame came from bytes.
+
+        A card of a multi-card photo gets its own hash, derived from the
+        photo's hash and the card's quad index.
+        """
+        if self.ingest is None:
+            return None
+        if self.seed is not None:
+            return hashlib.sha256(f"{self.ingest.content_hash}:quad{self.seed.index}".encode("utf-8")).hexdigest()
+        return self.ingest.content_hash
+
+    @property
+    def size(self) -> tuple[int, int]:
+        return self.image.size
+
+    @cached_property
+    def rgb(self) -> np.ndarray:
+        """Source photo as an HxWx3 uint8 array."""
+        return _readonly(as_rgb_array(self.image))
+
+    @cached_property
+    def gray(self) -> np.ndarray:
+        return _readonly(cv2.cvtColor(self.rgb, cv2.COLOR_RGB2GRAY))
+
+    # ------------------------------------------------------------------
+    # Warp (shared by identity and grading)
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def _warp(self) -> tuple[Optional[np.ndarray], bool, str, dict[str, Any], Optional[np.ndarray]]:
+        if self.seed is None:
+            return warp_card_best_effort_array(self.rgb, gray=self.gray, search_near=self.search_near)
+        try:
+            warped = warp_card_array(self.rgb, self.seed.quad)
+        except Exception:
+            return None, False, "warp_failed", self.seed.debug, self.seed.quad
+        return warped, True, f"warp_multi_{self.seed.debug.get('pipeline', 'unknown')}", self.seed.debug, self.seed.quad
+
+    @property
+    def quad(self) -> Optional[np.ndarray]:
+        """Detected card quad (TL, TR, BR, BL) in source pixels, or None."""
+        return self._warp[4]
+
+    @cached_property
+    def _oriented(self) -> tuple[Optional[np.ndarray], Optional[OrientationDecision]]:
+        warped = self._warp[0]
+        if warped is None or not orientation_enabled():
+            return warped, None
+        return normalize_orientation(self.rgb, warped, self.quad)
+
+    @property
+    def orientation(self) -> Optional[OrientationDecision]:
+        """Orientation decision applied to the warp (None if not run)."""
+        return self._oriented[1]
+
+    @cached_property
+    def warped_rgb(self) -> np.ndarray:
+        """Upright warped card as an array, or the source array when no quad was found."""
+        warped = self._oriented[0]
+        return self.rgb if warped is None else _readonly(warped)
+
+    @cached_property
+    def warped(self) -> Image.Image:
+        """Warped card as a PIL image (OCR boundary)."""
+        if self._warp[0] is None:
+            return self.image
+        return Image.fromarray(self.warped_rgb)
+
+    @cached_property
+    def warped_glare_mask(self) -> np.ndarray:
+        """Glare map of the warped card (OCR region pruning)."""
+        return _readonly(ocr_glare_mask(cv2.cvtColor(self.warped_rgb, cv2.COLOR_RGB2GRAY)))
+
+    @property
+    def warp_used(self) -> bool:
+        return self._warp[1]
+
+    @property
+    def warp_reason(self) -> str:
+        return self._warp[2]
+
+    @property
+    def warp_debug(self) -> dict[str, Any]:
+        return self._warp[3]
+
+    # ------------------------------------------------------------------
+    # Canonical image + derived planes (grading detectors)
+    # ------------------------------------------------------------------
+
+    @cached_property
+    def canonical(self) -> CanonicalImage:
+        orientation = self.orientation.to_trace() if self.orientation is not None else None
+        return canonical_from_warp(
+            self.warped, self.warp_used, self.warp_reason, self.warp_debug, orientation=orientation
+        )
+
+    @cached_property
+    def canonical_rgb(self) -> np.ndarray:
+        # A successful warp is already canonical-sized: reuse it without a copy.
+        if self.warped_rgb.shape[:2] == (CANONICAL_H, CANONICAL_W):
+            return self.warped_rgb
+        return _readonly(as_rgb_array(self.canonical.image))
+
+    @cached_property
+    def canonical_features(self) -> CanonicalFeatures:
+        """Shared derived planes of the canonical image (grading detectors)."""
+        return CanonicalFeatures(self.canonical_rgb)
+
+    @property
+    def canonical_gray(self) -> np.ndarray:
+        return self.canonical_features.gray
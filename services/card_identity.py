@@ -10,7 +10,6 @@ import re
 from dataclasses import dataclass
 from typing import Optional
 import hashlib
-import io
 
 import pytesseract
 from PIL import Image, ImageEnhance, ImageFilter
@@ -19,8 +18,15 @@ import numpy as np
 from domain.types import CardIdentity
 from services.card_number import parse_card_number_from_crop
 from services.card_enrichment import enrich_identity
-from services.card_warp import warp_card_best_effort
+from services.card_frame import CardFrame
+from services.card_identity_energy import EnergyGlyph, EnergySymbol, find_energy_symbol, measure_energy_glyph
 from services.card_identity_wotc import wotc_number_fallback
+from services.grading.photo_quality import OCR_GLARE_SKIP_RATIO, box_glare_ratio
+from services.field_layout import FieldBox, locate_fields
+from services.header_band import classify_header_band
+from services.ocr_scale import resize_for_ocr
+from services.ocr_config import tesseract_args
+from services.image_arrays import ImageLike, as_rgb_array
 from services.pokemon_names import (
     get_all_pokemon_names,
     get_owner_prefixes,
@@ -72,7 +78,6 @@ CARD_NUMBER_BL_TIGHT = OCRRegion(top_ratio=0.93, bottom_ratio=1.0, left_ratio=0.
 CARD_NUMBER_BL_WIDE = OCRRegion(top_ratio=0.88, bottom_ratio=1.0, left_ratio=0.01, right_ratio=0.42)
 
 CARD_NUMBER_PATTERN = re.compile(r'(\d{1,3})\s*/\s*(\d{1,3})')
-TESSERACT_LANG = 'eng'
 
 # OCR configs tuned for small, high-contrast text regions.
 # - psm 7: single line
@@ -365,7 +370,7 @@ def _detect_card_type_early(image: Image.Image) -> str:
         
         for config, img in strategies:
             try:
-                text = pytesseract.image_to_string(img, lang=TESSERACT_LANG, config=config)
+                text = pytesseract.image_to_string(img, **tesseract_args("text", config))
                 text_lower = (text or "").lower()
                 
                 # Check for clear "TRAINER" indicator
@@ -387,7 +392,7 @@ def _detect_card_type_early(image: Image.Image) -> str:
         # Pokemon cards typically have the Pokemon name prominently in the header
         for config, img in strategies[:1]:
             try:
-                text = pytesseract.image_to_string(img, lang=TESSERACT_LANG, config=config)
+                text = pytesseract.image_to_string(img, **tesseract_args("text", config))
                 if text:
                     for pname in _POKEMON_NAMES:
                         if len(pname) >= 4 and pname in _normalize_for_match(text):
@@ -401,7 +406,7 @@ def _detect_card_type_early(image: Image.Image) -> str:
         return "unknown"
 
 
-def _detect_energy_type_from_color(image: Image.Image) -> Optional[str]:
+def _detect_energy_type_from_color(image: ImageLike) -> Optional[str]:
     """
     Detect energy type from dominant color in the card center.
     
@@ -411,7 +416,7 @@ def _detect_energy_type_from_color(image: Image.Image) -> Optional[str]:
     """
     try:
         # Sample the center region where energy symbol would be
-        arr = np.array(image.convert("RGB"), dtype=np.uint8)
+        arr = as_rgb_array(image)
         h, w, _ = arr.shape
         
         # Center region (40-60% from top, 30-70% from sides)
@@ -420,34 +425,60 @@ def _detect_energy_type_from_color(image: Image.Image) -> Optional[str]:
         # Calculate average color
         avg_color = center.mean(axis=(0, 1))
         r, g, b = avg_color
-        
-        # Map dominant colors to energy types
-        # These thresholds are approximations based on energy card designs
-        if g > r and g > b and g > 100:
-            return "grass"
-        if r > g and r > b and r > 150:
-            if b > 100:
-                return "psychic"  # Purple-ish
-            return "fire"
-        if b > r and b > g and b > 120:
-            return "water"
-        if r > 180 and g > 180 and b < 100:
-            return "lightning"
-        if r > 150 and g > 100 and b < 100:
-            return "fighting"
-        if r < 100 and g < 100 and b < 100:
-            return "darkness"
-        if r > 150 and g > 150 and b > 150:
-            return "colorless"
-        if r > 100 and g > 100 and b > 100 and abs(r - g) < 30 and abs(g - b) < 30:
-            return "metal"
-        
-        return None
+        return _energy_type_for_color(r, g, b)
         
     except Exception:
         return None
 
 
+def _energy_type_for_color(r: float, g: float, b: float) -> Optional[str]:
+    """Map an energy symbol's dominant RGB color to an energy type (or None)."""
+    # These thresholds are approximations based on energy card designs
+    if g > r and g > b and g > 100:
+        return "grass"
+    # Yellow before red: r > g also holds for most lightning yellows.
+    if r > 180 and g > 180 and b < 100:
+        return "lightning"
+    if r > g and r > b and r > 150:
+        if b > 100:
+            return "psychic"  # Purple-ish
+        return "fire"
+    if b > r and b > g and b > 120:
+        return "water"
+    if r > 150 and g > 100 and b < 100:
+        return "fighting"
+    if r < 100 and g < 100 and b < 100:
+        return "darkness"
+    if r > 150 and g > 150 and b > 150:
+        return "colorless"
+    if r > 100 and g > 100 and b > 100 and abs(r - g) < 30 and abs(g - b) < 30:
+        return "metal"
+    
+    return None
+
+
+def _identify_basic_energy(rgb: np.ndarray) -> Optional[tuple[str, str, EnergySymbol, EnergyGlyph]]:
+    """
+    Identify a basic Energy card from its central symbol, without OCR.
+
+    The symbol's disc must be found (shape), hold a single basic glyph (so
+    special Energy discs go through OCR), and its color must map to an
+    energy type whose basic card is in the Energy name database.
+
+    Returns: (card name, energy type, symbol, glyph) or None if not confident
+    """
+    symbol = find_energy_symbol(rgb)
+    if symbol is None:
+        return None
+    glyph = measure_energy_glyph(rgb, symbol)
+    if not glyph.is_basic:
+        return None
+    energy_type = _energy_type_for_color(*symbol.rim_color(rgb))
+    if energy_type is None or f"{energy_type} energy" not in _ENERGY_CARD_NAMES:
+        return None
+    return f"{energy_type.title()} Energy", energy_type, symbol, glyph
+
+
 def _name_regions_for_card_type(card_type: str, template_family: str) -> list[OCRRegion]:
     """
     Select appropriate name OCR regions based on detected card type.
@@ -613,7 +644,7 @@ def _extract_trainer_name(image: Image.Image) -> Optional[str]:
         
         for config in configs:
             try:
-                text = pytesseract.image_to_string(enhanced, lang=TESSERACT_LANG, config=config)
+                text = pytesseract.image_to_string(enhanced, **tesseract_args("name", config))
                 text = (text or "").strip()
                 
                 if text and len(text) >= 3:
@@ -632,7 +663,7 @@ def _extract_trainer_name(image: Image.Image) -> Optional[str]:
             binary = Image.fromarray((arr > threshold).astype(np.uint8) * 255)
             
             for config in configs[:2]:
-                text = pytesseract.image_to_string(binary, lang=TESSERACT_LANG, config=config)
+                text = pytesseract.image_to_string(binary, **tesseract_args("name", config))
                 text = (text or "").strip()
                 
                 if text and len(text) >= 3:
@@ -815,7 +846,7 @@ def _extract_energy_name(image: Image.Image, detected_type: Optional[str]) -> Op
         
         for config in configs:
             try:
-                text = pytesseract.image_to_string(enhanced, lang=TESSERACT_LANG, config=config)
+                text = pytesseract.image_to_string(enhanced, **tesseract_args("name", config))
                 text = (text or "").strip()
                 
                 if text and len(text) >= 3:
@@ -868,7 +899,11 @@ def _clean_energy_name(text: str) -> str:
     return result.strip()
 
 
-def extract_card_identity(image: Image.Image, requested_card_type: Optional[str] = None) -> CardIdentity:
+def extract_card_identity(
+    image: Image.Image,
+    requested_card_type: Optional[str] = None,
+    frame: Optional[CardFrame] = None,
+) -> CardIdentity:
     """Extract card identity from a trading card front image.
 
     Returns CardIdentity with confidence score. Low confidence indicates
@@ -881,8 +916,15 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
     - When running under pytest (or when PREGRADE_SKIP_OCR=1), we skip the
       expensive warp/OCR steps and return a deterministic placeholder. This
       keeps unit tests fast and avoids hard dependency on the tesseract binary.
+
+    If a request-scoped CardFrame for the same image is provided, its warp is
+    reused (and shared with the grading detectors) instead of recomputed, and
+    the trace hash comes from the encoded upload bytes instead of the pixels.
     """
-    image_hash = _compute_image_hash(image)
+    if frame is not None and frame.content_hash:
+        image_hash = frame.content_hash
+    else:
+        image_hash = _compute_image_hash(image)
 
     skip_ocr = os.environ.get("PREGRADE_SKIP_OCR", "").strip().lower() in {"1", "true", "yes"}
     if skip_ocr or os.environ.get("PYTEST_CURRENT_TEST"):
@@ -898,10 +940,57 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
             trainer_subtype=None,
         )
 
-    rgb_image = image.convert('RGB') if image.mode != 'RGB' else image
-    warped_image, warp_used, warp_reason, warp_debug = warp_card_best_effort(rgb_image)
-
-    working_image = warped_image
+    if frame is None:
+        frame = CardFrame(image)
+    warp_used = frame.warp_used
+    warp_reason = frame.warp_reason
+    warp_debug = frame.warp_debug
+
+    # PIL for the OCR calls; the color heuristics read the shared array.
+    working_image = frame.warped
+    working_rgb = frame.warped_rgb
+
+    # Basic Energy fast path: the card is one large colored symbol, so a shape
+    # check plus its color names the card without header/name OCR.
+    if requested_card_type == "energy":
+        basic = _identify_basic_energy(working_rgb)
+        if basic is not None:
+            energy_name, energy_type, symbol, glyph = basic
+            trace = {
+                "warp_used": warp_used,
+                "warp_reason": warp_reason,
+                "warp_debug": warp_debug,
+                "basic_energy_fast_path": True,
+                "energy_symbol": symbol.to_trace(),
+                "energy_glyph": glyph.to_trace(),
+                "early_card_type": "energy",
+                "early_energy_type": energy_type,
+                "detected_card_type": "energy",
+            }
+            _add_frame_trace(trace, frame)
+            return enrich_identity(CardIdentity(
+                set_name="Unknown Set",
+                card_name=energy_name,
+                card_number=None,
+                variant=None,
+                details={"trace": trace},
+                confidence=_calculate_confidence(energy_name, None),
+                match_method=f"basic_energy_symbol:{image_hash[:16]}:{energy_type}:{warp_reason}",
+                card_type="energy",
+                trainer_subtype=None,
+            ))
+
+    # Regions washed out by glare are not sent to tesseract (every strategy
+    # fails on them); the next candidate region or fallback is used instead.
+    glare = frame.warped_glare_mask
+    glare_skipped: list[dict[str, str | float]] = []
+
+    def _glary(label: str, region: OCRRegion) -> bool:
+        ratio = _region_glare(glare, region)
+        if ratio < OCR_GLARE_SKIP_RATIO:
+            return False
+        glare_skipped.append({"region": label, "glare_ratio": round(ratio, 3)})
+        return True
     
     # PHASE 1: Early card type detection BEFORE name extraction
     # This allows us to use type-specific OCR regions.
@@ -909,22 +998,45 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
     # If requested_card_type is provided, we treat it as a *hard hint* for selecting
     # OCR regions and we avoid later "type flips" that can happen due to noisy OCR.
     # The API layer can still reject if the content appears mismatched.
+    #
+    # Otherwise the visual header-band classifier decides; header OCR only runs
+    # when it is unsure. For Trainers it also reads the subtype badge.
+    header = None
+    if requested_card_type not in {"pokemon", "energy"}:
+        header = classify_header_band(working_rgb)
+
     if requested_card_type in {"pokemon", "trainer", "energy"}:
         early_card_type = requested_card_type
+    elif header is not None and header.confident:
+        early_card_type = header.card_type
+    elif _glary("header", HEADER_REGION_TYPE_DETECT):
+        early_card_type = "unknown"
     else:
         early_card_type = _detect_card_type_early(working_image)
 
     early_energy_type = None
     if early_card_type == "energy":
-        early_energy_type = _detect_energy_type_from_color(working_image)
+        early_energy_type = _detect_energy_type_from_color(working_rgb)
     
-    template_family = _detect_template_family(working_image)
+    template_family = _detect_template_family(working_rgb)
     
+    # One tight ROI per field from layout anchors (name line, collector
+    # number) goes first; the fixed per-template boxes are only swept when it
+    # is missing or unreadable.
+    layout = locate_fields(working_rgb)
+
     # Select name regions based on detected card type
-    name_regions = _name_regions_for_card_type(early_card_type, template_family)
+    name_regions = [
+        (f"name_{index}", region)
+        for index, region in enumerate(_name_regions_for_card_type(early_card_type, template_family))
+    ]
+    if layout.name is not None:
+        name_regions.insert(0, ("name:localized", _field_region(layout.name)))
     name_candidates: list[str] = []
     
-    for region in name_regions:
+    for label, region in name_regions:
+        if _glary(label, region):
+            continue
         # Use improved multi-strategy name extraction
         raw = _extract_name_text(working_image, region)
         parsed = _parse_card_name(raw)
@@ -936,6 +1048,10 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
         # For Trainer/Energy cards, accept any reasonable parsed name
         if early_card_type in ("trainer", "energy") and len(parsed) >= 3:
             break
+        # The localized ROI replaces the fixed sweep: an unknown-type card
+        # stops on any readable name there
+        if label == "name:localized" and early_card_type != "pokemon" and len(parsed) >= 3:
+            break
 
     card_name = _best_name_from_list(name_candidates)
     
@@ -964,6 +1080,8 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
     # Rule: card number is always present in a bottom corner (bottom-right or bottom-left).
     # Region selection is adapted based on card type and template family for better hit rate.
     candidate_regions = _number_regions_for_card_type(early_card_type, template_family)
+    if layout.number is not None:
+        candidate_regions = [(f"{layout.number_corner}:localized", _field_region(layout.number))] + candidate_regions
 
     best_number = None
     best_conf = -1.0
@@ -971,6 +1089,8 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
     number_candidates: list[dict[str, str | float | bool]] = []
 
     for label, region in candidate_regions:
+        if _glary(label, region):
+            continue
         crop = _crop_region(working_image, region)
         
         template_result = None
@@ -1079,6 +1199,10 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
             best_number = chosen_num
             best_region = f"{label}:{chosen_method}"
 
+        # A plausible read from the localized ROI replaces the corner sweep.
+        if best_number is not None and label.endswith(":localized"):
+            break
+
     card_number = best_number
 
     if card_number is None and _debug_number_crops_enabled():
@@ -1086,7 +1210,10 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
 
     # WOTC/vintage fallback: focus on bottom-right number and try rotation sweep OCR.
     if card_number is None:
-        wotc_num, wotc_meta = wotc_number_fallback(working_image)
+        wotc_num, wotc_meta = wotc_number_fallback(working_image, glare_mask=glare)
+        glare_skipped.extend(
+            {**skip, "region": f"bottom_right:wotc_{skip['region']}"} for skip in wotc_meta.get("glare_skipped", [])
+        )
         if wotc_num:
             card_number = wotc_num
             best_region = "wotc_fallback"
@@ -1106,12 +1233,13 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
     # Early detection is faster and uses targeted header region
     detected_card_type = early_card_type if early_card_type != "unknown" else "pokemon"
     trainer_subtype = None
+    full_ocr_text = None
     
     # If early detection was uncertain, try full-card OCR as fallback
     if early_card_type == "unknown":
         try:
             full_ocr_text = pytesseract.image_to_string(
-                working_image, lang=TESSERACT_LANG, config="--psm 6 --oem 1"
+                working_image, **tesseract_args("text", "--psm 6 --oem 1")
             )
             fallback_type = _detect_card_type_from_text(full_ocr_text)
             if fallback_type != "pokemon":  # Only override if we found something specific
@@ -1119,15 +1247,20 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
         except Exception:
             pass
     
-    # If detected as trainer, try to identify subtype
+    # If detected as trainer, identify the subtype: from the header badge when
+    # the classifier read one, else from full-card OCR (reused if already run).
     if detected_card_type == "trainer":
-        try:
-            full_ocr_text = pytesseract.image_to_string(
-                working_image, lang=TESSERACT_LANG, config="--psm 6 --oem 1"
-            )
-            trainer_subtype = _detect_trainer_subtype(full_ocr_text)
-        except Exception:
-            pass
+        if header is not None and header.confident and header.trainer_subtype:
+            trainer_subtype = header.trainer_subtype
+        else:
+            try:
+                if full_ocr_text is None:
+                    full_ocr_text = pytesseract.image_to_string(
+                        working_image, **tesseract_args("text", "--psm 6 --oem 1")
+                    )
+                trainer_subtype = _detect_trainer_subtype(full_ocr_text)
+            except Exception:
+                pass
     
     # Final validation: if we found a valid Pokemon name, it's likely a Pokemon card
     # unless early detection strongly indicated otherwise.
@@ -1147,7 +1280,11 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
         "early_card_type": early_card_type,
         "early_energy_type": early_energy_type,
         "detected_card_type": detected_card_type,
+        "header_band": header.to_trace() if header is not None else None,
+        "field_layout": layout.to_trace(),
+        "ocr_glare_skipped": glare_skipped,
     }
+    _add_frame_trace(trace, frame)
     
     identity = CardIdentity(
         set_name="Unknown Set",
@@ -1166,7 +1303,18 @@ def extract_card_identity(image: Image.Image, requested_card_type: Optional[str]
     return enrich_identity(identity)
 
 
-def extract_card_identity_from_bytes(image_bytes: bytes, requested_card_type: Optional[str] = None) -> CardIdentity:
+def _add_frame_trace(trace: dict, frame: CardFrame) -> None:
+    if frame.ingest is not None:
+        trace["ingest"] = frame.ingest.trace()
+    if frame.orientation is not None:
+        trace["orientation"] = frame.orientation.to_trace()
+
+
+def extract_card_identity_from_bytes(
+    image_bytes: bytes,
+    requested_card_type: Optional[str] = None,
+    frame: Optional[CardFrame] = None,
+) -> CardIdentity:
     """Extract card identity from raw image bytes (JPEG, PNG).
 
     NOTE: OCR + warping is relatively expensive. As a safety guard (and to keep
@@ -1177,20 +1325,35 @@ def extract_card_identity_from_bytes(image_bytes: bytes, requested_card_type: Op
 
     If requested_card_type is provided ("pokemon"|"trainer"|"energy"), we use it
     as a hint to select OCR regions and avoid brittle post-hoc type flips.
+
+    If the caller already decoded the bytes into a CardFrame (e.g. the analyze
+    handler, which reuses it for condition signals), pass it to skip decoding.
     """
     try:
-        image = Image.open(io.BytesIO(image_bytes))
-        image.load()
+        if frame is None:
+            frame = CardFrame.from_bytes(image_bytes)
 
-        w, h = image.size
+        w, h = frame.size
         if max(w, h) < 200:
             return _empty_identity(image_bytes)
 
-        return extract_card_identity(image, requested_card_type=requested_card_type)
+        return extract_card_identity(frame.image, requested_card_type=requested_card_type, frame=frame)
     except Exception:
         return _empty_identity(image_bytes)
 
 
+def extract_card_identity_from_frame(frame: CardFrame, requested_card_type: Optional[str] = None) -> CardIdentity:
+    """Extract card identity from an already decoded frame (e.g. one card of a multi-card photo).
+
+    Like extract_card_identity_from_bytes, never raises: a frame that cannot
+    be read gets an empty identity keyed by the frame's content hash.
+    """
+    try:
+        return extract_card_identity(frame.image, requested_card_type=requested_card_type, frame=frame)
+    except Exception:
+        return _empty_identity_for_hash(frame.content_hash or _compute_image_hash(frame.image))
+
+
 def extract_card_identity_from_path(image_path: str) -> CardIdentity:
     """Extract card identity from an image file path."""
     try:
@@ -1213,16 +1376,12 @@ def _preprocess_image(image: Image.Image) -> Image.Image:
 
     We keep this deterministic (no randomness) and fast:
     - grayscale
-    - upsample 2x (small text)
+    - rescale to the target text height (2x if no text is measurable)
     - contrast boost
     - light denoise
     - adaptive binarize
     """
-    processed = image.convert('L')
-
-    # Upscale to help Tesseract on small UI text.
-    w, h = processed.size
-    processed = processed.resize((max(1, w * 2), max(1, h * 2)), resample=Image.Resampling.BICUBIC)
+    processed = resize_for_ocr(image.convert('L'), fallback=2.0)
 
     processed = ImageEnhance.Contrast(processed).enhance(2.2)
     processed = processed.filter(ImageFilter.MedianFilter(size=3))
@@ -1243,12 +1402,8 @@ def _preprocess_name_region(image: Image.Image) -> list[Image.Image]:
     """
     results: list[Image.Image] = []
     
-    gray = image.convert('L')
-    w, h = gray.size
-    
-    # Upscale 3x for better OCR on small text
-    scale = 3
-    gray = gray.resize((max(1, w * scale), max(1, h * scale)), resample=Image.Resampling.BICUBIC)
+    # Rescale to the target text height (3x if no text is measurable)
+    gray = resize_for_ocr(image.convert('L'), fallback=3.0)
     
     arr = np.array(gray, dtype=np.uint8)
     
@@ -1276,13 +1431,28 @@ def _preprocess_name_region(image: Image.Image) -> list[Image.Image]:
     return results
 
 
-def _crop_region(image: Image.Image, region: OCRRegion) -> Image.Image:
-    width, height = image.size
+def _region_box(size: tuple[int, int], region: OCRRegion) -> tuple[int, int, int, int]:
+    width, height = size
     left = int(width * region.left_ratio)
     right = int(width * region.right_ratio)
     top = int(height * region.top_ratio)
     bottom = int(height * region.bottom_ratio)
-    return image.crop((left, top, right, bottom))
+    return left, top, right, bottom
+
+
+def _crop_region(image: Image.Image, region: OCRRegion) -> Image.Image:
+    return image.crop(_region_box(image.size, region))
+
+
+def _field_region(box: FieldBox) -> OCRRegion:
+    return OCRRegion(
+        top_ratio=box.top_ratio, bottom_ratio=box.bottom_ratio, left_ratio=box.left_ratio, right_ratio=box.right_ratio
+    )
+
+
+def _region_glare(mask: np.ndarray, region: OCRRegion) -> float:
+    """Share of saturated pixels in a region of the card's glare mask."""
+    return box_glare_ratio(mask, _region_box((mask.shape[1], mask.shape[0]), region))
 
 
 def _extract_region_text(image: Image.Image, region: OCRRegion, config: str) -> str:
@@ -1291,7 +1461,7 @@ def _extract_region_text(image: Image.Image, region: OCRRegion, config: str) ->
         cropped = _crop_region(image, region)
         cropped = _preprocess_image(cropped)
 
-        text = pytesseract.image_to_string(cropped, lang=TESSERACT_LANG, config=config)
+        text = pytesseract.image_to_string(cropped, **tesseract_args("text", config))
         return text.strip()
     except Exception:
         return ""
@@ -1309,14 +1479,15 @@ def _extract_name_text(image: Image.Image, region: OCRRegion) -> str:
         candidates: list[str] = []
         
         # Strategy 1: Try raw image with multiple PSM modes (psm 6 often works best for names)
+        raw = resize_for_ocr(cropped, fallback=1.0)
         raw_configs = [
-            ("--psm 6 --oem 1", cropped),  # Block of text - often finds names in noisy backgrounds
-            ("--psm 7 --oem 1 -c preserve_interword_spaces=1", cropped),  # Single line
+            ("--psm 6 --oem 1", raw),  # Block of text - often finds names in noisy backgrounds
+            ("--psm 7 --oem 1 -c preserve_interword_spaces=1", raw),  # Single line
         ]
         
         for config, img in raw_configs:
             try:
-                text = pytesseract.image_to_string(img, lang=TESSERACT_LANG, config=config)
+                text = pytesseract.image_to_string(img, **tesseract_args("name", config))
                 text = (text or "").strip()
                 if text and len(text) >= 2:
                     # Extract any Pokemon name from the noisy output
@@ -1337,7 +1508,7 @@ def _extract_name_text(image: Image.Image, region: OCRRegion) -> str:
         for prep_img in preprocessed_versions[:2]:
             for config in configs:
                 try:
-                    text = pytesseract.image_to_string(prep_img, lang=TESSERACT_LANG, config=config)
+                    text = pytesseract.image_to_string(prep_img, **tesseract_args("name", config))
                     text = (text or "").strip()
                     if text and len(text) >= 2:
                         extracted = _extract_pokemon_name_from_text(text)
@@ -1406,7 +1577,7 @@ def _extract_name_from_full_card(image: Image.Image) -> str:
     """
     try:
         # Full card OCR
-        text = pytesseract.image_to_string(image, lang=TESSERACT_LANG, config="--psm 6 --oem 1")
+        text = pytesseract.image_to_string(image, **tesseract_args("name", "--psm 6 --oem 1"))
         if not text:
             return ""
         
@@ -1643,10 +1814,11 @@ def _ocr_number_text(crop: Image.Image) -> str:
     
     all_text = []
     
-    # Try on original crop first
+    # Try on the unprocessed crop (at the target text height) first
+    raw = resize_for_ocr(crop, fallback=1.0)
     for config in configs:
         try:
-            text = pytesseract.image_to_string(crop, lang=TESSERACT_LANG, config=config)
+            text = pytesseract.image_to_string(raw, **tesseract_args("number", config))
             text = (text or "").strip()
             if text:
                 all_text.append(text)
@@ -1662,7 +1834,7 @@ def _ocr_number_text(crop: Image.Image) -> str:
         processed = _preprocess_image(crop)
         for config in configs[:2]:  # Limit for speed
             try:
-                text = pytesseract.image_to_string(processed, lang=TESSERACT_LANG, config=config)
+                text = pytesseract.image_to_string(processed, **tesseract_args("number", config))
                 text = (text or "").strip()
                 if text:
                     all_text.append(text)
@@ -1777,9 +1949,9 @@ def _calculate_number_plausibility_score(card_number: str) -> float:
     return max(0.0, min(1.0, score))
 
 
-def _detect_template_family(image: Image.Image) -> str:
+def _detect_template_family(image: ImageLike) -> str:
     """Heuristic template family detection for name band placement."""
-    arr = np.array(image.convert("RGB"), dtype=np.uint8)
+    arr = as_rgb_array(image)
     h, w, _ = arr.shape
     if h < 10 or w < 10:
         return "modern"
@@ -1938,7 +2110,10 @@ def _calculate_confidence(card_name: str, card_number: Optional[str]) -> float:
 
 def _empty_identity(image_bytes: bytes) -> CardIdentity:
     """Return empty identity with zero confidence for unreadable images."""
-    content_hash = hashlib.sha256(image_bytes).hexdigest()
+    return _empty_identity_for_hash(hashlib.sha256(image_bytes).hexdigest())
+
+
+def _empty_identity_for_hash(content_hash: str) -> CardIdentity:
     return CardIdentity(
         set_name="Unknown Set",
         card_name="",
@@ -0,0 +1,175 @@
+"""Basic Energy symbol check.
+
+Basic Energy cards are one large energy symbol (a filled disc with a glyph)
+centered on the card. When the caller already knows it has an Energy card,
+finding that disc, checking that it carries a single basic-energy glyph and
+reading its color identifies the card without OCR.
+
+Special Energy cards can also show a centered disc (e.g. Double Colorless
+Energy), but not one holding a single solid glyph that contrasts with it:
+their discs are plain, split into several symbols, or overprinted with text.
+
+Works on warped (canonical) fronts.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError as e:
+    raise ImportError(
+        "opencv-python is required for the basic energy check. "
+        "Install with: pip install opencv-python>=4.9.0"
+    ) from e
+
+
+# Symbol geometry, as fractions of the card width.
+SYMBOL_MIN_RADIUS = 0.18
+SYMBOL_MAX_RADIUS = 0.42
+SYMBOL_MAX_CENTER_OFFSET = 0.08
+
+# Basic glyph inside the disc (within GLYPH_DISC_FRACTION of the radius):
+# one solid shape contrasting with the rim color, near the disc center.
+GLYPH_DISC_FRACTION = 0.7
+GLYPH_MIN_COLOR_DISTANCE = 60.0  # RGB distance from the rim color
+GLYPH_MIN_COVERAGE = 0.10  # of the inner disc
+GLYPH_MAX_COVERAGE = 0.70
+GLYPH_MIN_DOMINANCE = 0.80  # largest component's share of glyph pixels
+GLYPH_MAX_CENTER_OFFSET = 0.30  # of the radius
+
+# Analysis width: the symbol is large, a small image is enough.
+_WORK_WIDTH = 240
+
+
+@dataclass(frozen=True)
+class EnergySymbol:
+    """The central disc of a basic Energy card, in the input image's pixels."""
+    cx: float
+    cy: float
+    radius: float
+    # Mean gradient magnitude along the rim, relative to the card's mean
+    # gradient: how sharply the disc stands out from its background.
+    edge_contrast: float
+
+    def rim_color(self, rgb: np.ndarray) -> tuple[float, float, float]:
+        """Median RGB of the ring just inside the rim (clear of the glyph)."""
+        h, w = rgb.shape[:2]
+        yy, xx = np.ogrid[:h, :w]
+        d2 = (xx - self.cx) ** 2 + (yy - self.cy) ** 2
+        ring = (d2 >= (0.75 * self.radius) ** 2) & (d2 <= (0.92 * self.radius) ** 2)
+        r, g, b = np.median(rgb[ring], axis=0)
+        return float(r), float(g), float(b)
+
+    def to_trace(self) -> dict[str, Any]:
+        return {
+            "center": [round(self.cx, 1), round(self.cy, 1)],
+            "radius": round(self.radius, 1),
+            "edge_contrast": round(self.edge_contrast, 2),
+        }
+
+
+@dataclass(frozen=True)
+class EnergyGlyph:
+    """The glyph inside an energy disc, measured against the disc's rim color."""
+    coverage: float  # share of the inner disc
+    dominance: float  # largest component's share of glyph pixels
+    center_offset: float  # largest component's centroid from the disc center, in radii
+    contrast: float  # mean RGB distance of glyph pixels from the rim color
+
+    @property
+    def is_basic(self) -> bool:
+        """One solid, centered shape: the glyph of a basic Energy symbol."""
+        return (
+            GLYPH_MIN_COVERAGE <= self.coverage <= GLYPH_MAX_COVERAGE
+            and self.dominance >= GLYPH_MIN_DOMINANCE
+            and self.center_offset <= GLYPH_MAX_CENTER_OFFSET
+        )
+
+    def to_trace(self) -> dict[str, Any]:
+        return {
+            "coverage": round(self.coverage, 3),
+            "dominance": round(self.dominance, 3),
+            "center_offset": round(self.center_offset, 3),
+            "contrast": round(self.contrast, 1),
+            "is_basic": self.is_basic,
+        }
+
+
+def measure_energy_glyph(rgb: np.ndarray, symbol: EnergySymbol) -> EnergyGlyph:
+    """Glyph statistics of the disc found by find_energy_symbol on the same image."""
+    h, w = rgb.shape[:2]
+    scale = min(1.0, _WORK_WIDTH / float(w))
+    small = cv2.resize(rgb, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    cx, cy, radius = symbol.cx * scale, symbol.cy * scale, symbol.radius * scale
+
+    sh, sw = small.shape[:2]
+    yy, xx = np.ogrid[:sh, :sw]
+    inner = (xx - cx) ** 2 + (yy - cy) ** 2 <= (GLYPH_DISC_FRACTION * radius) ** 2
+    rim = np.asarray(symbol.rim_color(rgb), dtype=np.float32)
+    distance = np.linalg.norm(small.astype(np.float32) - rim, axis=2)
+    glyph = inner & (distance >= GLYPH_MIN_COLOR_DISTANCE)
+
+    total = int(np.count_nonzero(glyph))
+    inner_px = max(1, int(np.count_nonzero(inner)))
+    if total == 0:
+        return EnergyGlyph(coverage=0.0, dominance=0.0, center_offset=1.0, contrast=0.0)
+    count, _, stats, centroids = cv2.connectedComponentsWithStats(glyph.astype(np.uint8), connectivity=8)
+    largest = 1 + int(np.argmax(stats[1:, cv2.CC_STAT_AREA]))
+    gx, gy = centroids[largest]
+    return EnergyGlyph(
+        coverage=total / inner_px,
+        dominance=float(stats[largest, cv2.CC_STAT_AREA]) / total,
+        center_offset=float(np.hypot(gx - cx, gy - cy)) / max(radius, 1e-6),
+        contrast=float(distance[glyph].mean()),
+    )
+
+
+def find_energy_symbol(rgb: np.ndarray, min_edge_contrast: float = 1.5) -> Optional[EnergySymbol]:
+    """The centered energy disc of a card image, or None if there isn't one."""
+    h, w = rgb.shape[:2]
+    if h == 0 or w == 0:
+        return None
+    scale = min(1.0, _WORK_WIDTH / float(w))
+    small = cv2.resize(rgb, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    # Dark/light symbols stand out in luminance, yellow-on-cream ones only in
+    # saturation.
+    planes = (cv2.cvtColor(small, cv2.COLOR_RGB2GRAY), cv2.cvtColor(small, cv2.COLOR_RGB2HSV)[:, :, 1])
+    for plane in planes:
+        symbol = _centered_circle(cv2.GaussianBlur(plane, (5, 5), 0), min_edge_contrast)
+        if symbol is not None:
+            cx, cy, radius, edge_contrast = symbol
+            return EnergySymbol(cx=cx / scale, cy=cy / scale, radius=radius / scale, edge_contrast=edge_contrast)
+    return None
+
+
+def _centered_circle(plane: np.ndarray, min_edge_contrast: float) -> Optional[tuple[float, float, float, float]]:
+    h, w = plane.shape
+    circles = cv2.HoughCircles(
+        plane,
+        cv2.HOUGH_GRADIENT,
+        dp=1.0,
+        minDist=w,
+        param1=100,
+        param2=30,
+        minRadius=int(w * SYMBOL_MIN_RADIUS),
+        maxRadius=int(w * SYMBOL_MAX_RADIUS),
+    )
+    if circles is None:
+        return None
+    cx, cy, radius = (float(v) for v in circles[0][0])
+    if abs(cx - w / 2.0) > w * SYMBOL_MAX_CENTER_OFFSET or abs(cy - h / 2.0) > w * SYMBOL_MAX_CENTER_OFFSET:
+        return None
+
+    magnitude = cv2.magnitude(cv2.Sobel(plane, cv2.CV_32F, 1, 0), cv2.Sobel(plane, cv2.CV_32F, 0, 1))
+    angles = np.linspace(0.0, 2.0 * np.pi, 72, endpoint=False)
+    xs = np.clip((cx + radius * np.cos(angles)).astype(int), 0, w - 1)
+    ys = np.clip((cy + radius * np.sin(angles)).astype(int), 0, h - 1)
+    edge_contrast = float(magnitude[ys, xs].mean()) / (float(magnitude.mean()) + 1e-6)
+    if edge_contrast < min_edge_contrast:
+        return None
+    return cx, cy, radius, edge_contrast
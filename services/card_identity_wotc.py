@@ -4,6 +4,9 @@ from __future__ import annotations
 
 Goal: pull NN/NN from bottom-right even when generic OCR/template fails.
 Works best on warped (canonical) fronts.
+
+Each subcrop costs 27 tesseract calls (rotations x page modes), so subcrops
+washed out by glare are skipped when the caller passes the card's glare mask.
 """
 
 import math
@@ -14,21 +17,41 @@ import numpy as np
 from PIL import Image, ImageEnhance, ImageFilter
 import pytesseract
 
+from services.grading.photo_quality import OCR_GLARE_SKIP_RATIO, box_glare_ratio
+from services.ocr_config import tesseract_args
+from services.ocr_scale import rescale, text_scale
+
 CARD_NUMBER_PATTERN = re.compile(r"(\d{1,3})\s*/\s*(\d{1,3})")
 
 
-def wotc_number_fallback(front_warped: Image.Image) -> tuple[Optional[str], dict[str, Any]]:
+def wotc_number_fallback(
+    front_warped: Image.Image, glare_mask: Optional[np.ndarray] = None
+) -> tuple[Optional[str], dict[str, Any]]:
+    """Best NN/NN reading from the bottom-right corner, with its metadata.
+
+    glare_mask: saturated-pixel map of front_warped; subcrops covered by glare
+    are skipped and listed under "glare_skipped" in the metadata.
+    """
     img = front_warped.convert("RGB")
     W, H = img.size
 
     # Start from a bottom-right band and then tighten to avoid copyright/year line.
-    base = img.crop((int(W * 0.55), int(H * 0.82), W, H))
+    bx, by = int(W * 0.55), int(H * 0.82)
+    base = img.crop((bx, by, W, H))
 
     # Try multiple subcrops emphasizing the very bottom-right corner.
     candidates: list[tuple[str, Image.Image]] = []
+    skipped: list[dict[str, Any]] = []
     for (x0, y0) in [(0.20, 0.15), (0.30, 0.25), (0.35, 0.30)]:
-        c = base.crop((int(base.size[0] * x0), int(base.size[1] * y0), base.size[0], base.size[1]))
-        candidates.append((f"sub_{x0}_{y0}", c))
+        label = f"sub_{x0}_{y0}"
+        left, top = int(base.size[0] * x0), int(base.size[1] * y0)
+        if glare_mask is not None:
+            ratio = box_glare_ratio(glare_mask, (bx + left, by + top, W, H))
+            if ratio >= OCR_GLARE_SKIP_RATIO:
+                skipped.append({"region": label, "glare_ratio": round(ratio, 3)})
+                continue
+        c = base.crop((left, top, base.size[0], base.size[1]))
+        candidates.append((label, c))
 
     angles = [-12, -9, -6, -3, 0, 3, 6, 9, 12]
     psm_modes = [7, 8, 13]
@@ -38,12 +61,13 @@ def wotc_number_fallback(front_warped: Image.Image) -> tuple[Optional[str], dict
     best_meta: dict[str, Any] = {}
 
     for label, crop in candidates:
+        # One text-height measurement per subcrop (8x if unmeasurable).
+        scale = text_scale(crop, fallback=8.0)
         for ang in angles:
             rot = crop.rotate(ang, expand=True, fillcolor=(255, 255, 255))
 
-            # preprocess: grayscale, upscale, contrast, sharpen
-            g = rot.convert("L")
-            g = g.resize((g.size[0] * 8, g.size[1] * 8))
+            # preprocess: grayscale, rescale, contrast, sharpen
+            g = rescale(rot.convert("L"), scale)
             g = ImageEnhance.Contrast(g).enhance(2.5)
             g = g.filter(ImageFilter.SHARPEN)
 
@@ -57,7 +81,7 @@ def wotc_number_fallback(front_warped: Image.Image) -> tuple[Optional[str], dict
             for psm in psm_modes:
                 txt = pytesseract.image_to_string(
                     bw_img,
-                    config=f"--psm {psm} -c tessedit_char_whitelist=0123456789/",
+                    **tesseract_args("number", f"--psm {psm} -c tessedit_char_whitelist=0123456789/"),
                 )
                 m = CARD_NUMBER_PATTERN.search(txt or "")
                 if not m:
@@ -95,4 +119,6 @@ def wotc_number_fallback(front_warped: Image.Image) -> tuple[Optional[str], dict
                         "confidence": max(0.5, min(0.9, 0.5 + (score / 5.0))),
                     }
 
+    if skipped:
+        best_meta = {**best_meta, "glare_skipped": skipped}
     return best_num, best_meta
@@ -20,6 +20,8 @@ except ImportError as e:
 import numpy as np
 from PIL import Image
 
+from services.image_arrays import ImageLike, as_pil, as_rgb_array
+
 
 # Pokemon card aspect ratio: 63mm / 88mm = 0.716 (portrait)
 _CARD_ASPECT_TARGET = 63.0 / 88.0  # ~0.716
@@ -35,6 +37,20 @@ _MIN_AREA_RATIO = 0.08  # Reject tiny blobs that can't be real cards
 _MAX_AREA_RATIO = 0.97  # Reject quads that are basically the whole image (likely frame)
 _MIN_RECTANGULARITY = 0.70
 
+# Multi-card mode (binder pages, table spreads): each card is a small share of
+# the photo, so the area gate is much lower. Overlap is measured as
+# intersection / smaller area.
+_MULTI_MIN_AREA_RATIO = 0.008
+_MULTI_MAX_CARDS = 24
+_MULTI_MAX_OVERLAP = 0.2
+# A candidate whose area is mostly covered by >=2 smaller card candidates is a
+# group (binder page, two touching cards), not a card.
+_MULTI_GROUP_COVERAGE = 0.5
+
+# Seeded search (burst frames): the seed quad's bounding box is grown by this
+# fraction of its size on each side to form the search window.
+_SEED_WINDOW_MARGIN = 0.15
+
 
 @dataclass(frozen=True)
 class QuadCandidate:
@@ -49,15 +65,24 @@ class QuadCandidate:
     pipeline: str
 
 
-def detect_card_quad(pil_image: Image.Image) -> tuple[Optional[np.ndarray], dict[str, Any]]:
-    """Detect the card quadrilateral from a photo.
+def _gray_for(image: ImageLike, gray: Optional[np.ndarray]) -> np.ndarray:
+    if gray is not None:
+        return gray
+    return cv2.cvtColor(as_rgb_array(image), cv2.COLOR_RGB2GRAY)
+
+
+def detect_card_quad(
+    image: ImageLike,
+    gray: Optional[np.ndarray] = None,
+) -> tuple[Optional[np.ndarray], dict[str, Any]]:
+    """Detect the card quadrilateral from a photo (PIL image or RGB array).
 
     Returns (quad, debug). quad is a 4x2 array of points or None.
     Uses multiple preprocessing pipelines and picks the best scoring quad.
+    Callers that already hold the grayscale plane can pass it to skip the
+    conversion.
     """
-    rgb = pil_image.convert("RGB")
-    bgr = cv2.cvtColor(np.array(rgb), cv2.COLOR_RGB2BGR)
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    gray = _gray_for(image, gray)
     img_h, img_w = gray.shape
     image_area = float(img_h * img_w)
     image_center = (img_w / 2.0, img_h / 2.0)
@@ -65,16 +90,11 @@ def detect_card_quad(pil_image: Image.Image) -> tuple[Optional[np.ndarray], dict
     image_diag = float(np.sqrt(img_w**2 + img_h**2))
 
     # Multi-preprocess pipelines for robustness under glare/sleeves
-    edge_maps = _generate_edge_maps(gray)
+    pipeline_contours = _pipeline_contours(gray)
 
     all_candidates: List[QuadCandidate] = []
 
-    for pipeline_name, edges in edge_maps:
-        # Apply morphological closing to connect fragmented edges
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
-        closed = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
-        
-        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for pipeline_name, contours in pipeline_contours:
         candidates = _score_contours(contours, image_area, image_center, image_diag, pipeline_name)
         all_candidates.extend(candidates)
 
@@ -93,10 +113,7 @@ def detect_card_quad(pil_image: Image.Image) -> tuple[Optional[np.ndarray], dict
     best_ungated = max(all_candidates, key=lambda c: c.score) if all_candidates else None
 
     # Fallback: minAreaRect on largest contour from each pipeline, but only if it passes strict gates
-    for pipeline_name, edges in edge_maps:
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
-        closed = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
-        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for pipeline_name, contours in pipeline_contours:
         if not contours:
             continue
         largest = max(contours, key=cv2.contourArea)
@@ -134,6 +151,18 @@ def detect_card_quad(pil_image: Image.Image) -> tuple[Optional[np.ndarray], dict
     return None, debug_info
 
 
+def _pipeline_contours(gray: np.ndarray) -> List[tuple[str, Any]]:
+    """External contours of each edge map after closing, computed once per image."""
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
+    results: List[tuple[str, Any]] = []
+    for pipeline_name, edges in _generate_edge_maps(gray):
+        # Apply morphological closing to connect fragmented edges
+        closed = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
+        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+        results.append((pipeline_name, contours))
+    return results
+
+
 def _generate_edge_maps(gray: np.ndarray) -> List[tuple[str, np.ndarray]]:
     """Generate multiple edge maps from different preprocessing pipelines."""
     results: List[tuple[str, np.ndarray]] = []
@@ -177,6 +206,7 @@ def _score_contours(
     image_center: tuple[float, float],
     image_diag: float,
     pipeline: str,
+    min_area_ratio: float = 0.02,
 ) -> List[QuadCandidate]:
     """Score contours and return quad candidates."""
     candidates: List[QuadCandidate] = []
@@ -184,7 +214,7 @@ def _score_contours(
     for cnt in contours:
         area = float(cv2.contourArea(cnt))
         area_ratio = area / image_area
-        if area_ratio < 0.02:  # Quick filter for tiny contours
+        if area_ratio < min_area_ratio:  # Quick filter for tiny contours
             continue
 
         peri = cv2.arcLength(cnt, True)
@@ -413,12 +443,26 @@ def order_corners(quad: np.ndarray) -> np.ndarray:
     return np.array([tl, tr, br, bl], dtype=np.float32)
 
 
-def warp_card(pil_image: Image.Image, quad: np.ndarray, out_w: int = 744, out_h: int = 1040) -> Image.Image:
+def warp_card(image: ImageLike, quad: np.ndarray, out_w: int = 744, out_h: int = 1040) -> Image.Image:
     """Perspective-warp the card to a fixed-size canonical frame."""
-    rgb = pil_image.convert("RGB")
-    bgr = cv2.cvtColor(np.array(rgb), cv2.COLOR_RGB2BGR)
-
-    src = order_corners(quad).astype(np.float32)
+    return Image.fromarray(warp_card_array(as_rgb_array(image), quad, out_w, out_h))
+
+
+def warp_card_array(
+    rgb: np.ndarray,
+    quad: np.ndarray,
+    out_w: int = 744,
+    out_h: int = 1040,
+    reorder: bool = True,
+) -> np.ndarray:
+    """Array variant of warp_card: HxWx3 RGB in, out_h x out_w x 3 RGB out.
+
+    warpPerspective interpolates each channel independently, so warping RGB
+    directly is identical to the BGR round-trip and saves two conversions.
+    With reorder=False the quad is taken as already ordered (output TL, TR,
+    BR, BL), which lets callers rotate the card by rolling its corners.
+    """
+    src = (order_corners(quad) if reorder else quad.reshape(4, 2)).astype(np.float32)
     dst = np.array(
         [
             [0.0, 0.0],
@@ -430,33 +474,27 @@ def warp_card(pil_image: Image.Image, quad: np.ndarray, out_w: int = 744, out_h:
     )
 
     m = cv2.getPerspectiveTransform(src, dst)
-    warped = cv2.warpPerspective(bgr, m, (out_w, out_h), flags=cv2.INTER_LINEAR)
-    warped_rgb = cv2.cvtColor(warped, cv2.COLOR_BGR2RGB)
-    return Image.fromarray(warped_rgb)
+    return cv2.warpPerspective(rgb, m, (out_w, out_h), flags=cv2.INTER_LINEAR)
 
 
 def detect_card_quad_with_candidates(
-    pil_image: Image.Image,
+    image: ImageLike,
+    gray: Optional[np.ndarray] = None,
 ) -> tuple[Optional[np.ndarray], dict[str, Any], List[QuadCandidate]]:
     """Detect card quad and return all candidates for debugging.
     
     Returns (quad, debug, all_candidates).
     """
-    rgb = pil_image.convert("RGB")
-    bgr = cv2.cvtColor(np.array(rgb), cv2.COLOR_RGB2BGR)
-    gray = cv2.cvtColor(bgr, cv2.COLOR_BGR2GRAY)
+    gray = _gray_for(image, gray)
     img_h, img_w = gray.shape
     image_area = float(img_h * img_w)
     image_center = (img_w / 2.0, img_h / 2.0)
     image_diag = float(np.sqrt(img_w**2 + img_h**2))
 
-    edge_maps = _generate_edge_maps(gray)
+    pipeline_contours = _pipeline_contours(gray)
     all_candidates: List[QuadCandidate] = []
 
-    for pipeline_name, edges in edge_maps:
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
-        closed = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
-        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for pipeline_name, contours in pipeline_contours:
         candidates = _score_contours(contours, image_area, image_center, image_diag, pipeline_name)
         all_candidates.extend(candidates)
 
@@ -472,10 +510,7 @@ def detect_card_quad_with_candidates(
         return best.quad, _debug_payload(best, len(all_candidates), len(relaxed_gated), gate_mode="relaxed"), all_candidates
 
     # Fallback: minAreaRect
-    for pipeline_name, edges in edge_maps:
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
-        closed = cv2.morphologyEx(edges, cv2.MORPH_CLOSE, kernel)
-        contours, _ = cv2.findContours(closed, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    for pipeline_name, contours in pipeline_contours:
         if not contours:
             continue
         largest = max(contours, key=cv2.contourArea)
@@ -513,19 +548,225 @@ def detect_card_quad_with_candidates(
     return None, debug_info, all_candidates
 
 
-def warp_card_best_effort(pil_image: Image.Image) -> tuple[Image.Image, bool, str, dict[str, Any]]:
+@dataclass(frozen=True)
+class PositionedQuad:
+    """One card found by detect_card_quads, in row-major reading order."""
+
+    quad: np.ndarray  # TL, TR, BR, BL in source pixels
+    index: int
+    row: int
+    col: int
+    debug: dict[str, Any]
+
+    def position(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "row": self.row,
+            "col": self.col,
+            "quad": [[round(float(x), 1), round(float(y), 1)] for x, y in self.quad],
+        }
+
+
+def detect_card_quads(
+    image: ImageLike,
+    gray: Optional[np.ndarray] = None,
+    max_cards: int = _MULTI_MAX_CARDS,
+) -> tuple[List[PositionedQuad], dict[str, Any]]:
+    """Detect every card in a multi-card photo (binder page, table spread).
+
+    Uses the same edge pipelines as detect_card_quad, computed once for the
+    whole photo, with a lower area gate. Candidates that are really groups of
+    cards are dropped, overlapping duplicates (same card from several
+    pipelines, art windows inside a card) are suppressed, and the survivors
+    are returned in row-major order.
+    """
+    gray = _gray_for(image, gray)
+    img_h, img_w = gray.shape
+    image_area = float(img_h * img_w)
+    image_center = (img_w / 2.0, img_h / 2.0)
+    image_diag = float(np.sqrt(img_w**2 + img_h**2))
+
+    all_candidates: List[QuadCandidate] = []
+    for pipeline_name, contours in _pipeline_contours(gray):
+        all_candidates.extend(
+            _score_contours(
+                contours, image_area, image_center, image_diag, pipeline_name,
+                min_area_ratio=_MULTI_MIN_AREA_RATIO,
+            )
+        )
+
+    gated = [c for c in all_candidates if _passes_multi_gates(c)]
+    groups = [c for c in gated if _is_card_group(c, gated)]
+    selected = _suppress_overlaps([c for c in gated if not any(c is g for g in groups)], max_cards)
+
+    positioned = _row_major(selected, len(all_candidates), len(gated))
+    debug: dict[str, Any] = {
+        "method": "multi",
+        "candidates_total": len(all_candidates),
+        "candidates_gated": len(gated),
+        "groups_dropped": len(groups),
+        "cards_found": len(positioned),
+    }
+    return positioned, debug
+
+
+def _passes_multi_gates(candidate: QuadCandidate) -> bool:
+    if not (_ASPECT_MIN_STRICT <= candidate.aspect <= _ASPECT_MAX_STRICT):
+        return False
+    if not (_MULTI_MIN_AREA_RATIO <= candidate.area_ratio <= _MAX_AREA_RATIO):
+        return False
+    return candidate.rectangularity >= _MIN_RECTANGULARITY
+
+
+def _intersection_area(a: QuadCandidate, b: QuadCandidate) -> float:
+    area, _poly = cv2.intersectConvexConvex(a.quad.astype(np.float32), b.quad.astype(np.float32))
+    return float(area)
+
+
+def _is_card_group(candidate: QuadCandidate, others: List[QuadCandidate]) -> bool:
+    contained = [
+        o for o in others
+        if o.area < 0.6 * candidate.area and _intersection_area(candidate, o) >= 0.9 * o.area
+    ]
+    if len(contained) < 2:
+        return False
+    # Only count mutually non-overlapping members, largest first.
+    members = _suppress_overlaps(contained, len(contained))
+    if len(members) < 2:
+        return False
+    return sum(m.area for m in members) >= _MULTI_GROUP_COVERAGE * candidate.area
+
+
+def _suppress_overlaps(candidates: List[QuadCandidate], max_cards: int) -> List[QuadCandidate]:
+    # Rank by score without the center penalty: in multi mode every position is equal.
+    ranked = sorted(candidates, key=lambda c: (c.score + c.center_dist * 0.15, c.area), reverse=True)
+    kept: List[QuadCandidate] = []
+    for cand in ranked:
+        if len(kept) >= max_cards:
+            break
+        if any(_intersection_area(cand, k) > _MULTI_MAX_OVERLAP * min(cand.area, k.area) for k in kept):
+            continue
+        kept.append(cand)
+    return kept
+
+
+def _row_major(candidates: List[QuadCandidate], total: int, gated: int) -> List[PositionedQuad]:
+    if not candidates:
+        return []
+    centers = [c.quad.mean(axis=0) for c in candidates]
+    heights = [_quad_size(c.quad)[1] for c in candidates]
+    row_tol = 0.5 * float(np.median(heights))
+
+    order = sorted(range(len(candidates)), key=lambda i: (float(centers[i][1]), float(centers[i][0])))
+    rows: List[List[int]] = []
+    for i in order:
+        if rows and float(centers[i][1]) - float(centers[rows[-1][0]][1]) <= row_tol:
+            rows[-1].append(i)
+        else:
+            rows.append([i])
+
+    positioned: List[PositionedQuad] = []
+    for row_idx, row in enumerate(rows):
+        for col_idx, i in enumerate(sorted(row, key=lambda j: float(centers[j][0]))):
+            positioned.append(
+                PositionedQuad(
+                    quad=candidates[i].quad,
+                    index=len(positioned),
+                    row=row_idx,
+                    col=col_idx,
+                    debug=_debug_payload(candidates[i], total, gated, gate_mode="multi"),
+                )
+            )
+    return positioned
+
+
+def detect_card_quad_near(
+    image: ImageLike,
+    seed_quad: np.ndarray,
+    gray: Optional[np.ndarray] = None,
+    margin: float = _SEED_WINDOW_MARGIN,
+) -> tuple[Optional[np.ndarray], dict[str, Any]]:
+    """Detect the card inside a window around a quad found in another frame.
+
+    For burst input the card barely moves between frames, so searching only
+    the seed's neighbourhood is both cheaper (edge pipelines run on a crop)
+    and less likely to lock onto background clutter. The returned quad is in
+    full-image coordinates.
+    """
+    gray = _gray_for(image, gray)
+    img_h, img_w = gray.shape
+    seed = order_corners(seed_quad)
+    x0, y0 = seed.min(axis=0)
+    x1, y1 = seed.max(axis=0)
+    pad_x = (x1 - x0) * margin
+    pad_y = (y1 - y0) * margin
+    wx0 = int(max(0, np.floor(x0 - pad_x)))
+    wy0 = int(max(0, np.floor(y0 - pad_y)))
+    wx1 = int(min(img_w, np.ceil(x1 + pad_x)))
+    wy1 = int(min(img_h, np.ceil(y1 + pad_y)))
+    window = [wx0, wy0, wx1, wy1]
+    if wx1 - wx0 < 20 or wy1 - wy0 < 20:
+        return None, {"method": "none", "reason": "seed_window_empty", "seed_window": window}
+
+    crop = np.ascontiguousarray(gray[wy0:wy1, wx0:wx1])
+    quad, debug = detect_card_quad(crop, gray=crop)
+    debug = dict(debug)
+    debug["seed_window"] = window
+    if quad is None:
+        return None, debug
+    return (quad + np.array([wx0, wy0], dtype=np.float32)).astype(np.float32), debug
+
+
+def warp_card_best_effort(image: ImageLike) -> tuple[Image.Image, bool, str, dict[str, Any]]:
     """Try to warp the card; fall back to original image."""
-    quad, debug = detect_card_quad(pil_image)
+    warped, warp_used, warp_reason, debug, _quad = warp_card_best_effort_with_quad(image)
+    return warped, warp_used, warp_reason, debug
+
+
+def warp_card_best_effort_with_quad(
+    image: ImageLike,
+) -> tuple[Image.Image, bool, str, dict[str, Any], Optional[np.ndarray]]:
+    """Same as warp_card_best_effort, but also return the detected quad.
+
+    The quad is None when detection failed. It is returned even if the warp
+    itself failed, so callers can still report where the card was found.
+    """
+    warped, warp_used, warp_reason, debug, quad = warp_card_best_effort_array(as_rgb_array(image))
+    if warped is None:
+        return as_pil(image), warp_used, warp_reason, debug, quad
+    return Image.fromarray(warped), warp_used, warp_reason, debug, quad
+
+
+def warp_card_best_effort_array(
+    rgb: np.ndarray,
+    gray: Optional[np.ndarray] = None,
+    search_near: Optional[np.ndarray] = None,
+) -> tuple[Optional[np.ndarray], bool, str, dict[str, Any], Optional[np.ndarray]]:
+    """Array variant of warp_card_best_effort_with_quad.
+
+    Returns (warped_rgb, warp_used, warp_reason, debug, quad). warped_rgb is
+    None when no warp was produced; callers keep using their source array.
+    With search_near, detection first runs in a window around that quad and
+    only falls back to the whole image if the window yields nothing.
+    """
+    quad: Optional[np.ndarray] = None
+    debug: dict[str, Any] = {}
+    if search_near is not None:
+        quad, debug = detect_card_quad_near(rgb, search_near, gray=gray)
+        if quad is not None:
+            debug["pipeline"] = f"seeded_{debug.get('pipeline', 'unknown')}"
+    if quad is None:
+        quad, debug = detect_card_quad(rgb, gray=gray)
     if quad is None:
-        return pil_image, False, "warp_not_found", debug
+        return None, False, "warp_not_found", debug, None
 
     try:
-        warped = warp_card(pil_image, quad)
+        warped = warp_card_array(rgb, quad)
         method = debug.get("method", "unknown")
         pipeline = debug.get("pipeline", "unknown")
-        return warped, True, f"warp_{method}_{pipeline}", debug
+        return warped, True, f"warp_{method}_{pipeline}", debug, quad
     except Exception:
-        return pil_image, False, "warp_failed", debug
+        return None, False, "warp_failed", debug, quad
 
 
 def _quad_size(quad: np.ndarray) -> tuple[float, float]:
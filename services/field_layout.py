@@ -0,0 +1,198 @@
+"""Layout-anchored localization of the name and collector-number fields.
+
+The identity OCR used to sweep several fixed boxes per template family. On a
+warped card the fields can instead be found directly from text anchors:
+
+- the name line: the largest-font text line in the header, left of the HP
+- the HP: the text line at the right end of the header
+- the illustrator/copyright line: the widest text line along the bottom
+- the collector number: the compact cluster of even-height glyphs (digits
+  and a slash, no ascenders/x-height mix) nearest a bottom corner
+
+Anchors come from morphology and connected-component statistics on two
+horizontal bands (header and footer), so the artwork between them never
+competes with the text. The result is one tight ROI per field, as ratios of
+the card size; missing anchors are None and callers keep their fixed boxes.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError as e:
+    raise ImportError(
+        "opencv-python is required for field layout localization. "
+        "Install with: pip install opencv-python>=4.9.0"
+    ) from e
+
+
+# Bands searched for anchors, as fractions of the card height.
+HEADER_BAND = (0.0, 0.20)
+FOOTER_BAND = (0.84, 1.0)
+
+# Glyph height limits, as fractions of the card height.
+GLYPH_MIN_HEIGHT = 0.008
+GLYPH_MAX_HEIGHT = 0.06
+
+# A collector number ("025/198", "4/102") is a short cluster of glyphs.
+NUMBER_MIN_GLYPHS = 3
+NUMBER_MAX_GLYPHS = 9
+NUMBER_MIN_HEIGHT_UNIFORMITY = 0.75  # share of glyphs within 12% of the median height
+
+
+@dataclass(frozen=True)
+class FieldBox:
+    """A field ROI as ratios of the card size (same convention as OCRRegion)."""
+    top_ratio: float
+    bottom_ratio: float
+    left_ratio: float
+    right_ratio: float
+
+
+@dataclass(frozen=True)
+class TextLine:
+    """A merged run of glyphs, in card pixels."""
+    x: int
+    y: int
+    w: int
+    h: int
+    glyphs: int
+    glyph_height: float  # median glyph height
+    height_uniformity: float  # share of glyphs within 12% of the median height
+
+    @property
+    def cx(self) -> float:
+        return self.x + self.w / 2.0
+
+    def to_trace(self) -> list[int]:
+        return [self.x, self.y, self.w, self.h]
+
+
+@dataclass(frozen=True)
+class FieldLayout:
+    name: Optional[FieldBox]
+    number: Optional[FieldBox]
+    number_corner: Optional[str]  # "bottom_left" or "bottom_right"
+    anchors: dict[str, Any]
+
+    def to_trace(self) -> dict[str, Any]:
+        return {
+            "name_found": self.name is not None,
+            "number_corner": self.number_corner,
+            "anchors": self.anchors,
+        }
+
+
+def locate_fields(rgb: np.ndarray) -> FieldLayout:
+    """Find the name and collector-number ROIs on a warped card (HxWx3 RGB)."""
+    h, w = rgb.shape[:2]
+    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+    anchors: dict[str, Any] = {}
+
+    header = _text_lines(gray, HEADER_BAND)
+    name_line = hp_line = None
+    right_lines = [ln for ln in header if ln.cx > 0.6 * w]
+    if right_lines:
+        hp_line = max(right_lines, key=lambda ln: ln.x + ln.w)
+        anchors["hp"] = hp_line.to_trace()
+    left_lines = [ln for ln in header if ln.x < 0.5 * w and ln.glyphs >= 3 and ln is not hp_line]
+    if left_lines:
+        name_line = max(left_lines, key=lambda ln: (ln.glyph_height, ln.w))
+        anchors["name"] = name_line.to_trace()
+
+    footer = _text_lines(gray, FOOTER_BAND)
+    if footer:
+        anchors["illustrator"] = max(footer, key=lambda ln: ln.w).to_trace()
+    number_line = corner = None
+    clusters = [
+        ln for ln in footer
+        if NUMBER_MIN_GLYPHS <= ln.glyphs <= NUMBER_MAX_GLYPHS
+        and ln.height_uniformity >= NUMBER_MIN_HEIGHT_UNIFORMITY
+        and (ln.x < 0.45 * w or ln.x + ln.w > 0.55 * w)
+    ]
+    if clusters:
+        # Nearest to either bottom corner.
+        number_line = min(clusters, key=lambda ln: min(ln.x, w - (ln.x + ln.w)) + (h - (ln.y + ln.h)))
+        corner = "bottom_left" if number_line.cx < w / 2.0 else "bottom_right"
+        anchors["number"] = number_line.to_trace()
+
+    name_box = None
+    if name_line is not None:
+        right_limit = hp_line.x - 0.01 * w if hp_line is not None and hp_line.x > name_line.x + name_line.w else None
+        name_box = _padded(name_line, w, h, right_limit=right_limit)
+    number_box = _padded(number_line, w, h) if number_line is not None else None
+    return FieldLayout(name=name_box, number=number_box, number_corner=corner, anchors=anchors)
+
+
+def _text_lines(gray: np.ndarray, band: tuple[float, float]) -> list[TextLine]:
+    """Text lines in a horizontal band, as merged glyph components."""
+    h, w = gray.shape
+    y0, y1 = int(h * band[0]), int(h * band[1])
+    strip = gray[y0:y1]
+
+    # Glyph strokes: high local contrast at stroke scale, whatever the polarity.
+    grad = cv2.morphologyEx(strip, cv2.MORPH_GRADIENT, cv2.getStructuringElement(cv2.MORPH_RECT, (3, 3)))
+    _, bw = cv2.threshold(grad, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+    _, labels, stats, _ = cv2.connectedComponentsWithStats(bw, connectivity=8)
+    gw, gh, area = stats[:, cv2.CC_STAT_WIDTH], stats[:, cv2.CC_STAT_HEIGHT], stats[:, cv2.CC_STAT_AREA]
+    min_gh, max_gh = GLYPH_MIN_HEIGHT * h, GLYPH_MAX_HEIGHT * h
+    keep = (gh >= min_gh) & (gh <= max_gh) & (gw <= 1.5 * max_gh) & (area >= 0.15 * gw * gh)
+    keep[0] = False  # background
+    if not keep.any():
+        return []
+    glyphs = (keep.astype(np.uint8) * 255)[labels]
+    boxes = stats[keep]
+    centers = np.stack(
+        [
+            boxes[:, cv2.CC_STAT_LEFT] + boxes[:, cv2.CC_STAT_WIDTH] / 2.0,
+            boxes[:, cv2.CC_STAT_TOP] + boxes[:, cv2.CC_STAT_HEIGHT] / 2.0,
+            boxes[:, cv2.CC_STAT_HEIGHT],
+        ],
+        axis=1,
+    ).astype(np.float32)
+
+    # Merge neighbouring glyphs into lines (word gaps are under a glyph height).
+    gap = max(3, int(np.median(centers[:, 2])))
+    lines_mask = cv2.morphologyEx(glyphs, cv2.MORPH_CLOSE, cv2.getStructuringElement(cv2.MORPH_RECT, (gap, 1)))
+    _, line_labels, stats, _ = cv2.connectedComponentsWithStats(lines_mask, connectivity=8)
+
+    # Line of each glyph (closing only grows glyphs, so all its pixels agree).
+    owner = np.zeros(len(keep), dtype=np.int32)
+    on = glyphs > 0
+    owner[labels[on]] = line_labels[on]
+    owner = owner[keep]
+
+    lines = []
+    for idx in np.flatnonzero(stats[1:, cv2.CC_STAT_WIDTH] >= 1.5 * stats[1:, cv2.CC_STAT_HEIGHT]) + 1:
+        x, y, lw, lh, _ = stats[idx]
+        heights = centers[owner == idx, 2]
+        count = len(heights)
+        if count == 0:
+            continue
+        median = float(np.median(heights))
+        lines.append(TextLine(
+            x=int(x), y=int(y) + y0, w=int(lw), h=int(lh),
+            glyphs=count, glyph_height=median,
+            height_uniformity=float(np.mean(np.abs(heights - median) <= 0.12 * median)),
+        ))
+    return lines
+
+
+def _padded(line: TextLine, w: int, h: int, right_limit: Optional[float] = None) -> FieldBox:
+    pad_y = 0.35 * line.h
+    pad_x = max(0.6 * line.h, 0.01 * w)
+    right = line.x + line.w + pad_x
+    if right_limit is not None:
+        right = min(right, right_limit)
+    return FieldBox(
+        top_ratio=max(0.0, (line.y - pad_y) / h),
+        bottom_ratio=min(1.0, (line.y + line.h + pad_y) / h),
+        left_ratio=max(0.0, (line.x - pad_x) / w),
+        right_ratio=min(1.0, right / w),
+    )
@@ -0,0 +1,65 @@
+"""Burst / multi-shot frame selection.
+
+Capture apps can send several frames of the same card. Only the best frame
+gets the full warp + OCR pipeline; the rest are ranked on a thumbnail (blur
+and glare, see services.grading.photo_quality.thumbnail_quality) and kept as
+fallbacks.
+
+Ranking is deterministic: ties are broken by the order the frames were sent.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any, Sequence
+
+import numpy as np
+
+from services.grading.photo_quality import ThumbnailQuality, thumbnail_quality
+from services.image_arrays import ImageLike
+
+
+# Upper bound on frames accepted per side in one request.
+MAX_FRAMES = 10
+
+
+@dataclass(frozen=True)
+class FrameRank:
+    index: int  # position in the request's frame list
+    score: float  # higher = better
+    laplacian_variance: float
+    glare_ratio: float
+    quality: ThumbnailQuality  # reused by the photo prefilter on the chosen frame
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "index": self.index,
+            "score": round(self.score, 4),
+            "laplacian_variance": round(self.laplacian_variance, 2),
+            "glare_ratio": round(self.glare_ratio, 4),
+        }
+
+
+def rank_frames(frames: Sequence[tuple[int, ImageLike]]) -> list[FrameRank]:
+    """Rank (index, image) pairs best-first by thumbnail blur/glare."""
+    ranks = []
+    for index, image in frames:
+        q = thumbnail_quality(image)
+        ranks.append(
+            FrameRank(
+                index=index,
+                score=q.score,
+                laplacian_variance=q.laplacian_variance,
+                glare_ratio=q.glare_ratio,
+                quality=q,
+            )
+        )
+    ranks.sort(key=lambda r: (-r.score, r.index))
+    return ranks
+
+
+def scale_quad(quad: np.ndarray, from_size: tuple[int, int], to_size: tuple[int, int]) -> np.ndarray:
+    """Map a quad between frames of different (w, h) sizes."""
+    sx = float(to_size[0]) / float(from_size[0])
+    sy = float(to_size[1]) / float(from_size[1])
+    return (quad * np.array([sx, sy], dtype=np.float32)).astype(np.float32)
@@ -1,18 +1,46 @@
 from __future__ import annotations
 
 import base64
-import io
 from dataclasses import dataclass
 from typing import Any, Optional
 
+import numpy as np
 from PIL import Image
 
-from services.card_warp import warp_card_best_effort
+try:
+    import cv2
+except ImportError as e:
+    raise ImportError(
+        "opencv-python is required for canonicalization. "
+        "Install with: pip install opencv-python"
+    ) from e
+
+from services.card_warp import warp_card_best_effort_array
+from services.image_arrays import ImageLike, as_pil, as_rgb_array
+from services.image_ingest import ingest_image_bytes
+from services.orientation import normalize_orientation, orientation_enabled
 
 
 CANONICAL_W = 744
 CANONICAL_H = 1040
 
+# Preview grading canonicalizes at a fraction of the canonical size. Detector
+# lengths are given in canonical pixels and scaled to match (see
+# CanonicalFeatures.px); severities are calibrated against full resolution
+# with eval/preview_calibration.py.
+PREVIEW_SCALES = (0.5, 0.25)
+
+# Card detection at preview scales runs on the photo shrunk to at most this
+# long side times the scale (the preview warp needs far fewer source pixels).
+PREVIEW_PHOTO_MAX_SIDE = 2 * CANONICAL_H
+
+
+def canonical_size(scale: float = 1.0) -> tuple[int, int]:
+    """(width, height) of the canonical image at a grading scale."""
+    if scale != 1.0 and scale not in PREVIEW_SCALES:
+        raise ValueError(f"scale must be 1.0 or one of {PREVIEW_SCALES}, got {scale!r}")
+    return int(round(CANONICAL_W * scale)), int(round(CANONICAL_H * scale))
+
 
 @dataclass(frozen=True)
 class CanonicalImage:
@@ -20,43 +48,77 @@ class CanonicalImage:
     warp_used: bool
     warp_reason: str
     warp_debug: dict[str, Any]
+    orientation: Optional[dict[str, Any]] = None  # OrientationDecision.to_trace(), if run
 
 
 def load_image_from_bytes(image_bytes: bytes) -> Image.Image:
-    img = Image.open(io.BytesIO(image_bytes))
-    img.load()
-    return img.convert("RGB")
+    return ingest_image_bytes(image_bytes).image
 
 
 def load_image_from_base64(data: str) -> bytes:
     return base64.b64decode(data)
 
 
-def canonicalize(img: Image.Image) -> CanonicalImage:
+def canonicalize(img: ImageLike, scale: float = 1.0) -> CanonicalImage:
     """Return a canonical, grading-ready image.
 
     Steps:
       - convert to RGB
       - best-effort warp to CANONICAL_W x CANONICAL_H
-
-    Note: orientation normalization (upright) can be added once we have reliable
-    orientation detection. For now we assume warp output is roughly upright for
-    most user photos; overlay outputs will reveal failures.
+      - orientation normalization (sideways re-warp / 180 rotation) from
+        layout cues; see services.orientation
+      - for preview grading (scale < 1), box-downsample to canonical_size(scale)
     """
 
-    rgb = img.convert("RGB")
+    canonical_size(scale)  # validate before doing any work
+    rgb = as_rgb_array(img)
+    if scale != 1.0:
+        rgb = _shrink_for_preview(rgb, scale)
 
-    warped, warp_used, warp_reason, warp_debug = warp_card_best_effort(
-        rgb,
-    )
+    warped, warp_used, warp_reason, warp_debug, quad = warp_card_best_effort_array(rgb)
 
+    orientation = None
+    if warped is not None and orientation_enabled():
+        warped, decision = normalize_orientation(rgb, warped, quad)
+        orientation = decision.to_trace()
+
+    image = Image.fromarray(warped) if warped is not None else as_pil(img)
+    return canonical_from_warp(image, warp_used, warp_reason, warp_debug, orientation=orientation, scale=scale)
+
+
+def _shrink_for_preview(rgb: np.ndarray, scale: float) -> np.ndarray:
+    h, w = rgb.shape[:2]
+    limit = PREVIEW_PHOTO_MAX_SIDE * scale
+    if max(h, w) <= limit:
+        return rgb
+    f = limit / max(h, w)
+    return cv2.resize(rgb, (max(1, int(round(w * f))), max(1, int(round(h * f)))), interpolation=cv2.INTER_AREA)
+
+
+def canonical_from_warp(
+    warped: Image.Image,
+    warp_used: bool,
+    warp_reason: str,
+    warp_debug: dict[str, Any],
+    orientation: Optional[dict[str, Any]] = None,
+    scale: float = 1.0,
+) -> CanonicalImage:
+    """Build a CanonicalImage from an already-computed warp result.
+
+    Lets callers that have warped the card for another purpose (e.g. identity
+    OCR) reuse that warp instead of running quad detection again.
+    """
     # Ensure canonical size if warp succeeded; otherwise, resize to keep downstream stable.
     if warped.size != (CANONICAL_W, CANONICAL_H):
         warped = warped.resize((CANONICAL_W, CANONICAL_H))
+    if scale != 1.0:
+        # Preview scales divide the canonical size exactly: plain box averaging.
+        warped = warped.reduce(CANONICAL_W // canonical_size(scale)[0])
 
     return CanonicalImage(
         image=warped,
         warp_used=warp_used,
         warp_reason=warp_reason,
         warp_debug=warp_debug,
+        orientation=orientation,
     )
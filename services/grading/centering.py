@@ -16,6 +16,7 @@ flag failure in details.
 """
 
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Any, Optional
 
 import numpy as np
@@ -30,13 +31,27 @@ except ImportError as e:
     ) from e
 
 from services.grading.centering_rules import psa_max_grade_by_centering
+from services.grading.features import CanonicalFeatures, FeatureSource
+from services.stage_cache import image_key, stage_cache
+from services.grading.registration import (
+    ReferenceImage,
+    borders_from_registration,
+    load_back_reference,
+    register_reference,
+    scale_reference,
+)
 
 
 # Border detection constants
-BORDER_SAMPLE_POSITIONS = 5  # Number of positions to sample along each edge
+# Rows/columns scanned for border widths: the central span of each side
+# (fractions of the card height/width), away from the rounded corners.
+BORDER_SAMPLE_SPAN = (1.0 / 6.0, 5.0 / 6.0)
+BORDER_MIN_SAMPLE_FRACTION = 0.1  # Min share of scanned lines with a transition, per side
 BORDER_MAX_WIDTH = 50  # Maximum expected border width in pixels (on canonical 744x1040)
 BORDER_GRADIENT_THRESHOLD = 20  # Minimum brightness change to detect border edge
 BORDER_MIN_WIDTH = 5  # Minimum expected border width
+BORDER_MIN_WIDTH_PREVIEW = 3  # Floor for the scaled minimum at preview resolutions
+BORDER_PRIOR_TOLERANCE = 6  # Search +-px around prior widths from a reference scan
 
 
 @dataclass(frozen=True)
@@ -50,16 +65,13 @@ class CenteringMeasurement:
     details: dict[str, Any]
 
 
-def _find_inner_artwork_rect(rgb: np.ndarray) -> Optional[tuple[int, int, int, int]]:
+def _find_inner_artwork_rect(image: FeatureSource) -> Optional[tuple[int, int, int, int]]:
     """Return x,y,w,h of inner artwork rect, or None."""
-    # Work in grayscale
-    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+    features = CanonicalFeatures.of(image)
+    gray = features.gray
 
-    # Reduce noise
-    blur = cv2.GaussianBlur(gray, (5, 5), 0)
-
-    # Edge detect
-    edges = cv2.Canny(blur, 50, 150)
+    # Edge detect on the 5x5-blurred gray plane
+    edges = features.canny(50, 150, blurred=True)
 
     # Morph close to connect
     kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (5, 5))
@@ -161,13 +173,12 @@ def _lr_tb_from_center(card_w: int, card_h: int, cx: float, cy: float) -> tuple[
     return (left, right), (top, bottom)
 
 
-def _detect_pokeball_center(rgb: np.ndarray) -> Optional[tuple[float, float, float]]:
+def _detect_pokeball_center(image: FeatureSource) -> Optional[tuple[float, float, float]]:
     """Try to locate the Pokemon back Pokéball via circle detection.
 
     Returns (cx, cy, r) or None.
     """
-    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
-    gray = cv2.GaussianBlur(gray, (9, 9), 2)
+    gray = cv2.GaussianBlur(CanonicalFeatures.of(image).gray, (9, 9), 2)
 
     H, W = gray.shape
 
@@ -201,102 +212,112 @@ def _detect_pokeball_center(rgb: np.ndarray) -> Optional[tuple[float, float, flo
     return best
 
 
-def _find_border_edge(profile: np.ndarray, from_edge: bool = True) -> int:
-    """Find where the border transitions to artwork in a 1D brightness profile.
+def _first_border_transitions(
+    profiles: np.ndarray,
+    search: tuple[int, int] = (BORDER_MIN_WIDTH, BORDER_MAX_WIDTH),
+) -> np.ndarray:
+    """Find where the border transitions to artwork in many brightness profiles.
     
     Args:
-        profile: 1D array of brightness values from edge to center
-        from_edge: If True, scan from edge inward; if False, scan from center outward
+        profiles: (N, L) array, each row a profile from the card edge inward
+        search: [start, stop) positions where the border may end
     
     Returns:
-        Pixel position where border ends (or 0 if not found)
+        (N,) pixel position where each border ends (0 where not found)
     """
-    if len(profile) < BORDER_MIN_WIDTH:
-        return 0
-    
-    # Compute gradient (difference between adjacent pixels)
-    gradient = np.abs(np.diff(profile.astype(np.float32)))
+    n = profiles.shape[0]
     
-    # Look for significant brightness change within expected border region
-    search_range = min(BORDER_MAX_WIDTH, len(gradient))
+    # Gradient (difference between adjacent pixels) of every profile at once
+    gradient = np.abs(np.diff(profiles.astype(np.int16), axis=1))
     
-    for i in range(BORDER_MIN_WIDTH, search_range):
-        # Check if there's a significant gradient at this position
-        if gradient[i] > BORDER_GRADIENT_THRESHOLD:
-            # Verify this is a sustained edge (not noise) by checking neighbors
-            window_start = max(0, i - 2)
-            window_end = min(len(gradient), i + 3)
-            if np.max(gradient[window_start:window_end]) > BORDER_GRADIENT_THRESHOLD:
-                return i
+    # First significant change within the expected border region. A crossing
+    # is its own +-2 px neighbourhood maximum, so the first crossing is the
+    # first position that also passes the sustained-edge check.
+    start = max(0, search[0])
+    search_range = min(search[1], gradient.shape[1])
+    if search_range <= start:
+        return np.zeros(n, dtype=np.int64)
+    crossing = gradient[:, start:search_range] > BORDER_GRADIENT_THRESHOLD
+    found = crossing.any(axis=1)
+    first = np.argmax(crossing, axis=1) + start
     
-    return 0
+    return np.where(found, first, 0)
 
 
-def _measure_border_widths(rgb: np.ndarray) -> Optional[dict[str, float]]:
+def _measure_border_widths(
+    image: FeatureSource,
+    samples: Optional[dict[str, int]] = None,
+    expected: Optional[dict[str, float]] = None,
+) -> Optional[dict[str, float]]:
     """Measure physical border width on each side by detecting color/brightness transitions.
     
     This approach measures the actual border by finding where the uniform border
-    color transitions to the card artwork.
+    color transitions to the card artwork. Every row (for left/right) and
+    column (for top/bottom) in the central span of the card is scanned in one
+    vectorized pass, and each side takes the median over hundreds of samples.
     
     Args:
-        rgb: RGB image array
+        image: Canonical RGB image or its CanonicalFeatures
+        samples: If given, filled with the number of valid samples per side
+        expected: Prior border widths (e.g. from a reference scan); each side
+            only searches within BORDER_PRIOR_TOLERANCE px of its prior
+    
+    Width limits are canonical pixels, scaled for preview resolutions.
     
     Returns:
         Dictionary with border widths {"left": px, "right": px, "top": px, "bottom": px}
         or None if detection fails
     """
-    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+    features = CanonicalFeatures.of(image)
+    gray = features.gray
     H, W = gray.shape
+    # Warp bleed at the card edge is a few pixels whatever the resolution,
+    # so the minimum width never scales below BORDER_MIN_WIDTH_PREVIEW.
+    min_width = features.px(BORDER_MIN_WIDTH, minimum=BORDER_MIN_WIDTH_PREVIEW)
+    max_width = features.px(BORDER_MAX_WIDTH)
+    tolerance = features.px(BORDER_PRIOR_TOLERANCE)
     
-    # Sample at multiple Y positions for left/right borders
-    sample_ys = [int(H * (i + 1) / (BORDER_SAMPLE_POSITIONS + 1)) for i in range(BORDER_SAMPLE_POSITIONS)]
-    # Sample at multiple X positions for top/bottom borders
-    sample_xs = [int(W * (i + 1) / (BORDER_SAMPLE_POSITIONS + 1)) for i in range(BORDER_SAMPLE_POSITIONS)]
-    
-    left_widths = []
-    right_widths = []
-    top_widths = []
-    bottom_widths = []
-    
-    # Measure left and right borders
-    for y in sample_ys:
-        # Left border: scan from left edge inward
-        left_profile = gray[y, :BORDER_MAX_WIDTH]
-        left_edge = _find_border_edge(left_profile)
-        if left_edge > 0:
-            left_widths.append(left_edge)
-        
-        # Right border: scan from right edge inward
-        right_profile = gray[y, -BORDER_MAX_WIDTH:][::-1]  # Reverse for inward scan
-        right_edge = _find_border_edge(right_profile)
-        if right_edge > 0:
-            right_widths.append(right_edge)
+    # Rows/columns between the first and last of the old sparse sample positions
+    y0, y1 = int(H * BORDER_SAMPLE_SPAN[0]), int(H * BORDER_SAMPLE_SPAN[1]) + 1
+    x0, x1 = int(W * BORDER_SAMPLE_SPAN[0]), int(W * BORDER_SAMPLE_SPAN[1]) + 1
+    rows = gray[y0:y1]
+    cols = gray[:, x0:x1].T
     
-    # Measure top and bottom borders
-    for x in sample_xs:
-        # Top border: scan from top edge inward
-        top_profile = gray[:BORDER_MAX_WIDTH, x]
-        top_edge = _find_border_edge(top_profile)
-        if top_edge > 0:
-            top_widths.append(top_edge)
-        
-        # Bottom border: scan from bottom edge inward
-        bottom_profile = gray[-BORDER_MAX_WIDTH:, x][::-1]  # Reverse for inward scan
-        bottom_edge = _find_border_edge(bottom_profile)
-        if bottom_edge > 0:
-            bottom_widths.append(bottom_edge)
+    # Profiles oriented from each edge inward
+    profiles = {
+        "left": rows[:, :max_width],
+        "right": rows[:, ::-1][:, :max_width],
+        "top": cols[:, :max_width],
+        "bottom": cols[:, ::-1][:, :max_width],
+    }
     
-    # Need at least some measurements on each side
-    if not (left_widths and right_widths and top_widths and bottom_widths):
-        return None
+    borders: dict[str, float] = {}
+    for side, side_profiles in profiles.items():
+        if expected is not None:
+            prior = int(round(expected[side]))
+            search = (max(min_width, prior - tolerance), min(max_width, prior + tolerance + 1))
+        else:
+            search = (min_width, max_width)
+        widths = _first_border_transitions(side_profiles, search)
+        widths = widths[widths > 0]
+        if samples is not None:
+            samples[side] = int(widths.size)
+        # Need enough measurements on each side
+        if widths.size < max(1, int(len(side_profiles) * BORDER_MIN_SAMPLE_FRACTION)):
+            return None
+        # Use median to be robust to outliers
+        borders[side] = float(np.median(widths))
     
-    # Use median to be robust to outliers
-    return {
-        "left": float(np.median(left_widths)),
-        "right": float(np.median(right_widths)),
-        "top": float(np.median(top_widths)),
-        "bottom": float(np.median(bottom_widths)),
-    }
+    return borders
+
+
+def _rect_from_borders(card_w: int, card_h: int, borders: dict[str, float]) -> tuple[int, int, int, int]:
+    """Inner (x, y, w, h) rectangle enclosed by the measured borders."""
+    x = int(round(borders["left"]))
+    y = int(round(borders["top"]))
+    w = int(round(card_w - borders["right"])) - x
+    h = int(round(card_h - borders["bottom"])) - y
+    return x, y, w, h
 
 
 def _lr_tb_from_borders(borders: dict[str, float]) -> tuple[tuple[float, float], tuple[float, float]]:
@@ -324,42 +345,13 @@ def _lr_tb_from_borders(borders: dict[str, float]) -> tuple[tuple[float, float],
     return lr, tb
 
 
-def measure_centering(front: Image.Image, back: Image.Image) -> CenteringMeasurement:
-    front_rgb = np.array(front.convert("RGB"))
-    back_rgb = np.array(back.convert("RGB"))
-
-    fh, fw = front_rgb.shape[:2]
-
-    # Try border-based measurement first (most reliable for physical centering)
-    front_borders = _measure_border_widths(front_rgb)
-    
-    # Fallback: inner artwork rect detection
-    front_rect = _find_inner_artwork_rect(front_rgb)
-    back_rect = _find_inner_artwork_rect(back_rgb)
-
-    details: dict[str, Any] = {
-        "front_borders": front_borders,
-        "front_inner_rect": front_rect,
-        "back_inner_rect": back_rect,
-        "back_pokeball": None,
-        "back_method": None,
-        "front_method": None,
-    }
-
-    # Front: PRIORITIZE border measurement (measures physical card border)
-    # Fall back to inner rect if border detection fails
-    if front_borders is not None:
-        front_lr, front_tb = _lr_tb_from_borders(front_borders)
-        details["front_detected"] = True
-        details["front_method"] = "border"
-    elif front_rect is not None:
-        front_lr, front_tb = _lr_tb_from_rect(fw, fh, front_rect)
-        details["front_detected"] = True
-        details["front_method"] = "inner_rect"
-    else:
-        front_lr, front_tb = (50.0, 50.0), (50.0, 50.0)
-        details["front_detected"] = False
-        details["front_method"] = "none"
+def _back_centering_fallback(
+    back_features: CanonicalFeatures,
+    fw: int,
+    fh: int,
+    details: dict[str, Any],
+) -> tuple[tuple[float, float], tuple[float, float]]:
+    """Back LR/TB without a reference: Pokeball circle, then inner rect."""
 
     def _rect_valid(rect: tuple[int, int, int, int]) -> bool:
         x, y, w, h = rect
@@ -371,11 +363,14 @@ def measure_centering(front: Image.Image, back: Image.Image) -> CenteringMeasure
             return False
         return True
 
-    # Back: PRIORITIZE Pokeball detection (most reliable for standard Pokemon backs)
+    back_rect = _find_inner_artwork_rect(back_features)
+    details["back_inner_rect"] = back_rect
+
+    # Pokeball detection (most reliable without a reference)
     # Only fall back to inner_rect if Pokeball detection fails
-    pb = _detect_pokeball_center(back_rgb)
+    pb = _detect_pokeball_center(back_features)
     details["back_pokeball"] = pb
-    
+
     if pb is not None:
         cx, cy, r = pb
         back_lr, back_tb = _lr_tb_from_center(fw, fh, cx, cy)
@@ -393,6 +388,106 @@ def measure_centering(front: Image.Image, back: Image.Image) -> CenteringMeasure
         details["back_detected"] = False
         details["back_method"] = "none"
 
+    return back_lr, back_tb
+
+
+def measure_centering(
+    front: FeatureSource,
+    back: FeatureSource,
+    front_reference: Optional[ReferenceImage] = None,
+) -> CenteringMeasurement:
+    """Measure front/back centering of canonical card images.
+
+    front_reference, when the printing is known (services/reference_store.py),
+    is a centered scan of the same front design: registering against it gives
+    the front borders directly, and if registration is rejected its border
+    widths still narrow the border search.
+    """
+    front_features = CanonicalFeatures.of(front)
+    back_features = CanonicalFeatures.of(back)
+
+    fw, fh = front_features.size
+
+    front_reg = None
+    if front_reference is not None:
+        # References are canonical size; preview grading compares at its own.
+        front_reference = scale_reference(front_reference, (fw, fh))
+        front_reg = register_reference(front_features.gray, front_reference)
+
+    border_samples: dict[str, int] = {}
+    if front_reg is not None:
+        front_borders = borders_from_registration(front_reference, front_reg)
+        front_rect = _rect_from_borders(fw, fh, front_borders)
+        if front_reference.art_rect is not None:
+            ax, ay, aw, ah = front_reference.art_rect
+            front_rect = (int(round(ax + front_reg.dx)), int(round(ay + front_reg.dy)), aw, ah)
+    else:
+        # Try border-based measurement first (most reliable for physical centering)
+        expected = front_reference.borders if front_reference is not None else None
+        front_borders = _measure_border_widths(front_features, border_samples, expected)
+
+        # Fallback: inner artwork rect detection, only when the borders failed
+        if front_borders is not None:
+            front_rect = _rect_from_borders(fw, fh, front_borders)
+        else:
+            front_rect = _find_inner_artwork_rect(front_features)
+
+    details: dict[str, Any] = {
+        "front_borders": front_borders,
+        "front_border_samples": border_samples,
+        "front_border_prior": front_reference is not None and front_reg is None,
+        "front_inner_rect": front_rect,
+        "front_registration": None,
+        "back_inner_rect": None,
+        "back_registration": None,
+        "back_pokeball": None,
+        "back_method": None,
+        "front_method": None,
+    }
+
+    # Front: PRIORITIZE registration against the printing's reference scan,
+    # then border measurement (measures physical card border).
+    # Fall back to inner rect if border detection fails
+    if front_reg is not None:
+        front_lr, front_tb = _lr_tb_from_borders(front_borders)
+        details["front_borders"] = {k: round(v, 3) for k, v in front_borders.items()}
+        details["front_registration"] = front_reg.to_dict() | {"reference": "/".join(Path(front_reference.path).parts[-2:])}
+        details["front_detected"] = True
+        details["front_method"] = "registration"
+    elif front_borders is not None:
+        front_lr, front_tb = _lr_tb_from_borders(front_borders)
+        details["front_detected"] = True
+        details["front_method"] = "border"
+    elif front_rect is not None:
+        front_lr, front_tb = _lr_tb_from_rect(fw, fh, front_rect)
+        details["front_detected"] = True
+        details["front_method"] = "inner_rect"
+    else:
+        front_lr, front_tb = (50.0, 50.0), (50.0, 50.0)
+        details["front_detected"] = False
+        details["front_method"] = "none"
+
+    # Back: Pokeball detection, then inner rect. When a reference back is
+    # configured (none ships with the repo; see PREGRADE_BACK_REFERENCE_PATH),
+    # registration against it takes precedence (sub-pixel, every back shares
+    # one printed design) unless the registration is weak.
+    reference = load_back_reference()
+    reg = None
+    if reference is not None:
+        reference = scale_reference(reference, back_features.size)
+        reg = register_reference(back_features.gray, reference)
+
+    if reg is not None:
+        back_borders = borders_from_registration(reference, reg)
+        back_lr, back_tb = _lr_tb_from_borders(back_borders)
+        details["back_registration"] = reg.to_dict() | {"reference": Path(reference.path).name}
+        details["back_borders"] = {k: round(v, 3) for k, v in back_borders.items()}
+        details["back_inner_rect"] = _rect_from_borders(fw, fh, back_borders)
+        details["back_detected"] = True
+        details["back_method"] = "registration"
+    else:
+        back_lr, back_tb = _back_centering_fallback(back_features, fw, fh, details)
+
     psa_max = psa_max_grade_by_centering(front_lr, front_tb, back_lr, back_tb)
 
     return CenteringMeasurement(
@@ -449,3 +544,49 @@ def render_centering_overlay(
     draw.text((16, 14), text, fill=(255, 255, 255))
 
     return out
+
+
+OVERLAY_SIDES = ("front", "back")
+
+
+@dataclass(frozen=True)
+class CenteringOverlaySource:
+    """Everything a centering overlay is drawn from: canonical sides + measurement.
+
+    Held instead of rendered overlays so they can be drawn on demand. Holds no
+    pixels: the canonical sides are read back from the stage cache (by image
+    hash and scale) when an overlay is drawn.
+    """
+
+    front_hash: str
+    back_hash: str
+    scale: float
+    measurement: CenteringMeasurement
+
+    def render(self, side: str) -> Optional[Image.Image]:
+        """The overlay, or None if the canonical side is no longer cached."""
+        if side not in OVERLAY_SIDES:
+            raise ValueError(f"side must be one of {OVERLAY_SIDES}, got {side!r}")
+        content_hash = self.front_hash if side == "front" else self.back_hash
+        _, canonical = stage_cache().get(image_key(content_hash, self.scale), "canonical")
+        if canonical is None:
+            return None
+        return render_side_overlay(side, canonical.image, self.measurement)
+
+
+def render_side_overlay(side: str, image: Image.Image, m: CenteringMeasurement) -> Image.Image:
+    """Centering overlay of one side, drawn on that side's canonical image."""
+    if side == "front":
+        return render_centering_overlay(
+            image, m.details.get("front_inner_rect"), m.front_lr, m.front_tb, "Front centering"
+        )
+    if side == "back":
+        return render_centering_overlay(
+            image,
+            m.details.get("back_inner_rect"),
+            m.back_lr,
+            m.back_tb,
+            f"Back centering ({m.details.get('back_method')})",
+            m.details.get("back_pokeball"),
+        )
+    raise ValueError(f"side must be one of {OVERLAY_SIDES}, got {side!r}")
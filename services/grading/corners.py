@@ -18,15 +18,8 @@ from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
-from PIL import Image
 
-try:
-    import cv2
-except ImportError as e:
-    raise ImportError(
-        "opencv-python is required for corner detection. "
-        "Install with: pip install opencv-python"
-    ) from e
+from services.grading.features import CanonicalFeatures, FeatureSource, gray_stack
 
 
 # Corner patch size as fraction of canonical dimensions (744x1040)
@@ -62,86 +55,89 @@ class CornersResult:
     details: dict[str, Any]
 
 
-def _extract_corner_patch(
-    img: np.ndarray,
-    corner: str,
-    patch_w: int,
-    patch_h: int,
-) -> np.ndarray:
-    """Extract a corner patch from the image."""
-    h, w = img.shape[:2]
-    
-    if corner == "top_left":
-        return img[0:patch_h, 0:patch_w]
-    elif corner == "top_right":
-        return img[0:patch_h, w - patch_w:w]
-    elif corner == "bottom_left":
-        return img[h - patch_h:h, 0:patch_w]
-    elif corner == "bottom_right":
-        return img[h - patch_h:h, w - patch_w:w]
-    else:
-        raise ValueError(f"Unknown corner: {corner}")
+_CORNERS = ("top_left", "top_right", "bottom_left", "bottom_right")
+
+
+def _corner_patches(stack: np.ndarray, patch_w: int, patch_h: int) -> np.ndarray:
+    """(N, 4, patch_h, patch_w[, 3]) corner patches of an (N, H, W[, 3]) stack, in _CORNERS order."""
+    h, w = stack.shape[1:3]
+    return np.stack(
+        [
+            stack[:, 0:patch_h, 0:patch_w],
+            stack[:, 0:patch_h, w - patch_w:w],
+            stack[:, h - patch_h:h, 0:patch_w],
+            stack[:, h - patch_h:h, w - patch_w:w],
+        ],
+        axis=1,
+    )
 
 
-def _analyze_whitening(patch: np.ndarray) -> tuple[float, float, float]:
-    """Analyze whitening in a corner patch.
+def _analyze_whitening(patches: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Analyze whitening in gray patches (any leading shape).
     
     Returns:
-        (whitening_ratio, brightness_mean, brightness_std)
+        (whitening_ratio, brightness_mean, brightness_std), each shaped like
+        the leading axes of `patches`
     """
-    # Convert to grayscale if needed
-    if len(patch.shape) == 3:
-        gray = cv2.cvtColor(patch, cv2.COLOR_RGB2GRAY)
-    else:
-        gray = patch
+    flat = patches.reshape(*patches.shape[:-2], -1)
+    total_pixels = flat.shape[-1]
     
     # Count pixels above brightness threshold
-    total_pixels = gray.size
-    white_pixels = np.sum(gray > WHITENING_BRIGHTNESS_THRESHOLD)
-    whitening_ratio = float(white_pixels) / float(total_pixels) if total_pixels > 0 else 0.0
+    if total_pixels > 0:
+        whitening_ratio = np.count_nonzero(flat > WHITENING_BRIGHTNESS_THRESHOLD, axis=-1) / float(total_pixels)
+    else:
+        whitening_ratio = np.zeros(flat.shape[:-1])
     
-    brightness_mean = float(np.mean(gray))
-    brightness_std = float(np.std(gray))
+    brightness_mean = np.mean(flat, axis=-1)
+    brightness_std = np.std(flat, axis=-1)
     
     return whitening_ratio, brightness_mean, brightness_std
 
 
-def _analyze_edge_curvature(patch: np.ndarray) -> float:
-    """Analyze edge curvature to detect flattening.
+def _sobel3(patches: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """3x3 Sobel x/y of (M, h, w) gray patches, as cv2.Sobel(ksize=3) per patch.
     
-    Returns variance of edge directions as a proxy for curvature.
-    Low variance = flat edges, high variance = curved/natural corner.
+    Each patch is padded on its own (reflect-101, OpenCV's default border),
+    so patches stacked together never see each other's pixels.
     """
-    # Convert to grayscale
-    if len(patch.shape) == 3:
-        gray = cv2.cvtColor(patch, cv2.COLOR_RGB2GRAY)
-    else:
-        gray = patch
+    p = np.pad(patches.astype(np.int32), ((0, 0), (1, 1), (1, 1)), mode="reflect")
+    dx = p[:, :, 2:] - p[:, :, :-2]
+    dy = p[:, 2:, :] - p[:, :-2, :]
+    sobelx = dx[:, :-2] + 2 * dx[:, 1:-1] + dx[:, 2:]
+    sobely = dy[:, :, :-2] + 2 * dy[:, :, 1:-1] + dy[:, :, 2:]
+    return sobelx.astype(np.float64), sobely.astype(np.float64)
+
+
+def _analyze_edge_curvature(patches: np.ndarray) -> np.ndarray:
+    """Analyze edge curvature to detect flattening, for (M, h, w) gray patches.
     
+    Returns variance of edge directions as a proxy for curvature, per patch.
+    Low variance = flat edges, high variance = curved/natural corner.
+    """
     # Compute gradients
-    sobelx = cv2.Sobel(gray, cv2.CV_64F, 1, 0, ksize=3)
-    sobely = cv2.Sobel(gray, cv2.CV_64F, 0, 1, ksize=3)
+    sobelx, sobely = _sobel3(patches)
     
-    # Compute edge angles where gradient magnitude is significant
+    # Edge directions where gradient magnitude is significant
+    sobelx = sobelx.reshape(len(patches), -1)
+    sobely = sobely.reshape(len(patches), -1)
     magnitude = np.sqrt(sobelx**2 + sobely**2)
-    threshold = np.percentile(magnitude, 75)  # Top 25% edges
-    
-    mask = magnitude > threshold
-    if np.sum(mask) < 10:
-        # Not enough edges to analyze
-        return 0.5  # Neutral
+    threshold = np.percentile(magnitude, 75, axis=1)  # Top 25% edges
     
-    angles = np.arctan2(sobely[mask], sobelx[mask])
+    mask = magnitude > threshold[:, None]
+    n = np.count_nonzero(mask, axis=1)
     
-    # Circular variance for angles
-    sin_sum = np.sum(np.sin(angles))
-    cos_sum = np.sum(np.cos(angles))
-    n = len(angles)
+    # Circular variance for angles. The sine and cosine of each gradient
+    # angle are just the components of the unit gradient (no trig needed);
+    # masked pixels have a non-zero magnitude.
+    inv = np.divide(1.0, magnitude, out=np.zeros_like(magnitude), where=mask)
+    sin_sum = np.sum(sobely * inv, axis=1)
+    cos_sum = np.sum(sobelx * inv, axis=1)
     
-    r = np.sqrt(sin_sum**2 + cos_sum**2) / n
+    r = np.sqrt(sin_sum**2 + cos_sum**2) / np.maximum(n, 1)
     circular_variance = 1.0 - r  # 0 = all same direction, 1 = uniform
     
-    return float(circular_variance)
+    # Not enough edges to analyze: neutral
+    return np.where(n < 10, 0.5, circular_variance)
 
 
 def _compute_corner_severity(
@@ -174,41 +170,64 @@ def _compute_corner_severity(
     return severity
 
 
-def detect_corner_defects(image: Image.Image) -> CornersResult:
+def detect_corner_defects(image: FeatureSource) -> CornersResult:
     """Detect corner defects in a canonical card image.
     
     Args:
-        image: Canonical RGB image (744x1040)
+        image: Canonical RGB image (744x1040) or its CanonicalFeatures
     
     Returns:
         CornersResult with severity and per-corner analysis
     """
-    rgb = np.array(image.convert("RGB"))
-    h, w = rgb.shape[:2]
+    gray = CanonicalFeatures.of(image).gray
+    return _detect_corner_defects_stack(gray[None])[0]
+
+
+def detect_corner_defects_batch(images: np.ndarray) -> list[CornersResult]:
+    """Detect corner defects in a stack of same-size canonical images.
+    
+    Every card's corners are analyzed together in a few array passes (only
+    the corner patches are converted to grayscale); results match
+    detect_corner_defects on each image.
+    
+    Args:
+        images: (N, H, W, 3) RGB uint8 stack, or (N, H, W) grayscale
+    
+    Returns:
+        One CornersResult per image
+    """
+    return _detect_corner_defects_stack(np.asarray(images))
+
+
+def _detect_corner_defects_stack(stack: np.ndarray) -> list[CornersResult]:
+    n, h, w = stack.shape[:3]
     
     patch_w = int(w * CORNER_PATCH_FRACTION)
     patch_h = int(h * CORNER_PATCH_FRACTION)
     
-    corners = ["top_left", "top_right", "bottom_left", "bottom_right"]
-    analyses = []
-    
-    for corner_name in corners:
-        patch = _extract_corner_patch(rgb, corner_name, patch_w, patch_h)
-        
-        whitening_ratio, brightness_mean, brightness_std = _analyze_whitening(patch)
-        edge_variance = _analyze_edge_curvature(patch)
-        severity = _compute_corner_severity(whitening_ratio, edge_variance)
-        
-        analysis = CornerAnalysis(
-            name=corner_name,
-            whitening_ratio=whitening_ratio,
-            brightness_mean=brightness_mean,
-            brightness_std=brightness_std,
-            edge_variance=edge_variance,
-            severity=severity,
-        )
-        analyses.append(analysis)
+    patches = _corner_patches(stack, patch_w, patch_h)
+    if patches.ndim == 5:
+        patches = gray_stack(patches)  # (N, 4, ph, pw)
+    whitening_ratio, brightness_mean, brightness_std = _analyze_whitening(patches)
+    edge_variance = _analyze_edge_curvature(patches.reshape(-1, patch_h, patch_w)).reshape(n, len(_CORNERS))
     
+    results = []
+    for i in range(n):
+        analyses = []
+        for k, corner_name in enumerate(_CORNERS):
+            analyses.append(CornerAnalysis(
+                name=corner_name,
+                whitening_ratio=float(whitening_ratio[i, k]),
+                brightness_mean=float(brightness_mean[i, k]),
+                brightness_std=float(brightness_std[i, k]),
+                edge_variance=float(edge_variance[i, k]),
+                severity=_compute_corner_severity(float(whitening_ratio[i, k]), float(edge_variance[i, k])),
+            ))
+        results.append(_corners_result(analyses, patch_w, patch_h))
+    return results
+
+
+def _corners_result(analyses: list[CornerAnalysis], patch_w: int, patch_h: int) -> CornersResult:
     # Overall severity: max of individual corners (worst corner dominates)
     overall_severity = max(a.severity for a in analyses)
     
@@ -18,7 +18,6 @@ from dataclasses import dataclass
 from typing import Any
 
 import numpy as np
-from PIL import Image
 
 try:
     import cv2
@@ -28,6 +27,8 @@ except ImportError as e:
         "Install with: pip install opencv-python"
     ) from e
 
+from services.grading.features import CanonicalFeatures, FeatureSource, gray_stack
+
 
 # Border band width as fraction of card width/height
 BORDER_BAND_FRACTION = 0.02  # ~15 pixels on 744 width
@@ -63,74 +64,60 @@ class EdgesResult:
     details: dict[str, Any]
 
 
-def _extract_edge_band(
-    img: np.ndarray,
-    edge: str,
-    band_width: int,
-) -> np.ndarray:
-    """Extract an edge band from the image."""
-    h, w = img.shape[:2]
-    
-    if edge == "top":
-        return img[0:band_width, :]
-    elif edge == "bottom":
-        return img[h - band_width:h, :]
-    elif edge == "left":
-        return img[:, 0:band_width]
-    elif edge == "right":
-        return img[:, w - band_width:w]
-    else:
-        raise ValueError(f"Unknown edge: {edge}")
+_EDGES = ("top", "bottom", "left", "right")
+
+
+def _edge_bands(stack: np.ndarray, band_w: int, band_h: int) -> dict[str, np.ndarray]:
+    """Edge bands of an (N, H, W[, 3]) stack: (N, band_h, W) top/bottom, (N, H, band_w) left/right."""
+    h, w = stack.shape[1:3]
+    return {
+        "top": stack[:, 0:band_h, :],
+        "bottom": stack[:, h - band_h:h, :],
+        "left": stack[:, :, 0:band_w],
+        "right": stack[:, :, w - band_w:w],
+    }
 
 
-def _analyze_edge_whitening(band: np.ndarray) -> tuple[float, float]:
-    """Analyze whitening in an edge band.
+def _analyze_edge_whitening(bands: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Analyze whitening in (N, h, w) gray edge bands.
     
     Returns:
-        (whitening_ratio, brightness_mean)
+        (whitening_ratio, brightness_mean), each (N,)
     """
-    if len(band.shape) == 3:
-        gray = cv2.cvtColor(band, cv2.COLOR_RGB2GRAY)
+    flat = bands.reshape(len(bands), -1)
+    total_pixels = flat.shape[1]
+    if total_pixels > 0:
+        whitening_ratio = np.count_nonzero(flat > WHITENING_BRIGHTNESS_THRESHOLD, axis=1) / float(total_pixels)
     else:
-        gray = band
-    
-    total_pixels = gray.size
-    white_pixels = np.sum(gray > WHITENING_BRIGHTNESS_THRESHOLD)
-    whitening_ratio = float(white_pixels) / float(total_pixels) if total_pixels > 0 else 0.0
+        whitening_ratio = np.zeros(len(bands))
     
-    brightness_mean = float(np.mean(gray))
+    brightness_mean = np.mean(flat, axis=1)
     
     return whitening_ratio, brightness_mean
 
 
-def _analyze_chipping(band: np.ndarray, edge: str) -> float:
+def _analyze_chipping(bands: np.ndarray, edge: str) -> np.ndarray:
     """Analyze chipping by measuring brightness variation along the edge.
     
     Chipping appears as high-frequency brightness changes along the edge.
-    Returns std deviation of brightness profile.
+    Returns std deviation of the high-passed brightness profile of each of
+    the (N, h, w) gray bands.
     """
-    if len(band.shape) == 3:
-        gray = cv2.cvtColor(band, cv2.COLOR_RGB2GRAY)
-    else:
-        gray = band
-    
-    # Project to 1D along the edge direction
+    # Project to 1D along the edge direction: average across band width
     if edge in ("top", "bottom"):
-        # Average across band width, get profile along length
-        profile = np.mean(gray, axis=0)
+        profiles = np.mean(bands, axis=1)
     else:
-        # Average across band width, get profile along height
-        profile = np.mean(gray, axis=1)
+        profiles = np.mean(bands, axis=2)
     
     # High-pass filter to isolate high-frequency changes
-    if len(profile) > 5:
-        # Simple high-pass: subtract smoothed version
-        smoothed = cv2.GaussianBlur(profile.reshape(-1, 1), (1, 5), 0).flatten()
-        if len(smoothed) == len(profile):
-            high_freq = np.abs(profile - smoothed)
-            return float(np.std(high_freq))
+    if profiles.shape[1] > 5:
+        # Simple high-pass: subtract smoothed version. Profiles are the
+        # columns of one image; the 5-tap kernel only runs along them.
+        smoothed = cv2.GaussianBlur(np.ascontiguousarray(profiles.T), (1, 5), 0).T
+        high_freq = np.abs(profiles - smoothed)
+        return np.std(high_freq, axis=1)
     
-    return float(np.std(profile))
+    return np.std(profiles, axis=1)
 
 
 def _compute_chipping_score(brightness_std: float) -> float:
@@ -163,49 +150,68 @@ def _compute_edge_severity(whitening_ratio: float, chipping_score: float) -> flo
     return min(1.0, severity)
 
 
-def detect_edge_defects(image: Image.Image) -> EdgesResult:
+def detect_edge_defects(image: FeatureSource) -> EdgesResult:
     """Detect edge defects in a canonical card image.
     
     Args:
-        image: Canonical RGB image (744x1040)
+        image: Canonical RGB image (744x1040) or its CanonicalFeatures
     
     Returns:
         EdgesResult with severity and per-edge analysis
     """
-    rgb = np.array(image.convert("RGB"))
-    h, w = rgb.shape[:2]
+    gray = CanonicalFeatures.of(image).gray
+    return _detect_edge_defects_stack(gray[None])[0]
+
+
+def detect_edge_defects_batch(images: np.ndarray) -> list[EdgesResult]:
+    """Detect edge defects in a stack of same-size canonical images.
+    
+    Every card's edges are analyzed together in a few array passes (only
+    the edge bands are converted to grayscale); results match
+    detect_edge_defects on each image.
+    
+    Args:
+        images: (N, H, W, 3) RGB uint8 stack, or (N, H, W) grayscale
+    
+    Returns:
+        One EdgesResult per image
+    """
+    return _detect_edge_defects_stack(np.asarray(images))
+
+
+def _detect_edge_defects_stack(stack: np.ndarray) -> list[EdgesResult]:
+    n, h, w = stack.shape[:3]
     
     # Use different band widths for horizontal vs vertical edges
     band_w = int(w * BORDER_BAND_FRACTION)
     band_h = int(h * BORDER_BAND_FRACTION)
     
-    edges_config = [
-        ("top", band_h),
-        ("bottom", band_h),
-        ("left", band_w),
-        ("right", band_w),
-    ]
-    
-    analyses = []
-    
-    for edge_name, band_size in edges_config:
-        band = _extract_edge_band(rgb, edge_name, band_size)
-        
+    stats = {}
+    for edge_name, band in _edge_bands(stack, band_w, band_h).items():
+        if band.ndim == 4:
+            band = gray_stack(band)
         whitening_ratio, brightness_mean = _analyze_edge_whitening(band)
-        brightness_std = _analyze_chipping(band, edge_name)
-        chipping_score = _compute_chipping_score(brightness_std)
-        severity = _compute_edge_severity(whitening_ratio, chipping_score)
-        
-        analysis = EdgeAnalysis(
-            name=edge_name,
-            whitening_ratio=whitening_ratio,
-            brightness_mean=brightness_mean,
-            brightness_std=brightness_std,
-            chipping_score=chipping_score,
-            severity=severity,
-        )
-        analyses.append(analysis)
-    
+        stats[edge_name] = (whitening_ratio, brightness_mean, _analyze_chipping(band, edge_name))
+    
+    results = []
+    for i in range(n):
+        analyses = []
+        for edge_name in _EDGES:
+            whitening_ratio, brightness_mean, brightness_std = (float(v[i]) for v in stats[edge_name])
+            chipping_score = _compute_chipping_score(brightness_std)
+            analyses.append(EdgeAnalysis(
+                name=edge_name,
+                whitening_ratio=whitening_ratio,
+                brightness_mean=brightness_mean,
+                brightness_std=brightness_std,
+                chipping_score=chipping_score,
+                severity=_compute_edge_severity(whitening_ratio, chipping_score),
+            ))
+        results.append(_edges_result(analyses, band_w, band_h))
+    return results
+
+
+def _edges_result(analyses: list[EdgeAnalysis], band_w: int, band_h: int) -> EdgesResult:
     # Overall severity: max of individual edges
     overall_severity = max(a.severity for a in analyses)
     
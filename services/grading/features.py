@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+"""Shared derived planes for the grading detectors.
+
+Corners, edges, surface, photo quality and centering all start from the same
+canonical image and each used to convert it to grayscale (and run its own
+blur / edge / Laplacian passes) independently. CanonicalFeatures computes
+those planes once, on first use, and every detector reads from it.
+
+Only planes whose values do not depend on where they are cut are shared
+whole-image: grayscale is per-pixel, so a patch of the gray plane equals the
+gray of the patch. Filters that read neighbours (Canny) are cached per region
+instead, because running them on a crop differs at the crop border; for the
+same reason the corner detector keeps its per-patch Sobel.
+
+Planes are computed once even when several grade worker threads ask for the
+same one at the same time (a lock per plane).
+
+There is no HSV plane: no detector reads hue or saturation. Whitening,
+glare and blur are all measured on brightness (the gray plane).
+
+Detector lengths (border widths, line lengths, block sizes) are constants in
+canonical pixels. Preview grading runs on a half or quarter size canonical
+image; px() converts such a constant to the image's own resolution and is
+the identity at full size.
+"""
+
+import threading
+from functools import cached_property
+from typing import Any, Callable, Hashable, Optional, Union
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError as e:
+    raise ImportError(
+        "opencv-python is required for grading features. "
+        "Install with: pip install opencv-python"
+    ) from e
+
+from services.grading.canonical import CANONICAL_W
+from services.image_arrays import ImageLike, as_rgb_array
+
+
+# (x, y, w, h) region of the canonical image, as used by the detectors.
+Region = tuple[int, int, int, int]
+
+
+def scaled_px(canonical_px: float, scale: float, minimum: int = 1) -> int:
+    """A length given in canonical pixels, at `scale` times canonical resolution."""
+    return max(minimum, int(round(canonical_px * scale)))
+
+
+def gray_stack(rgb: np.ndarray) -> np.ndarray:
+    """Grayscale of any (..., H, W, 3) RGB uint8 stack (e.g. patches of many cards).
+
+    One cvtColor call over all pixels; identical to converting each image.
+    """
+    rgb = np.ascontiguousarray(rgb)
+    flat = rgb.reshape(-1, rgb.shape[-2], 3)
+    return cv2.cvtColor(flat, cv2.COLOR_RGB2GRAY).reshape(rgb.shape[:-1])
+
+
+def _readonly(arr: np.ndarray) -> np.ndarray:
+    arr.flags.writeable = False
+    return arr
+
+
+class CanonicalFeatures:
+    """Lazily computed planes of one canonical card image.
+
+    Arrays are read-only: they are shared by every detector that asks.
+    Thread-safe: each plane is computed by the first thread that needs it.
+    """
+
+    def __init__(self, image: ImageLike):
+        self.image = image
+        self._planes: dict[Hashable, np.ndarray] = {}
+        self._plane_locks: dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _shared(self, key: Hashable, compute: Callable[[], Any]) -> np.ndarray:
+        plane = self._planes.get(key)
+        if plane is not None:
+            return plane
+        with self._lock:
+            lock = self._plane_locks.setdefault(key, threading.Lock())
+        with lock:
+            plane = self._planes.get(key)
+            if plane is None:
+                plane = self._planes[key] = _readonly(compute())
+        return plane
+
+    @classmethod
+    def of(cls, image: Union[ImageLike, "CanonicalFeatures"]) -> "CanonicalFeatures":
+        """Wrap an image, or return the features object unchanged."""
+        if isinstance(image, CanonicalFeatures):
+            return image
+        return cls(image)
+
+    @cached_property
+    def rgb(self) -> np.ndarray:
+        # A view, so the flag never changes on an array owned by the caller.
+        return _readonly(as_rgb_array(self.image).view())
+
+    @property
+    def size(self) -> tuple[int, int]:
+        """(width, height)."""
+        h, w = self.rgb.shape[:2]
+        return w, h
+
+    @property
+    def scale(self) -> float:
+        """Resolution relative to the canonical size (1.0, or a preview scale)."""
+        return self.size[0] / CANONICAL_W
+
+    def px(self, canonical_px: float, minimum: int = 1) -> int:
+        """A length given in canonical pixels, at this image's resolution."""
+        return scaled_px(canonical_px, self.scale, minimum)
+
+    @property
+    def gray(self) -> np.ndarray:
+        return self._shared("gray", lambda: cv2.cvtColor(self.rgb, cv2.COLOR_RGB2GRAY))
+
+    @property
+    def gray_blur5(self) -> np.ndarray:
+        """5x5 Gaussian of the gray plane (contour-based detectors)."""
+        return self._shared("gray_blur5", lambda: cv2.GaussianBlur(self.gray, (5, 5), 0))
+
+    @property
+    def laplacian(self) -> np.ndarray:
+        """CV_64F Laplacian of the gray plane (blur measure)."""
+        return self._shared("laplacian", lambda: cv2.Laplacian(self.gray, cv2.CV_64F))
+
+    def crop(self, plane: np.ndarray, region: Region) -> np.ndarray:
+        x, y, w, h = region
+        return plane[y:y + h, x:x + w]
+
+    def canny(self, low: int, high: int, region: Optional[Region] = None, blurred: bool = False) -> np.ndarray:
+        """Canny edges of the gray (or 5x5-blurred gray) plane, optionally of a region."""
+        def compute() -> np.ndarray:
+            src = self.gray_blur5 if blurred else self.gray
+            if region is not None:
+                src = self.crop(src, region)
+            return cv2.Canny(src, low, high)
+
+        return self._shared(("canny", low, high, region, blurred), compute)
+
+
+# What the detectors accept: a canonical image or its shared features.
+FeatureSource = Union[ImageLike, CanonicalFeatures]
@@ -9,17 +9,23 @@ Primary output: P(PSA10).
 Secondary output: distribution over {7,8,9,10}.
 """
 
+import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Callable, Iterable, Optional
 
-from PIL import Image
-
-from services.grading.canonical import canonicalize
-from services.grading.centering import measure_centering, render_centering_overlay
+from services.grading.canonical import CanonicalImage, canonical_size, canonicalize
+from services.grading.centering import CenteringOverlaySource, measure_centering, render_side_overlay
 from services.grading.corners import detect_corner_defects
 from services.grading.edges import detect_edge_defects
 from services.grading.surface import detect_surface_defects
-from services.grading.photo_quality import detect_photo_quality
+from services.grading.photo_quality import detect_photo_quality, detector_gate
+from services.grading.features import CanonicalFeatures
+from services.grading.registration import ReferenceImage, load_back_reference
+from services.grading.stages import GRADE_DEFAULT_FIELDS, GRADE_STAGE_ORDER, resolve_stages, skipped_fields
+from services.image_arrays import ImageLike
+from services.stage_cache import StageCache, image_key, stage_cache
 from services.grading.types import (
     GradeDistribution,
     CenteringResult,
@@ -42,110 +48,331 @@ def _softmax4(logits: tuple[float, float, float, float]) -> tuple[float, float,
     return tuple(e / s for e in exps)  # type: ignore
 
 
-def grade_card(front: Image.Image, back: Image.Image) -> GradeResult:
-    # Canonicalize
-    cf = canonicalize(front)
-    cb = canonicalize(back)
+# Worker threads for grade_card stages. OpenCV releases the GIL, so the
+# independent stages (front/back canonicalization, the detectors, the two
+# overlays) overlap on multi-core hosts. 1 runs everything inline.
+DEFAULT_GRADE_PARALLELISM = 4
+
+
+def grade_parallelism() -> int:
+    raw = os.environ.get("PREGRADE_GRADE_PARALLELISM", "").strip()
+    if not raw:
+        return max(1, min(DEFAULT_GRADE_PARALLELISM, os.cpu_count() or 1))
+    try:
+        return max(1, int(raw))
+    except ValueError:
+        return max(1, min(DEFAULT_GRADE_PARALLELISM, os.cpu_count() or 1))
+
+
+class _StageRunner:
+    """Submit named stages to an optional pool, recording wall/CPU time.
+
+    Only `selected` stages run. Stages with a cache key (`keys`) are looked
+    up in the stage cache first and their provenance recorded. Results are
+    only ever read back by name from the calling thread, so the assembled
+    GradeResult does not depend on completion order.
+    """
+
+    def __init__(
+        self,
+        pool: Optional[ThreadPoolExecutor],
+        selected: frozenset[str],
+        cache: Optional[StageCache] = None,
+        keys: Optional[dict[str, str]] = None,
+    ):
+        self.pool = pool
+        self.selected = selected
+        self.cache = cache
+        self.keys = keys or {}
+        self.timings: dict[str, dict[str, float]] = {}
+        self.sources: dict[str, str] = {}
+
+    def submit(self, name: str, fn: Callable[..., Any], *args: Any) -> Optional[Future]:
+        """Run a stage; None (and nothing run) if it is not selected."""
+        if name not in self.selected:
+            return None
+
+        def run() -> Any:
+            key = self.keys.get(name)
+            if self.cache is None or key is None:
+                return fn(*args)
+            stage = _CACHE_STAGES.get(name, name)
+            value, self.sources[name] = self.cache.get_or_compute(key, stage, lambda: fn(*args))
+            return value
+
+        def timed() -> Any:
+            wall0, cpu0 = time.perf_counter(), time.thread_time()
+            try:
+                return run()
+            finally:
+                self.timings[name] = {
+                    "wall_ms": round((time.perf_counter() - wall0) * 1000.0, 2),
+                    "cpu_ms": round((time.thread_time() - cpu0) * 1000.0, 2),
+                }
+
+        if self.pool is not None:
+            return self.pool.submit(timed)
+        future: Future = Future()
+        try:
+            future.set_result(timed())
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+    def trace(self, order: tuple[str, ...], parallelism: int, wall_ms: float) -> dict[str, Any]:
+        return {
+            "parallelism": parallelism,
+            "wall_ms": round(wall_ms, 2),
+            "stages": {name: self.timings[name] for name in order if name in self.timings and name in self.selected},
+        }
+
+    def drop(self, names: Iterable[str]) -> None:
+        """Deselect stages; ones already submitted are left out of the trace."""
+        self.selected = self.selected - frozenset(names)
+
+    def cache_trace(self, order: tuple[str, ...]) -> dict[str, str]:
+        return {name: self.sources[name] for name in order if name in self.sources and name in self.selected}
+
+
+_GATED_STAGES = ("corners", "edges", "surface")
+
+# Both sides share the per-image "canonical" entry: a front re-submitted as a
+# back (or analyzed first via /v1/analyze) is not warped again.
+_CACHE_STAGES = {"canonicalize_front": "canonical", "canonicalize_back": "canonical"}
+
+
+def _stage_keys(
+    front_hash: Optional[str],
+    back_hash: Optional[str],
+    front_reference: Optional[ReferenceImage],
+    scale: float,
+) -> dict[str, str]:
+    """Stage-cache key per stage: the image(s) each stage reads, at this scale."""
+    front_key, back_key = image_key(front_hash, scale), image_key(back_hash, scale)
+    keys: dict[str, str] = {}
+    if front_key is not None:
+        keys.update({name: front_key for name in ("canonicalize_front", "corners", "edges", "surface", "photo_quality")})
+    if back_key is not None:
+        keys["canonicalize_back"] = back_key
+    if front_key is not None and back_key is not None:
+        # References are keyed by content, so adding or replacing one is not
+        # served stale centering (also from the disk tier, across restarts).
+        back_reference = load_back_reference()
+        references = "".join(
+            f"+{side}:{reference.digest}"
+            for side, reference in (("front", front_reference), ("back", back_reference))
+            if reference is not None
+        )
+        keys["centering"] = f"{front_key}+{back_key}{references}"
+    return keys
+
+
+def _canonical_features(cimg: CanonicalImage) -> CanonicalFeatures:
+    features = CanonicalFeatures(cimg.image)
+    # Gray feeds every detector; build it before the detector threads start
+    # (other planes are built once, by the first thread that needs them).
+    _ = features.gray
+    return features
+
+
+def grade_card(
+    front: ImageLike,
+    back: ImageLike,
+    front_reference: Optional[ReferenceImage] = None,
+    scale: float = 1.0,
+    include: Optional[Iterable[str]] = None,
+    front_hash: Optional[str] = None,
+    back_hash: Optional[str] = None,
+) -> GradeResult:
+    """Grade a card from front/back photos.
+
+    front_reference: reference scan of the card's printing, if known; front
+    centering is then measured by registration against it.
+    scale: 1.0, or a preview scale (PREVIEW_SCALES): canonicalize at that
+    fraction of the canonical size for a cheaper, approximate grade.
+    include: output fields to compute (GRADE_FIELDS names); None computes
+    GRADE_DEFAULT_FIELDS, i.e. everything but the rendered overlays. Only the
+    stages those fields need are run; the rest of the result is None and
+    listed in GradeResult.skipped.
+    front_hash / back_hash: content hashes of the uploaded photos. When
+    given, per-image stage outputs are reused from (and stored in) the stage
+    cache; trace["cache"] reports where each cached stage came from.
+    """
+    canonical_size(scale)  # validate before doing any work
+    run = resolve_stages(GRADE_DEFAULT_FIELDS if include is None else include)
+    t0 = time.perf_counter()
+    parallelism = grade_parallelism()
+    pool = ThreadPoolExecutor(max_workers=parallelism, thread_name_prefix="grade") if parallelism > 1 else None
+    try:
+        keys = _stage_keys(front_hash, back_hash, front_reference, scale)
+        stages = _StageRunner(pool, run, stage_cache() if keys else None, keys)
+        return _grade_card(front, back, front_reference, scale, stages, parallelism, t0, front_hash, back_hash)
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True)
+
 
-    # Centering
-    cent = measure_centering(cf.image, cb.image)
+def _result(job: Optional[Future]) -> Any:
+    return job.result() if job is not None else None
 
-    # Defect detection on canonical front image
-    corners_result = detect_corner_defects(cf.image)
-    edges_result = detect_edge_defects(cf.image)
-    surface_result = detect_surface_defects(cf.image)
 
+def _grade_card(
+    front: ImageLike,
+    back: ImageLike,
+    front_reference: Optional[ReferenceImage],
+    scale: float,
+    stages: _StageRunner,
+    parallelism: int,
+    t0: float,
+    front_hash: Optional[str] = None,
+    back_hash: Optional[str] = None,
+) -> GradeResult:
+    # Canonicalize both sides. Derived planes (gray, edges, Laplacian) are
+    # computed once per side and shared by every detector below. Every field
+    # reads the front; only centering reads the back.
+    front_job = stages.submit("canonicalize_front", canonicalize, front, scale)
+    back_job = stages.submit("canonicalize_back", canonicalize, back, scale)
+    cf = front_job.result()
+    cb = _result(back_job)
+    front_features = _canonical_features(cf)
+    back_features = _canonical_features(cb) if cb is not None else None
+
+    # Centering and defect detection on the canonical front image
+    cent_job = stages.submit("centering", measure_centering, front_features, back_features, front_reference)
+    pq_job = stages.submit("photo_quality", detect_photo_quality, front_features)
+
+    # Photo quality gates the defect detectors: on a clearly unusable
+    # canonical image they would only report noise. The detectors do not
+    # wait for it; the gate is applied when their results are read (a
+    # serial run has the photo quality result already and skips them).
+    gate: tuple[str, ...] = ()
+    if pq_job is not None and pq_job.done():
+        gate = detector_gate(pq_job.result())
+        if gate:
+            stages.drop(_GATED_STAGES)
+    corners_job = stages.submit("corners", detect_corner_defects, front_features)
+    edges_job = stages.submit("edges", detect_edge_defects, front_features)
+    surface_job = stages.submit("surface", detect_surface_defects, front_features)
+
+    # Explanations: centering overlays (need the centering result only)
+    # (rendered here only if requested; overlay_source draws them later from
+    # the cached canonical images, so it needs both content hashes)
+    cent = _result(cent_job)
+    overlay_source = front_overlay_job = back_overlay_job = None
+    if cent is not None:
+        if front_hash is not None and back_hash is not None:
+            overlay_source = CenteringOverlaySource(front_hash, back_hash, scale, cent)
+        front_overlay_job = stages.submit("overlay_front", render_side_overlay, "front", cf.image, cent)
+        back_overlay_job = stages.submit("overlay_back", render_side_overlay, "back", cb.image, cent)
+
+    pq_result = _result(pq_job)
+    if pq_result is not None and not gate:
+        gate = detector_gate(pq_result)
+    if gate:
+        stages.drop(_GATED_STAGES)
+        for job in (corners_job, edges_job, surface_job):
+            if job is not None:
+                job.cancel()
+        corners_job = edges_job = surface_job = None
+
+    detector_results = {
+        "corners": _result(corners_job),
+        "edges": _result(edges_job),
+        "surface": _result(surface_job),
+    }
     defects = DefectSignals(
-        corners_severity=corners_result.severity,
-        edges_severity=edges_result.severity,
-        surface_severity=surface_result.severity,
-        details={
-            "corners": corners_result.details,
-            "edges": edges_result.details,
-            "surface": surface_result.details,
-        },
+        corners_severity=detector_results["corners"].severity if corners_job is not None else None,
+        edges_severity=detector_results["edges"].severity if edges_job is not None else None,
+        surface_severity=detector_results["surface"].severity if surface_job is not None else None,
+        details={name: r.details for name, r in detector_results.items() if r is not None},
     )
 
     # Photo quality check on front image
-    pq_result = detect_photo_quality(cf.image)
-    pq = PhotoQuality(
-        blur=pq_result.blur,
-        glare=pq_result.glare,
-        occlusion=pq_result.occlusion,
-        usable=pq_result.usable,
-        reasons=pq_result.reasons,
-    )
+    pq = None
+    if pq_result is not None:
+        pq = PhotoQuality(
+            blur=pq_result.blur,
+            glare=pq_result.glare,
+            occlusion=pq_result.occlusion,
+            usable=pq_result.usable,
+            reasons=pq_result.reasons,
+        )
+
+    skipped = skipped_fields(stages.selected)
 
     # Convert centering max to a centering score (very rough)
     # 10 -> 1.0, 9 -> 0.85, 8 -> 0.7, 7 -> 0.55, else lower.
     cent_score_map = {10.0: 1.0, 9.0: 0.85, 8.0: 0.7, 7.0: 0.55, 6.0: 0.4, 5.0: 0.3, 4.0: 0.25, 3.0: 0.2, 2.0: 0.15, 1.5: 0.12, 1.0: 0.1}
-    cent_score = float(cent_score_map.get(cent.psa_max, 0.1))
-
-    # v0 p10: centering is a hard ceiling; defects reduce.
-    defect_penalty = (defects.corners_severity + defects.edges_severity + defects.surface_severity) / 3.0
-    p10 = _clamp01(0.05 + 0.9 * cent_score - 0.6 * defect_penalty)
-
-    # v0 distribution logits
-    # If p10 high, shift mass to 10/9, else to 8/7.
-    l10 = 2.0 * p10
-    l9 = 1.2 * (0.9 - defect_penalty) + 0.2 * cent_score
-    l8 = 1.0 - 0.6 * cent_score
-    l7 = 0.7 + 0.2 * defect_penalty
-    p7, p8, p9, p10_dist = _softmax4((l7, l8, l9, l10))
-
-    expected = 7.0 * p7 + 8.0 * p8 + 9.0 * p9 + 10.0 * p10_dist
-
-    confidence = _clamp01(0.3 + 0.4 * cent_score + 0.3 * (1.0 - defect_penalty))
-
-    # Explanations: centering overlays
-    front_overlay = render_centering_overlay(
-        cf.image,
-        cent.details.get("front_inner_rect"),
-        cent.front_lr,
-        cent.front_tb,
-        title="Front centering",
-    )
-    back_overlay = render_centering_overlay(
-        cb.image,
-        cent.details.get("back_inner_rect"),
-        cent.back_lr,
-        cent.back_tb,
-        title=f"Back centering ({cent.details.get('back_method')})",
-        pokeball=cent.details.get("back_pokeball"),
-    )
+    cent_score = float(cent_score_map.get(cent.psa_max, 0.1)) if cent is not None else 0.0
+
+    distribution = expected = p10 = confidence = None
+    if "grade" not in skipped:
+        # v0 p10: centering is a hard ceiling; defects reduce.
+        defect_penalty = (defects.corners_severity + defects.edges_severity + defects.surface_severity) / 3.0
+        p10 = _clamp01(0.05 + 0.9 * cent_score - 0.6 * defect_penalty)
+
+        # v0 distribution logits
+        # If p10 high, shift mass to 10/9, else to 8/7.
+        l10 = 2.0 * p10
+        l9 = 1.2 * (0.9 - defect_penalty) + 0.2 * cent_score
+        l8 = 1.0 - 0.6 * cent_score
+        l7 = 0.7 + 0.2 * defect_penalty
+        p7, p8, p9, p10_dist = _softmax4((l7, l8, l9, l10))
+        distribution = GradeDistribution(p7=p7, p8=p8, p9=p9, p10=p10_dist)
+
+        expected = 7.0 * p7 + 8.0 * p8 + 9.0 * p9 + 10.0 * p10_dist
+
+        confidence = _clamp01(0.3 + 0.4 * cent_score + 0.3 * (1.0 - defect_penalty))
 
     # We return images in-memory; API layer decides storage/encoding.
-    explanations: dict[str, Any] = {
-        "centering": {
-            "front_overlay_image": front_overlay,
-            "back_overlay_image": back_overlay,
+    explanations: dict[str, Any] = {}
+    if front_overlay_job is not None and back_overlay_job is not None:
+        explanations["centering"] = {
+            "front_overlay_image": front_overlay_job.result(),
+            "back_overlay_image": back_overlay_job.result(),
         }
-    }
 
+    canonical_trace = {
+        side: {
+            "warp_used": c.warp_used,
+            "warp_reason": c.warp_reason,
+            "warp_debug": c.warp_debug,
+            "orientation": c.orientation,
+        }
+        for side, c in (("front", cf), ("back", cb))
+        if c is not None
+    }
     trace: dict[str, Any] = {
-        "canonical": {
-            "front": {"warp_used": cf.warp_used, "warp_reason": cf.warp_reason, "warp_debug": cf.warp_debug},
-            "back": {"warp_used": cb.warp_used, "warp_reason": cb.warp_reason, "warp_debug": cb.warp_debug},
-        },
-        "centering": cent.details,
+        "scale": scale,
+        "canonical": canonical_trace,
+        "centering": cent.details if cent is not None else None,
         "defects": defects.details,
-        "photo_quality": pq_result.details,
+        "photo_quality": pq_result.details if pq_result is not None else None,
+        "detector_gate": list(gate),
+        "timings": stages.trace(GRADE_STAGE_ORDER, parallelism, (time.perf_counter() - t0) * 1000.0),
+        "cache": stages.cache_trace(GRADE_STAGE_ORDER),
     }
 
-    return GradeResult(
-        grade_distribution=GradeDistribution(p7=p7, p8=p8, p9=p9, p10=p10_dist),
-        expected_grade=expected,
-        p_psa10=p10,
-        confidence=confidence,
-        centering=CenteringResult(
+    centering = None
+    if cent is not None:
+        centering = CenteringResult(
             lr_ratio=max(cent.front_lr),
             tb_ratio=max(cent.front_tb),
             psa_max=int(cent.psa_max) if cent.psa_max != 1.5 else 1,
             score=cent_score,
             details=cent.details,
-        ),
+        )
+
+    return GradeResult(
+        grade_distribution=distribution,
+        expected_grade=expected,
+        p_psa10=p10,
+        confidence=confidence,
+        centering=centering,
         defects=defects,
         photo_quality=pq,
         explanations=explanations,
         trace=trace,
+        skipped=skipped,
+        overlay_source=overlay_source,
     )
@@ -15,10 +15,9 @@ All thresholds are fixed constants for determinism and explainability.
 """
 
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, Optional
 
 import numpy as np
-from PIL import Image
 
 try:
     import cv2
@@ -28,6 +27,9 @@ except ImportError as e:
         "Install with: pip install opencv-python"
     ) from e
 
+from services.grading.features import CanonicalFeatures, FeatureSource
+from services.image_arrays import ImageLike, as_rgb_array
+
 
 # Blur detection thresholds (variance of Laplacian)
 BLUR_VARIANCE_USABLE = 100.0  # Below this = too blurry to use
@@ -58,13 +60,14 @@ class PhotoQualityResult:
     details: dict[str, Any]
 
 
-def _measure_blur(gray: np.ndarray) -> tuple[float, float]:
+def _measure_blur(gray: np.ndarray, laplacian: Optional[np.ndarray] = None) -> tuple[float, float]:
     """Measure blur using variance of Laplacian.
     
     Returns:
         (blur_score 0..1, laplacian_variance)
     """
-    laplacian = cv2.Laplacian(gray, cv2.CV_64F)
+    if laplacian is None:
+        laplacian = cv2.Laplacian(gray, cv2.CV_64F)
     variance = float(np.var(laplacian))
     
     # Convert to 0..1 score where higher = worse (more blurry)
@@ -83,6 +86,44 @@ def _measure_blur(gray: np.ndarray) -> tuple[float, float]:
     return blur_score, variance
 
 
+def glare_mask(gray: np.ndarray) -> np.ndarray:
+    """Saturated-pixel map behind the glare measures (True = glare)."""
+    return gray > GLARE_SATURATION_THRESHOLD
+
+
+def ocr_glare_mask(gray: np.ndarray) -> np.ndarray:
+    """Glare map for OCR region pruning: saturated areas that enclose no ink.
+
+    White card bodies and scans are saturated too, but the text printed on
+    them stays dark and is surrounded by the saturated paper; glare washes
+    the ink out instead.
+    """
+    saturated = glare_mask(gray)
+    # Join JPEG speckle so a paper area is one component.
+    closed = cv2.morphologyEx(saturated.astype(np.uint8), cv2.MORPH_CLOSE, np.ones((5, 5), np.uint8))
+    contours, hierarchy = cv2.findContours(closed, cv2.RETR_CCOMP, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return saturated
+
+    # Each saturated area filled with its holes, labelled by its outer contour.
+    filled = np.zeros(gray.shape, dtype=np.int32)
+    for idx in np.flatnonzero(hierarchy[0][:, 3] < 0):
+        cv2.drawContours(filled, contours, int(idx), int(idx) + 1, thickness=cv2.FILLED)
+    ink_per_area = np.bincount(filled[gray < OCR_INK_LEVEL], minlength=len(contours) + 1)
+    is_paper = ink_per_area >= OCR_PAPER_MIN_INK_PIXELS
+    is_paper[0] = False
+    if not is_paper.any():
+        return saturated
+    return saturated & ~is_paper[filled]
+
+
+def box_glare_ratio(mask: np.ndarray, box: tuple[int, int, int, int]) -> float:
+    """Share of glare pixels inside a (left, top, right, bottom) box of a glare mask."""
+    left, top, right, bottom = box
+    patch = mask[top:bottom, left:right]
+    return float(np.count_nonzero(patch)) / float(patch.size) if patch.size else 0.0
+
+
 def _measure_glare(gray: np.ndarray) -> tuple[float, float]:
     """Measure glare by counting saturated bright pixels.
     
@@ -90,7 +131,7 @@ def _measure_glare(gray: np.ndarray) -> tuple[float, float]:
         (glare_score 0..1, glare_ratio)
     """
     total_pixels = gray.size
-    glare_pixels = np.sum(gray > GLARE_SATURATION_THRESHOLD)
+    glare_pixels = np.count_nonzero(glare_mask(gray))
     glare_ratio = float(glare_pixels) / float(total_pixels) if total_pixels > 0 else 0.0
     
     # Convert to 0..1 score
@@ -129,20 +170,21 @@ def _measure_occlusion(gray: np.ndarray) -> tuple[float, float]:
     return occlusion_score, dark_ratio
 
 
-def detect_photo_quality(image: Image.Image) -> PhotoQualityResult:
+def detect_photo_quality(image: FeatureSource) -> PhotoQualityResult:
     """Detect photo quality issues in a card image.
     
     Args:
         image: RGB image (typically canonical 744x1040, but works on any size)
+            or its CanonicalFeatures
     
     Returns:
         PhotoQualityResult with quality scores and usability flag
     """
-    rgb = np.array(image.convert("RGB"))
-    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+    features = CanonicalFeatures.of(image)
+    gray = features.gray
     
     # Measure each quality dimension
-    blur_score, laplacian_variance = _measure_blur(gray)
+    blur_score, laplacian_variance = _measure_blur(gray, features.laplacian)
     glare_score, glare_ratio = _measure_glare(gray)
     occlusion_score, dark_ratio = _measure_occlusion(gray)
     
@@ -197,3 +239,118 @@ def detect_photo_quality(image: Image.Image) -> PhotoQualityResult:
         reasons=tuple(reasons),
         details=details,
     )
+
+
+# Thumbnail ranking (burst input): long side of the thumbnail the measures run on.
+THUMBNAIL_MAX_SIDE = 256
+
+
+# Prefilter (before warp/OCR): only photos far past any usable range are
+# rejected. Thumbnail Laplacian variance is not comparable with
+# BLUR_VARIANCE_*; 10 is a sharp card photo blurred by ~6 px at 1000 px.
+PREFILTER_BLUR_VARIANCE = 10.0
+PREFILTER_GLARE_RATIO = 0.25  # of the whole photo, background included
+PREFILTER_DARK_MEAN = 16.0  # mean gray level
+
+# Detector gate (canonical image): skip corners/edges/surface only when the
+# photo is well past the usable thresholds above. Occlusion is not gated:
+# dark-bordered cards legitimately have many dark pixels.
+DETECTOR_GATE_BLUR_VARIANCE = 25.0
+DETECTOR_GATE_GLARE_RATIO = 0.30
+
+# OCR regions (identity): a crop with this share of glare pixels is not
+# sent to tesseract; every strategy fails on blown-out text.
+OCR_GLARE_SKIP_RATIO = 0.40
+
+# OCR glare is saturation that hides the print. Saturated areas that enclose
+# ink strokes (darker than OCR_INK_LEVEL) are clean white card stock or a
+# white scan, not glare.
+OCR_INK_LEVEL = 160
+OCR_PAPER_MIN_INK_PIXELS = 20
+
+
+@dataclass(frozen=True)
+class ThumbnailQuality:
+    """Cheap relative quality of one frame, for ranking frames of the same card.
+
+    Laplacian variance depends on resolution and framing, so the values are
+    only comparable between frames of one burst, not against the
+    BLUR_VARIANCE_* thresholds.
+    """
+    score: float  # higher = better
+    laplacian_variance: float
+    glare_ratio: float
+    glare: float  # 0..1, higher = worse
+    brightness: float = 0.0  # mean gray level
+
+
+@dataclass(frozen=True)
+class PrefilterResult:
+    """Thumbnail verdict on a raw upload: is it worth warping and reading?"""
+    usable: bool
+    reason_codes: tuple[str, ...]
+    reasons: tuple[str, ...]
+    quality: ThumbnailQuality
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "usable": self.usable,
+            "reason_codes": list(self.reason_codes),
+            "laplacian_variance": round(self.quality.laplacian_variance, 2),
+            "glare_ratio": round(self.quality.glare_ratio, 4),
+            "brightness": round(self.quality.brightness, 1),
+        }
+
+
+def thumbnail_quality(image: ImageLike, max_side: int = THUMBNAIL_MAX_SIDE) -> ThumbnailQuality:
+    """Blur/glare measures on a small thumbnail of a frame."""
+    rgb = as_rgb_array(image)
+    h, w = rgb.shape[:2]
+    scale = min(1.0, float(max_side) / float(max(h, w)))
+    if scale < 1.0:
+        rgb = cv2.resize(rgb, (max(1, int(round(w * scale))), max(1, int(round(h * scale)))), interpolation=cv2.INTER_AREA)
+    gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+
+    _, laplacian_variance = _measure_blur(gray)
+    glare_score, glare_ratio = _measure_glare(gray)
+
+    # Sharpness on a log scale, discounted by glare (glare hides exactly the
+    # regions OCR and the defect detectors need).
+    score = float(np.log1p(laplacian_variance)) * (1.0 - glare_score)
+    return ThumbnailQuality(
+        score=score,
+        laplacian_variance=laplacian_variance,
+        glare_ratio=glare_ratio,
+        glare=glare_score,
+        brightness=float(gray.mean()),
+    )
+
+
+def prefilter_photo(image: ImageLike, quality: Optional[ThumbnailQuality] = None) -> PrefilterResult:
+    """Reject clearly unusable uploads from a thumbnail, before warp/OCR.
+
+    quality: the frame's ThumbnailQuality if already measured (burst ranking).
+    """
+    q = quality if quality is not None else thumbnail_quality(image)
+    codes: list[str] = []
+    reasons: list[str] = []
+    if q.brightness < PREFILTER_DARK_MEAN:
+        codes.append("PHOTO_TOO_DARK")
+        reasons.append(f"Photo is too dark (mean level {q.brightness:.1f} < {PREFILTER_DARK_MEAN}).")
+    elif q.laplacian_variance < PREFILTER_BLUR_VARIANCE:
+        codes.append("PHOTO_TOO_BLURRY")
+        reasons.append(f"Photo is too blurry to read (thumbnail variance {q.laplacian_variance:.1f}).")
+    if q.glare_ratio >= PREFILTER_GLARE_RATIO:
+        codes.append("PHOTO_GLARE")
+        reasons.append(f"Photo is washed out by glare ({q.glare_ratio * 100:.1f}% saturated pixels).")
+    return PrefilterResult(usable=not codes, reason_codes=tuple(codes), reasons=tuple(reasons), quality=q)
+
+
+def detector_gate(result: PhotoQualityResult) -> tuple[str, ...]:
+    """Reason codes for skipping the defect detectors on this canonical image (empty = run them)."""
+    codes = []
+    if result.details["blur"]["laplacian_variance"] < DETECTOR_GATE_BLUR_VARIANCE:
+        codes.append("PHOTO_TOO_BLURRY")
+    if result.details["glare"]["saturated_ratio"] >= DETECTOR_GATE_GLARE_RATIO:
+        codes.append("PHOTO_GLARE")
+    return tuple(codes)
@@ -0,0 +1,207 @@
+from __future__ import annotations
+
+"""Reference registration for centering.
+
+Every Pokemon card back is printed from the same design, and every copy of a
+printing shares its front design, so centering is just the translation
+between a canonical image and a perfectly centered reference of that design.
+We estimate it with phase correlation: coarse on a 1/4 scale image (covers
+large shifts cheaply), then refined on a full-resolution center crop for a
+sub-pixel offset.
+
+A reference is a pair of files:
+  - <name>.png  : grayscale canonical image (744x1040), design centered
+  - <name>.json : {"borders": {"left": px, "right": px, "top": px, "bottom": px},
+                   "art_rect": [x, y, w, h]}  (art_rect optional)
+    measured on the reference
+
+No reference back ships with the repo: build one from real back photos with
+scripts/build_back_reference.py into assets/reference/pokemon_back.png (or
+point PREGRADE_BACK_REFERENCE_PATH at one). Front references per printing
+live in the reference store (services/reference_store.py). Without a
+reference, registration is skipped and centering uses the border / Pokeball /
+inner-rect methods, which remain the default.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError as e:
+    raise ImportError(
+        "opencv-python is required for back registration. "
+        "Install with: pip install opencv-python"
+    ) from e
+
+
+_ASSETS_DIR = Path(__file__).resolve().parent.parent.parent / "assets" / "reference"
+_DEFAULT_BACK_PATH = _ASSETS_DIR / "pokemon_back.png"
+
+# Coarse pass scale and full-resolution refinement crop (w, h).
+REGISTRATION_COARSE_SCALE = 0.25
+REGISTRATION_REFINE_CROP = (256, 384)
+
+# Reject weak or implausible registrations (fall back to other methods).
+REGISTRATION_MIN_RESPONSE = 0.1  # phase correlation peak, 0..1
+REGISTRATION_MAX_SHIFT_FRACTION = 0.1  # of card width/height
+
+
+@dataclass(frozen=True)
+class ReferenceImage:
+    gray: np.ndarray  # HxW uint8, canonical size
+    borders: dict[str, float]  # border widths of the centered reference
+    path: str
+    art_rect: Optional[tuple[int, int, int, int]] = None  # x, y, w, h on the reference
+    digest: str = ""  # sha256 of the PNG + sidecar bytes (stage-cache keys)
+
+
+@dataclass(frozen=True)
+class Registration:
+    dx: float  # design offset of the image relative to the reference, px (+ = right)
+    dy: float  # (+ = down)
+    response: float  # refinement peak, 0..1 (higher = more confident)
+    coarse_response: float
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "dx": round(self.dx, 3),
+            "dy": round(self.dy, 3),
+            "response": round(self.response, 4),
+            "coarse_response": round(self.coarse_response, 4),
+        }
+
+
+def back_reference_path() -> Path:
+    override = os.environ.get("PREGRADE_BACK_REFERENCE_PATH", "").strip()
+    return Path(override) if override else _DEFAULT_BACK_PATH
+
+
+def load_back_reference(path: Optional[Path] = None) -> Optional[ReferenceImage]:
+    """Load the reference back (cached per path), or None if not available."""
+    return load_reference_image(str(path or back_reference_path()))
+
+
+def load_reference_image(path: str) -> Optional[ReferenceImage]:
+    """Load <path> and its .json sidecar, or None if unusable.
+
+    Cached per path and modification time, so a reference added or replaced
+    while the process runs is picked up; missing files are never cached.
+    """
+    png = Path(path)
+    try:
+        stamp = (png.stat().st_mtime_ns, png.with_suffix(".json").stat().st_mtime_ns)
+    except OSError:
+        return None
+    return _load_reference_image(path, stamp)
+
+
+@lru_cache(maxsize=64)
+def _load_reference_image(path: str, stamp: tuple[int, int]) -> Optional[ReferenceImage]:
+    png = Path(path)
+    try:
+        png_bytes, meta_bytes = png.read_bytes(), png.with_suffix(".json").read_bytes()
+    except OSError:
+        return None
+    gray = cv2.imdecode(np.frombuffer(png_bytes, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+    if gray is None:
+        return None
+    try:
+        info = json.loads(meta_bytes)
+        borders = {k: float(v) for k, v in info["borders"].items()}
+        art_rect = tuple(int(v) for v in info["art_rect"]) if info.get("art_rect") else None
+    except (ValueError, KeyError, TypeError, AttributeError):
+        return None
+    if set(borders) != {"left", "right", "top", "bottom"}:
+        return None
+    if art_rect is not None and len(art_rect) != 4:
+        return None
+    gray.flags.writeable = False
+    digest = hashlib.sha256(png_bytes + b"\0" + meta_bytes).hexdigest()
+    return ReferenceImage(gray=gray, borders=borders, path=path, art_rect=art_rect, digest=digest)
+
+
+def scale_reference(reference: ReferenceImage, size: tuple[int, int]) -> ReferenceImage:
+    """The reference at another canonical resolution (preview grading)."""
+    h, w = reference.gray.shape[:2]
+    if (w, h) == size:
+        return reference
+    s = size[0] / w
+    gray = cv2.resize(reference.gray, size, interpolation=cv2.INTER_AREA)
+    gray.flags.writeable = False
+    art_rect = None
+    if reference.art_rect is not None:
+        art_rect = tuple(int(round(v * s)) for v in reference.art_rect)
+    return ReferenceImage(
+        gray=gray,
+        borders={k: v * s for k, v in reference.borders.items()},
+        path=reference.path,
+        art_rect=art_rect,
+        digest=reference.digest,
+    )
+
+
+@lru_cache(maxsize=8)
+def _window(w: int, h: int) -> np.ndarray:
+    return cv2.createHanningWindow((w, h), cv2.CV_32F)
+
+
+def register_translation(gray: np.ndarray, reference: np.ndarray) -> Registration:
+    """Translation of `gray`'s content relative to `reference` (same size).
+
+    Coarse phase correlation at REGISTRATION_COARSE_SCALE, then a sub-pixel
+    refinement on a full-resolution center crop taken at the coarse offset.
+    """
+    h, w = reference.shape[:2]
+    ref = reference.astype(np.float32)
+    img = gray.astype(np.float32)
+
+    sw = max(8, int(round(w * REGISTRATION_COARSE_SCALE)))
+    sh = max(8, int(round(h * REGISTRATION_COARSE_SCALE)))
+    (cx, cy), coarse_response = cv2.phaseCorrelate(
+        cv2.resize(ref, (sw, sh), interpolation=cv2.INTER_AREA),
+        cv2.resize(img, (sw, sh), interpolation=cv2.INTER_AREA),
+        _window(sw, sh),
+    )
+    dx, dy = cx * w / sw, cy * h / sh
+
+    # Refine: compare the reference center crop with the image crop at the
+    # coarse offset; the residual is what the coarse pass missed.
+    cw, ch = min(REGISTRATION_REFINE_CROP[0], w), min(REGISTRATION_REFINE_CROP[1], h)
+    center = ((w - 1) / 2.0, (h - 1) / 2.0)
+    ref_crop = cv2.getRectSubPix(ref, (cw, ch), center)
+    img_crop = cv2.getRectSubPix(img, (cw, ch), (center[0] + dx, center[1] + dy))
+    (rx, ry), response = cv2.phaseCorrelate(ref_crop, img_crop, _window(cw, ch))
+
+    return Registration(dx=dx + rx, dy=dy + ry, response=float(response), coarse_response=float(coarse_response))
+
+
+def register_reference(gray: np.ndarray, reference: ReferenceImage) -> Optional[Registration]:
+    """Register a canonical image to its reference; None if not trustworthy."""
+    if gray.shape[:2] != reference.gray.shape[:2]:
+        return None
+    reg = register_translation(gray, reference.gray)
+    h, w = gray.shape[:2]
+    if reg.response < REGISTRATION_MIN_RESPONSE:
+        return None
+    if abs(reg.dx) > w * REGISTRATION_MAX_SHIFT_FRACTION or abs(reg.dy) > h * REGISTRATION_MAX_SHIFT_FRACTION:
+        return None
+    return reg
+
+
+def borders_from_registration(reference: ReferenceImage, reg: Registration) -> dict[str, float]:
+    """Border widths of the registered image (design shifted by dx, dy)."""
+    b = reference.borders
+    return {
+        "left": b["left"] + reg.dx,
+        "right": b["right"] - reg.dx,
+        "top": b["top"] + reg.dy,
+        "bottom": b["bottom"] - reg.dy,
+    }
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+"""Stage dependency graph for field-selective grading.
+
+Callers name the output fields they consume (the `include` request
+parameter); only the stages those fields need, directly or through other
+stages, are run. Fields that were not computed are reported as skipped, never
+silently filled with defaults.
+"""
+
+from typing import Iterable, Optional
+
+
+# Stage -> stages it consumes. Insertion order is the execution/report order.
+GRADE_STAGE_DEPS: dict[str, tuple[str, ...]] = {
+    "canonicalize_front": (),
+    "canonicalize_back": (),
+    "centering": ("canonicalize_front", "canonicalize_back"),
+    "photo_quality": ("canonicalize_front",),
+    # Photo quality gates the detectors (skipped on a clearly unusable photo).
+    "corners": ("canonicalize_front", "photo_quality"),
+    "edges": ("canonicalize_front", "photo_quality"),
+    "surface": ("canonicalize_front", "photo_quality"),
+    "overlay_front": ("centering",),
+    "overlay_back": ("centering",),
+}
+
+GRADE_STAGE_ORDER = tuple(GRADE_STAGE_DEPS)
+
+# Output field -> stages that produce it. "grade" is the distribution,
+# expected grade, P(PSA10) and confidence, which combine centering and defects.
+GRADE_FIELDS: dict[str, tuple[str, ...]] = {
+    "grade": ("centering", "corners", "edges", "surface"),
+    "centering": ("centering",),
+    "corners": ("corners",),
+    "edges": ("edges",),
+    "surface": ("surface",),
+    "photo_quality": ("photo_quality",),
+    "overlays": ("overlay_front", "overlay_back"),
+}
+
+# Overlays are opt-in: rendering them costs more than centering itself, and
+# GradeResult.overlay_source can draw them later on demand.
+GRADE_DEFAULT_FIELDS = tuple(name for name in GRADE_FIELDS if name != "overlays")
+
+# /v1/analyze: identity always runs (the gatekeeper needs it); condition
+# signals add the front defect detectors.
+ANALYZE_FIELDS: dict[str, tuple[str, ...]] = {
+    "card_identity": ("identity",),
+    "condition_signals": ("identity", "corners", "edges", "surface"),
+}
+
+
+def parse_include(value: object, fields: dict[str, tuple[str, ...]]) -> Optional[frozenset[str]]:
+    """Validate an `include` request value: None (everything) or a non-empty list of field names.
+
+    Raises:
+        ValueError: with a client-facing message
+    """
+    if value is None:
+        return None
+    if not isinstance(value, list) or not value or not all(isinstance(v, str) for v in value):
+        raise ValueError(f"include must be a non-empty list of field names from {sorted(fields)}.")
+    unknown = sorted(set(value) - set(fields))
+    if unknown:
+        raise ValueError(f"Unknown include field(s) {unknown}; expected names from {sorted(fields)}.")
+    return frozenset(value)
+
+
+def resolve_stages(
+    include: Optional[Iterable[str]],
+    fields: dict[str, tuple[str, ...]] = GRADE_FIELDS,
+    deps: dict[str, tuple[str, ...]] = GRADE_STAGE_DEPS,
+) -> frozenset[str]:
+    """Every stage needed for the included fields (all fields if None)."""
+    names = fields if include is None else include
+    needed: set[str] = set()
+    pending = [stage for name in names for stage in fields[name]]
+    while pending:
+        stage = pending.pop()
+        if stage not in needed:
+            needed.add(stage)
+            pending.extend(deps.get(stage, ()))
+    return frozenset(needed)
+
+
+def skipped_fields(stages: frozenset[str], fields: dict[str, tuple[str, ...]] = GRADE_FIELDS) -> tuple[str, ...]:
+    """Fields (in declaration order) whose stages did not all run."""
+    return tuple(name for name, needs in fields.items() if not stages.issuperset(needs))
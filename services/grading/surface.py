@@ -14,11 +14,10 @@ Approach:
 All thresholds are fixed constants for determinism and explainability.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Optional
 
 import numpy as np
-from PIL import Image
 
 try:
     import cv2
@@ -28,6 +27,8 @@ except ImportError as e:
         "Install with: pip install opencv-python"
     ) from e
 
+from services.grading.features import CanonicalFeatures, FeatureSource, Region, scaled_px
+
 
 # Interior region: exclude this fraction from each edge
 INTERIOR_MARGIN_FRACTION = 0.05
@@ -53,6 +54,13 @@ SCUFF_VARIANCE_THRESHOLD_SIGNIFICANT = 40.0
 # Holographic cards can have texture variance of 1000-2000+ which is normal
 SCUFF_VARIANCE_BASELINE_TEXTURED = 1500.0  # Texture variance above this is abnormal for holo
 
+# Scuff heatmap: block variance on a half-block sliding grid (the scalar
+# texture variance above uses every other row/col, i.e. disjoint blocks).
+SCUFF_BLOCK_SIZE = 32
+SCUFF_HEATMAP_STRIDE = 16
+SCUFF_HOTSPOT_SIGMA = 3.0  # Blocks this many std above the median block variance
+SCUFF_MAX_HOTSPOTS = 5
+
 # Print line detection (regular vertical/horizontal artifacts)
 PRINT_LINE_REGULARITY_THRESHOLD = 0.7  # High regularity = print defect
 
@@ -77,81 +85,119 @@ class SurfaceResult:
     texture_variance: float
     scratches: tuple[ScratchInfo, ...]
     details: dict[str, Any]
+    # Block variance heatmap of the interior (rows x cols at SCUFF_HEATMAP_STRIDE)
+    variance_map: Optional[np.ndarray] = field(default=None, compare=False, repr=False)
 
 
-def _extract_interior(img: np.ndarray) -> np.ndarray:
-    """Extract the interior region, excluding borders."""
-    h, w = img.shape[:2]
+def _interior_region(w: int, h: int) -> Region:
+    """(x, y, w, h) of the interior region, excluding borders."""
     margin_x = int(w * INTERIOR_MARGIN_FRACTION)
     margin_y = int(h * INTERIOR_MARGIN_FRACTION)
     
-    return img[margin_y:h - margin_y, margin_x:w - margin_x]
+    return margin_x, margin_y, w - 2 * margin_x, h - 2 * margin_y
+
+
+def _scratch_edges(gray: np.ndarray) -> np.ndarray:
+    """Canny edge map shared by texture and scratch detection."""
+    return cv2.Canny(gray, SCRATCH_LINE_THRESHOLD, SCRATCH_LINE_THRESHOLD * 2)
 
 
-def _is_textured_surface(gray: np.ndarray) -> tuple[bool, float]:
+def _is_textured_surface(
+    gray: np.ndarray,
+    edges: Optional[np.ndarray] = None,
+    scale: float = 1.0,
+) -> tuple[bool, float]:
     """Detect if surface has high baseline texture (holographic/special cards).
     
     Holographic and special illustration rare cards have complex patterns that
     create many edges. This function detects such cards by measuring edge density.
     
+    Edges are one pixel wide, so the fraction of edge pixels grows as the
+    resolution drops; multiplying by `scale` expresses it at canonical
+    resolution.
+    
     Returns:
         (is_textured, edge_density) where edge_density is fraction of edge pixels
     """
-    edges = cv2.Canny(gray, SCRATCH_LINE_THRESHOLD, SCRATCH_LINE_THRESHOLD * 2)
-    edge_density = float(np.sum(edges > 0)) / float(edges.size)
+    if edges is None:
+        edges = _scratch_edges(gray)
+    edge_density = float(np.sum(edges > 0)) / float(edges.size) * scale
     is_textured = edge_density > TEXTURE_EDGE_DENSITY_THRESHOLD
     return is_textured, edge_density
 
 
-def _compute_line_contrast(gray: np.ndarray, x1: int, y1: int, x2: int, y2: int) -> float:
-    """Compute the contrast of a line against its local neighborhood.
+# Contrast sampling along each line: up to this many points, one per ~10 px
+# (at least 3), each with neighbours this far away on either side.
+_CONTRAST_MAX_SAMPLES = 10
+_CONTRAST_NEIGHBOR_OFFSETS = np.array([-5.0, 5.0])
+
+
+def _compute_line_contrasts(gray: np.ndarray, lines: np.ndarray, scale: float = 1.0) -> np.ndarray:
+    """Compute the contrast of each line against its local neighborhood.
     
     Real scratches typically have different brightness than their surroundings.
     Pattern edges from holographic cards blend with surroundings.
     
+    All lines are sampled at once: sample and perpendicular-neighbour
+    coordinates are built as (lines x samples [x 2]) arrays, gathered in one
+    lookup each and reduced per line. Samples outside the image are masked
+    out (a neighbour only counts if its line sample is inside).
+    
+    Args:
+        gray: Grayscale image the lines were detected on
+        lines: (N, 4) array of x1, y1, x2, y2
+        scale: Resolution relative to canonical (sample spacing and neighbour
+            offsets are in canonical pixels)
+    
     Returns:
-        Absolute brightness difference between line pixels and neighboring pixels
+        (N,) absolute brightness difference between line pixels and
+        neighboring pixels (0.0 where either set is empty)
     """
     h, w = gray.shape
-    
-    # Sample points along the line
-    num_samples = min(10, max(3, int(np.sqrt((x2 - x1)**2 + (y2 - y1)**2) / 10)))
-    
-    line_values = []
-    neighbor_values = []
-    
-    for i in range(num_samples):
-        t = i / max(1, num_samples - 1)
-        px = int(x1 + t * (x2 - x1))
-        py = int(y1 + t * (y2 - y1))
-        
-        if 0 <= px < w and 0 <= py < h:
-            line_values.append(float(gray[py, px]))
-            
-            # Sample perpendicular neighbors (offset by ~5 pixels)
-            dx = x2 - x1
-            dy = y2 - y1
-            length = max(1, np.sqrt(dx**2 + dy**2))
-            # Perpendicular direction
-            perp_x = -dy / length
-            perp_y = dx / length
-            
-            for offset in [-5, 5]:
-                nx = int(px + offset * perp_x)
-                ny = int(py + offset * perp_y)
-                if 0 <= nx < w and 0 <= ny < h:
-                    neighbor_values.append(float(gray[ny, nx]))
-    
-    if not line_values or not neighbor_values:
-        return 0.0
-    
-    line_mean = np.mean(line_values)
-    neighbor_mean = np.mean(neighbor_values)
-    
-    return abs(line_mean - neighbor_mean)
+    x1, y1, x2, y2 = (lines[:, k].astype(np.float64) for k in range(4))
+    dx = x2 - x1
+    dy = y2 - y1
+    dist = np.sqrt(dx**2 + dy**2)
+    
+    # Sample points along the line (coordinates truncate toward zero)
+    num_samples = np.minimum(_CONTRAST_MAX_SAMPLES, np.maximum(3, (dist / (10 * scale)).astype(np.int64)))
+    i = np.arange(_CONTRAST_MAX_SAMPLES)[None, :]
+    t = i / np.maximum(1, num_samples - 1)[:, None]
+    px = np.trunc(x1[:, None] + t * dx[:, None])
+    py = np.trunc(y1[:, None] + t * dy[:, None])
+    on_line = (i < num_samples[:, None]) & (px >= 0) & (px < w) & (py >= 0) & (py < h)
+    
+    # Perpendicular neighbours of every sample
+    length = np.maximum(1.0, dist)
+    perp_x = -dy / length
+    perp_y = dx / length
+    offsets = _CONTRAST_NEIGHBOR_OFFSETS * scale
+    nx = np.trunc(px[:, :, None] + offsets * perp_x[:, None, None])
+    ny = np.trunc(py[:, :, None] + offsets * perp_y[:, None, None])
+    near = on_line[:, :, None] & (nx >= 0) & (nx < w) & (ny >= 0) & (ny < h)
+    
+    def _masked_mean(ys: np.ndarray, xs: np.ndarray, mask: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        vals = gray[np.where(mask, ys, 0).astype(np.intp), np.where(mask, xs, 0).astype(np.intp)]
+        count = mask.reshape(len(lines), -1).sum(axis=1)
+        total = np.where(mask, vals, 0).reshape(len(lines), -1).sum(axis=1, dtype=np.float64)
+        return total / np.maximum(count, 1), count
+    
+    line_mean, line_count = _masked_mean(py, px, on_line)
+    neighbor_mean, neighbor_count = _masked_mean(ny, nx, near)
+    
+    return np.where(
+        (line_count > 0) & (neighbor_count > 0),
+        np.abs(line_mean - neighbor_mean),
+        0.0,
+    )
 
 
-def _detect_scratches(gray: np.ndarray, is_textured: bool = False) -> list[ScratchInfo]:
+def _detect_scratches(
+    gray: np.ndarray,
+    is_textured: bool = False,
+    edges: Optional[np.ndarray] = None,
+    scale: float = 1.0,
+) -> list[ScratchInfo]:
     """Detect linear scratches using Hough line detection.
     
     For textured/holographic cards, uses stricter criteria to avoid false positives
@@ -160,61 +206,59 @@ def _detect_scratches(gray: np.ndarray, is_textured: bool = False) -> list[Scrat
     Args:
         gray: Grayscale image of interior region
         is_textured: Whether this is a textured/holographic card
+        edges: Precomputed Canny edges of `gray` (computed if omitted)
+        scale: Resolution relative to canonical; line lengths, gaps and Hough
+            votes are scaled from their canonical-pixel values
     
     Returns:
         List of detected scratches
     """
     # Use longer minimum length for textured cards
-    min_length = SCRATCH_LINE_MIN_LENGTH_TEXTURED if is_textured else SCRATCH_LINE_MIN_LENGTH
+    min_length = scaled_px(SCRATCH_LINE_MIN_LENGTH_TEXTURED if is_textured else SCRATCH_LINE_MIN_LENGTH, scale)
     
     # Edge detection
-    edges = cv2.Canny(gray, SCRATCH_LINE_THRESHOLD, SCRATCH_LINE_THRESHOLD * 2)
+    if edges is None:
+        edges = _scratch_edges(gray)
     
     # Probabilistic Hough transform
     lines = cv2.HoughLinesP(
         edges,
         rho=1,
         theta=np.pi / 180,
-        threshold=50,
+        threshold=scaled_px(50, scale),
         minLineLength=min_length,
-        maxLineGap=10,
+        maxLineGap=scaled_px(10, scale),
     )
     
     if lines is None:
         return []
     
-    scratches = []
-    for line in lines:
-        x1, y1, x2, y2 = line[0]
-        length = float(np.sqrt((x2 - x1)**2 + (y2 - y1)**2))
-        
-        # Filter: scratches are typically not perfectly horizontal or vertical
-        # (those are more likely print artifacts or card features)
-        dx = abs(x2 - x1)
-        dy = abs(y2 - y1)
-        if length > 0:
-            angle_ratio = min(dx, dy) / length
-            # Accept lines that are at least somewhat diagonal
-            if angle_ratio > 0.1 or length > min_length * 2:
-                # For textured cards, also check contrast
-                if is_textured:
-                    contrast = _compute_line_contrast(gray, int(x1), int(y1), int(x2), int(y2))
-                    if contrast < SCRATCH_CONTRAST_THRESHOLD:
-                        # Low contrast = probably pattern edge, not scratch
-                        continue
-                
-                scratches.append(ScratchInfo(
-                    x1=int(x1), y1=int(y1),
-                    x2=int(x2), y2=int(y2),
-                    length=length,
-                ))
+    segs = lines.reshape(-1, 4)
+    dx = np.abs(segs[:, 2] - segs[:, 0])
+    dy = np.abs(segs[:, 3] - segs[:, 1])
+    lengths = np.sqrt(dx**2 + dy**2)
+    
+    # Filter: scratches are typically not perfectly horizontal or vertical
+    # (those are more likely print artifacts or card features).
+    # Accept lines that are at least somewhat diagonal.
+    angle_ratio = np.minimum(dx, dy) / np.where(lengths > 0, lengths, 1.0)
+    keep = (lengths > 0) & ((angle_ratio > 0.1) | (lengths > min_length * 2))
+    
+    # For textured cards, also check contrast (all candidates in one pass)
+    if is_textured and keep.any():
+        contrast = _compute_line_contrasts(gray, segs[keep], scale)
+        # Low contrast = probably pattern edge, not scratch
+        keep[keep] = contrast >= SCRATCH_CONTRAST_THRESHOLD
     
     # For textured cards, if we still detect too many lines, assume they're pattern
-    if is_textured and len(scratches) >= TEXTURE_MAX_SCRATCH_COUNT:
+    if is_textured and int(keep.sum()) >= TEXTURE_MAX_SCRATCH_COUNT:
         # Return empty - this many "scratches" is clearly pattern, not defects
         return []
     
-    return scratches
+    return [
+        ScratchInfo(x1=int(x1), y1=int(y1), x2=int(x2), y2=int(y2), length=float(length))
+        for (x1, y1, x2, y2), length in zip(segs[keep], lengths[keep])
+    ]
 
 
 def _compute_scratch_severity(scratch_count: int, is_textured: bool = False) -> float:
@@ -244,31 +288,110 @@ def _compute_scratch_severity(scratch_count: int, is_textured: bool = False) ->
     return 0.0
 
 
-def _analyze_texture_variance(gray: np.ndarray) -> float:
+def block_variance_map(gray: np.ndarray, block_size: int, stride: Optional[int] = None) -> np.ndarray:
+    """Variance of block_size x block_size windows of a grayscale image.
+    
+    Windows start every `stride` pixels (default: block_size, i.e. disjoint
+    blocks) at offsets 0, stride, ... < size - block_size. All windows come
+    from one pair of integral images (sum of x and x^2), so the cost is
+    O(pixels) whatever the stride.
+    
+    Returns:
+        (rows, cols) float64 array; empty if the image is smaller than a block
+    """
+    stride = stride or block_size
+    h, w = gray.shape[:2]
+    ys = np.arange(0, h - block_size, stride)
+    xs = np.arange(0, w - block_size, stride)
+    if ys.size == 0 or xs.size == 0:
+        return np.zeros((ys.size, xs.size), dtype=np.float64)
+    
+    # Integer sums are exact; int32 is much faster when it cannot overflow.
+    # Squared sums go to float64, still exact at card sizes.
+    sdepth = cv2.CV_32S if gray.size * 255 < 2**31 else cv2.CV_64F
+    s1, s2 = cv2.integral2(gray, sdepth=sdepth, sqdepth=cv2.CV_64F)
+    y0, x0 = np.ix_(ys, xs)
+    y1, x1 = y0 + block_size, x0 + block_size
+    sum1 = (s1[y1, x1] - s1[y0, x1] - s1[y1, x0] + s1[y0, x0]).astype(np.float64)
+    sum2 = s2[y1, x1] - s2[y0, x1] - s2[y1, x0] + s2[y0, x0]
+    
+    n = float(block_size * block_size)
+    return np.maximum(n * sum2 - sum1 * sum1, 0.0) / (n * n)
+
+
+def _analyze_texture_variance(
+    gray: np.ndarray,
+    variance_map: Optional[np.ndarray] = None,
+    block_size: int = SCUFF_BLOCK_SIZE,
+    stride: int = SCUFF_HEATMAP_STRIDE,
+) -> float:
     """Analyze local texture variance to detect scuffs.
     
     Scuffs appear as regions of irregular texture compared to surrounding area.
+    
+    Args:
+        gray: Grayscale image of interior region
+        variance_map: Precomputed block_variance_map(gray, block_size, stride)
+            with stride dividing block_size (computed if omitted)
+        block_size: Block size in pixels of `gray` (SCUFF_BLOCK_SIZE at
+            canonical resolution)
     """
-    # Divide into blocks and compute local variance
-    block_size = 32
     h, w = gray.shape
     
     if h < block_size or w < block_size:
         return float(np.std(gray))
     
-    variances = []
-    for y in range(0, h - block_size, block_size):
-        for x in range(0, w - block_size, block_size):
-            block = gray[y:y + block_size, x:x + block_size]
-            variances.append(np.var(block))
+    # Local variance of disjoint blocks
+    if variance_map is None:
+        variances = block_variance_map(gray, block_size)
+    else:
+        step = block_size // stride
+        variances = variance_map[::step, ::step]
     
-    if not variances:
+    if variances.size == 0:
         return 0.0
     
     # High variance of variances indicates uneven texture (scuffs)
     return float(np.std(variances))
 
 
+def _scuff_hotspots(
+    variance_map: np.ndarray,
+    origin: tuple[int, int],
+    block_size: int = SCUFF_BLOCK_SIZE,
+    stride: int = SCUFF_HEATMAP_STRIDE,
+) -> tuple[int, list[dict[str, Any]]]:
+    """Heatmap blocks whose variance stands out from the card's typical block.
+    
+    Returns:
+        (hotspot_count, up to SCUFF_MAX_HOTSPOTS boxes in canonical-image
+        pixels, worst first)
+    """
+    if variance_map.size == 0:
+        return 0, []
+    spread = float(np.std(variance_map))
+    if spread <= 0.0:
+        return 0, []
+    
+    z = (variance_map - float(np.median(variance_map))) / spread
+    rows, cols = np.nonzero(z >= SCUFF_HOTSPOT_SIGMA)
+    # Worst first; ties in raster order for determinism
+    order = np.lexsort((cols, rows, -z[rows, cols]))[:SCUFF_MAX_HOTSPOTS]
+    
+    ox, oy = origin
+    return int(rows.size), [
+        {
+            "x": ox + int(cols[i]) * stride,
+            "y": oy + int(rows[i]) * stride,
+            "w": block_size,
+            "h": block_size,
+            "variance": round(float(variance_map[rows[i], cols[i]]), 2),
+            "z": round(float(z[rows[i], cols[i]]), 2),
+        }
+        for i in order
+    ]
+
+
 def _compute_scuff_severity(texture_variance: float) -> float:
     """Convert texture variance to scuff severity."""
     if texture_variance >= SCUFF_VARIANCE_THRESHOLD_SIGNIFICANT:
@@ -303,34 +426,39 @@ def _compute_scuff_severity_textured(texture_variance: float) -> float:
         return scaled * 0.3 / 0.2
 
 
-def detect_surface_defects(image: Image.Image) -> SurfaceResult:
+def detect_surface_defects(image: FeatureSource) -> SurfaceResult:
     """Detect surface defects in a canonical card image.
     
     Handles both normal cards and textured/holographic cards by detecting
     high-texture surfaces and adjusting detection criteria accordingly.
     
     Args:
-        image: Canonical RGB image (744x1040)
+        image: Canonical RGB image (744x1040) or its CanonicalFeatures
     
     Returns:
         SurfaceResult with severity and defect details
     """
-    rgb = np.array(image.convert("RGB"))
-    interior = _extract_interior(rgb)
+    features = CanonicalFeatures.of(image)
+    region = _interior_region(*features.size)
     
-    # Convert to grayscale for analysis
-    gray = cv2.cvtColor(interior, cv2.COLOR_RGB2GRAY)
+    # Grayscale interior; one Canny pass serves texture and scratch detection
+    gray = features.crop(features.gray, region)
+    edges = features.canny(SCRATCH_LINE_THRESHOLD, SCRATCH_LINE_THRESHOLD * 2, region=region)
     
     # Detect if this is a textured/holographic card
-    is_textured, edge_density = _is_textured_surface(gray)
+    is_textured, edge_density = _is_textured_surface(gray, edges, features.scale)
     
     # Detect scratches (with texture-aware filtering)
-    scratches = _detect_scratches(gray, is_textured=is_textured)
+    scratches = _detect_scratches(gray, is_textured=is_textured, edges=edges, scale=features.scale)
     scratch_count = len(scratches)
     scratch_severity = _compute_scratch_severity(scratch_count, is_textured=is_textured)
     
-    # Analyze texture for scuffs
-    texture_variance = _analyze_texture_variance(gray)
+    # Analyze texture for scuffs (heatmap localizes, scalar summarizes)
+    # (block and stride in canonical pixels, scaled for preview resolutions)
+    block_size, stride = features.px(SCUFF_BLOCK_SIZE), features.px(SCUFF_HEATMAP_STRIDE)
+    variance_map = block_variance_map(gray, block_size, stride)
+    texture_variance = _analyze_texture_variance(gray, variance_map, block_size, stride)
+    hotspot_count, hotspots = _scuff_hotspots(variance_map, region[:2], block_size, stride)
     
     # Use different scuff severity calculation for textured cards
     if is_textured:
@@ -347,8 +475,15 @@ def detect_surface_defects(image: Image.Image) -> SurfaceResult:
         "edge_density": round(edge_density, 4),
         "scratch_count": scratch_count,
         "texture_variance": round(texture_variance, 4),
+        "scuff_heatmap": {
+            "block_size": block_size,
+            "stride": stride,
+            "shape": list(variance_map.shape),
+            "hotspot_count": hotspot_count,
+            "hotspots": hotspots,
+        },
         "thresholds": {
-            "scratch_min_length": SCRATCH_LINE_MIN_LENGTH_TEXTURED if is_textured else SCRATCH_LINE_MIN_LENGTH,
+            "scratch_min_length": features.px(SCRATCH_LINE_MIN_LENGTH_TEXTURED if is_textured else SCRATCH_LINE_MIN_LENGTH),
             "scratch_count_minor": SCRATCH_COUNT_MINOR,
             "scuff_variance_minor": SCUFF_VARIANCE_THRESHOLD_MINOR,
             "texture_edge_density_threshold": TEXTURE_EDGE_DENSITY_THRESHOLD,
@@ -367,4 +502,5 @@ def detect_surface_defects(image: Image.Image) -> SurfaceResult:
         texture_variance=texture_variance,
         scratches=tuple(scratches),
         details=details,
+        variance_map=variance_map,
     )
@@ -1,7 +1,10 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Optional
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Optional
+
+if TYPE_CHECKING:
+    from services.grading.centering import CenteringOverlaySource
 
 
 @dataclass(frozen=True)
@@ -31,9 +34,10 @@ class CenteringResult:
 
 @dataclass(frozen=True)
 class DefectSignals:
-    corners_severity: float
-    edges_severity: float
-    surface_severity: float
+    # None when the detector was skipped (see services.grading.stages)
+    corners_severity: Optional[float]
+    edges_severity: Optional[float]
+    surface_severity: Optional[float]
     details: dict[str, Any]
 
 
@@ -48,42 +52,51 @@ class PhotoQuality:
 
 @dataclass(frozen=True)
 class GradeResult:
-    grade_distribution: GradeDistribution
-    expected_grade: float
-    p_psa10: float
-    confidence: float
-    centering: CenteringResult
+    # Sections are None when not requested (include=...); `skipped` names them.
+    grade_distribution: Optional[GradeDistribution]
+    expected_grade: Optional[float]
+    p_psa10: Optional[float]
+    confidence: Optional[float]
+    centering: Optional[CenteringResult]
     defects: DefectSignals
-    photo_quality: PhotoQuality
+    photo_quality: Optional[PhotoQuality]
     explanations: dict[str, Any]
     trace: dict[str, Any]
+    skipped: tuple[str, ...] = ()
+    # In-memory only (not serialized): draws the centering overlays on demand.
+    overlay_source: Optional["CenteringOverlaySource"] = field(default=None, repr=False, compare=False)
 
     def to_dict(self) -> dict[str, Any]:
         return {
-            "grade_distribution": self.grade_distribution.to_dict(),
-            "expected_grade": float(self.expected_grade),
-            "p_psa10": float(self.p_psa10),
-            "confidence": float(self.confidence),
-            "centering": {
-                "lr_ratio": float(self.centering.lr_ratio),
-                "tb_ratio": float(self.centering.tb_ratio),
-                "psa_max": int(self.centering.psa_max),
-                "score": float(self.centering.score),
-                "details": self.centering.details,
-            },
+            "grade_distribution": _opt(self.grade_distribution, GradeDistribution.to_dict),
+            "expected_grade": _opt(self.expected_grade, float),
+            "p_psa10": _opt(self.p_psa10, float),
+            "confidence": _opt(self.confidence, float),
+            "centering": _opt(self.centering, lambda c: {
+                "lr_ratio": float(c.lr_ratio),
+                "tb_ratio": float(c.tb_ratio),
+                "psa_max": int(c.psa_max),
+                "score": float(c.score),
+                "details": c.details,
+            }),
             "defects": {
-                "corners": {"severity": float(self.defects.corners_severity)},
-                "edges": {"severity": float(self.defects.edges_severity)},
-                "surface": {"severity": float(self.defects.surface_severity)},
+                "corners": _opt(self.defects.corners_severity, lambda s: {"severity": float(s)}),
+                "edges": _opt(self.defects.edges_severity, lambda s: {"severity": float(s)}),
+                "surface": _opt(self.defects.surface_severity, lambda s: {"severity": float(s)}),
                 "details": self.defects.details,
             },
-            "photo_quality": {
-                "blur": float(self.photo_quality.blur),
-                "glare": float(self.photo_quality.glare),
-                "occlusion": float(self.photo_quality.occlusion),
-                "usable": bool(self.photo_quality.usable),
-                "reasons": list(self.photo_quality.reasons),
-            },
+            "photo_quality": _opt(self.photo_quality, lambda pq: {
+                "blur": float(pq.blur),
+                "glare": float(pq.glare),
+                "occlusion": float(pq.occlusion),
+                "usable": bool(pq.usable),
+                "reasons": list(pq.reasons),
+            }),
             "explanations": self.explanations,
             "trace": self.trace,
+            "skipped": list(self.skipped),
         }
+
+
+def _opt(value: Any, convert: Callable[[Any], Any]) -> Any:
+    return None if value is None else convert(value)
@@ -0,0 +1,227 @@
+"""Visual card type / Trainer subtype classification from the header band.
+
+Goal: decide pokemon / trainer / energy (and the Trainer subtype) from the
+layout and colors of the warped card, so header OCR and the full-card
+subtype OCR only run when this classifier is unsure.
+
+The model is optional:
+- If best.onnx and labels.json are bundled in assets/models/header_band,
+  the band is classified by that model (onnxruntime is imported only then).
+- Without them, or if the model fails to load or run, the layout heuristic
+  in _predict_heuristic decides. It reports "unknown" rather than guess, so
+  OCR still settles ambiguous cards.
+- Either path is deterministic: the same card gives the same prediction.
+
+Model contract (ONNX):
+- input:  float32 [1,3,H,W] RGB in [0,1]: the top HEADER_BAND_RATIO of the
+          warped card, resized to labels.json "input_size" [H, W]
+- output: logits [1,C]
+- class order in adjacent labels.json "classes": "pokemon", "energy",
+  "trainer" or "trainer:<subtype>"
+"""
+
+from __future__ import annotations
+
+import json
+from dataclasses import dataclass
+from functools import lru_cache
+from pathlib import Path
+from typing import Any, Optional
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError as e:
+    raise ImportError(
+        "opencv-python is required for header band classification. "
+        "Install with: pip install opencv-python>=4.9.0"
+    ) from e
+
+from services.card_identity_energy import find_energy_symbol
+
+
+# Below this confidence the caller falls back to OCR.
+HEADER_CONFIDENCE_MIN = 0.75
+
+HEADER_BAND_RATIO = 0.14
+
+# Analysis width for the heuristic; header features are large.
+_WORK_WIDTH = 320
+
+# Trainer subtype badge colors (OpenCV hue, 0..180).
+_BADGE_HUES: tuple[tuple[int, int, str], ...] = (
+    (8, 24, "supporter"),  # orange
+    (38, 86, "stadium"),  # green
+    (95, 125, "item"),  # blue
+    (125, 160, "pokemon_tool"),  # purple
+)
+
+# Saturated pixels within this hue distance of the card frame are frame, not badge.
+_FRAME_HUE_TOLERANCE = 8
+
+_ASSETS_DIR = Path(__file__).resolve().parent.parent / "assets" / "models" / "header_band"
+_DEFAULT_MODEL_PATH = _ASSETS_DIR / "best.onnx"
+_DEFAULT_LABELS_PATH = _ASSETS_DIR / "labels.json"
+
+
+@dataclass(frozen=True)
+class HeaderPrediction:
+    card_type: str  # "pokemon", "trainer", "energy" or "unknown"
+    trainer_subtype: Optional[str]
+    confidence: float  # 0..1
+    method: str
+    features: tuple[str, ...] = ()  # layout cues the heuristic found
+
+    @property
+    def confident(self) -> bool:
+        return self.card_type != "unknown" and self.confidence >= HEADER_CONFIDENCE_MIN
+
+    def to_trace(self) -> dict[str, Any]:
+        return {
+            "card_type": self.card_type,
+            "trainer_subtype": self.trainer_subtype,
+            "confidence": round(self.confidence, 3),
+            "method": self.method,
+            "features": list(self.features),
+        }
+
+
+def classify_header_band(rgb: np.ndarray, model_path: Optional[str] = None) -> HeaderPrediction:
+    """Classify a warped card (HxWx3 RGB) by its header band.
+
+    If an ONNX model is bundled, uses it. Otherwise uses a conservative heuristic.
+    """
+    model_p = Path(model_path) if model_path else _DEFAULT_MODEL_PATH
+    if model_p.exists() and _DEFAULT_LABELS_PATH.exists():
+        try:
+            return _predict_onnx(rgb, model_p, _DEFAULT_LABELS_PATH)
+        except Exception:
+            return _predict_heuristic(rgb)
+    return _predict_heuristic(rgb)
+
+
+@lru_cache(maxsize=2)
+def _onnx_session(model_path: str) -> Any:
+    import onnxruntime as ort
+
+    return ort.InferenceSession(model_path, providers=["CPUExecutionProvider"])
+
+
+def _predict_onnx(rgb: np.ndarray, model_p: Path, labels_p: Path) -> HeaderPrediction:
+    meta = json.loads(labels_p.read_text())
+    labels = meta["classes"]
+    in_h, in_w = meta.get("input_size", [64, 448])
+
+    band = rgb[: max(1, int(rgb.shape[0] * HEADER_BAND_RATIO))]
+    x = cv2.resize(band, (in_w, in_h), interpolation=cv2.INTER_AREA).astype(np.float32) / 255.0
+    x = np.transpose(x, (2, 0, 1))[None]
+
+    sess = _onnx_session(model_p.as_posix())
+    logits = np.asarray(sess.run(None, {sess.get_inputs()[0].name: x})[0], dtype=np.float32)[0]
+    probs = np.exp(logits - logits.max())
+    probs /= probs.sum()
+    idx = int(np.argmax(probs))
+
+    card_type, _, subtype = labels[idx].partition(":")
+    return HeaderPrediction(
+        card_type=card_type,
+        trainer_subtype=subtype or None,
+        confidence=float(probs[idx]),
+        method="onnx",
+    )
+
+
+def _predict_heuristic(rgb: np.ndarray) -> HeaderPrediction:
+    """Layout cues of the three card types.
+
+    - Pokémon: an energy-type symbol (small disc) in the top-right corner,
+      next to the HP.
+    - Trainer: a compact, saturated subtype badge in the header band whose
+      color gives the subtype (Item blue, Supporter orange, ...).
+    - Basic Energy: no header cues, one large symbol centered on the card.
+
+    Only one cue may be present; anything else is "unknown" so OCR decides.
+    """
+    h, w = rgb.shape[:2]
+    scale = min(1.0, _WORK_WIDTH / float(w))
+    small = cv2.resize(rgb, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA)
+    band = small[: max(1, int(small.shape[0] * HEADER_BAND_RATIO))]
+
+    has_type_symbol = _has_type_symbol(band)
+    badge = _subtype_badge(band)
+    features = tuple(
+        name for name, present in (("type_symbol", has_type_symbol), ("subtype_badge", badge is not None)) if present
+    )
+
+    if has_type_symbol and badge is None:
+        return HeaderPrediction("pokemon", None, 0.8, "heuristic", features)
+    if badge is not None and not has_type_symbol:
+        subtype = badge or None
+        return HeaderPrediction("trainer", subtype, 0.8 if subtype else 0.6, "heuristic", features)
+    if not features and find_energy_symbol(rgb) is not None:
+        return HeaderPrediction("energy", None, 0.8, "heuristic", ("energy_symbol",))
+    return HeaderPrediction("unknown", None, 0.0, "heuristic", features)
+
+
+def _has_type_symbol(band: np.ndarray) -> bool:
+    """A small disc in the top-right corner of the header band."""
+    bh, bw = band.shape[:2]
+    corner = band[:, int(bw * 0.78):]
+    gray = cv2.GaussianBlur(cv2.cvtColor(corner, cv2.COLOR_RGB2GRAY), (3, 3), 0)
+    circles = cv2.HoughCircles(
+        gray,
+        cv2.HOUGH_GRADIENT,
+        dp=1.0,
+        minDist=bw,
+        param1=100,
+        param2=18,
+        minRadius=max(2, int(bw * 0.022)),
+        maxRadius=int(bw * 0.06),
+    )
+    if circles is None:
+        return False
+    cx, cy, r = circles[0][0]
+    # The symbol sits fully inside the band, in its vertical middle.
+    return r <= cy <= bh - r and abs(cy - bh / 2.0) <= bh * 0.25
+
+
+def _subtype_badge(band: np.ndarray) -> Optional[str]:
+    """Subtype of the header's badge ("" if its color is not a known subtype), or None without a badge."""
+    hsv = cv2.cvtColor(band, cv2.COLOR_RGB2HSV)
+    hue = hsv[:, :, 0].astype(np.int16)
+    saturated = (hsv[:, :, 1] > 120) & (hsv[:, :, 2] > 90)
+    # A saturated frame (the usual yellow border) surrounds the badge and
+    # would merge with it: keep only pixels whose hue differs from the frame.
+    frame_hue = _frame_hue(hsv)
+    if frame_hue is not None:
+        distance = np.abs(hue - frame_hue)
+        saturated &= np.minimum(distance, 180 - distance) > _FRAME_HUE_TOLERANCE
+    n, labels, stats, _ = cv2.connectedComponentsWithStats(saturated.astype(np.uint8), connectivity=8)
+    if n <= 1:
+        return None
+
+    # The largest component with a badge's shape: a filled, wide rectangle.
+    band_area = float(band.shape[0] * band.shape[1])
+    bw, bh, area = stats[1:, cv2.CC_STAT_WIDTH], stats[1:, cv2.CC_STAT_HEIGHT], stats[1:, cv2.CC_STAT_AREA]
+    shaped = (area >= 0.01 * band_area) & (area <= 0.25 * band_area) & (area >= 0.8 * bw * bh) & (bw >= 1.8 * bh)
+    if not shaped.any():
+        return None
+    best = 1 + int(np.argmax(np.where(shaped, area, -1)))
+    hue = float(np.median(hsv[:, :, 0][labels == best]))
+    for lo, hi, subtype in _BADGE_HUES:
+        if lo <= hue < hi:
+            return subtype
+    return ""
+
+
+def _frame_hue(hsv: np.ndarray) -> Optional[int]:
+    """Hue of the card frame along the band's left/right/top edges, or None if it is not saturated."""
+    bh, bw = hsv.shape[:2]
+    edge = max(1, int(bw * 0.03))
+    ring = np.concatenate(
+        [hsv[:, :edge].reshape(-1, 3), hsv[:, -edge:].reshape(-1, 3), hsv[: max(1, bh // 10)].reshape(-1, 3)]
+    )
+    if np.median(ring[:, 1]) <= 120:
+        return None
+    return int(np.median(ring[:, 0]))
@@ -0,0 +1,57 @@
+"""PIL / numpy boundary helpers.
+
+Internally the pipeline carries contiguous HxWx3 uint8 RGB arrays between the
+warp, identity heuristics and grading detectors. PIL images only appear at
+the edges: decoding, OCR (pytesseract) and overlay rendering.
+
+Public entry points accept either type (ImageLike) and normalize through
+as_rgb_array, which is a no-op for arrays that are already in the internal
+layout, so passing arrays along never costs a full-frame copy.
+"""
+
+from __future__ import annotations
+
+from typing import Union
+
+import numpy as np
+from PIL import Image
+
+
+ImageLike = Union[Image.Image, np.ndarray]
+
+
+def as_rgb_array(image: ImageLike) -> np.ndarray:
+    """Return a C-contiguous HxWx3 uint8 RGB view of image.
+
+    Arrays already in that layout are returned as-is (no copy). Grayscale
+    arrays are broadcast to three channels and an alpha channel is dropped,
+    mirroring PIL's convert("RGB").
+    """
+    if isinstance(image, Image.Image):
+        rgb = image if image.mode == "RGB" else image.convert("RGB")
+        return np.asarray(rgb)
+
+    arr = image
+    if arr.dtype != np.uint8:
+        raise ValueError(f"expected uint8 image array, got {arr.dtype}")
+    if arr.ndim == 2:
+        arr = np.stack([arr, arr, arr], axis=-1)
+    elif arr.ndim == 3 and arr.shape[2] == 4:
+        arr = arr[:, :, :3]
+    elif arr.ndim != 3 or arr.shape[2] != 3:
+        raise ValueError(f"expected HxW, HxWx3 or HxWx4 image array, got shape {arr.shape}")
+    return np.ascontiguousarray(arr)
+
+
+def as_pil(image: ImageLike) -> Image.Image:
+    """Return image as an RGB PIL image (for OCR and overlay boundaries)."""
+    if isinstance(image, Image.Image):
+        return image if image.mode == "RGB" else image.convert("RGB")
+    return Image.fromarray(as_rgb_array(image))
+
+
+def image_size(image: ImageLike) -> tuple[int, int]:
+    """(width, height) of either a PIL image or an HxW[xC] array."""
+    if isinstance(image, Image.Image):
+        return image.size
+    return int(image.shape[1]), int(image.shape[0])
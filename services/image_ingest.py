@@ -0,0 +1,122 @@
+"""Image ingestion: turn uploaded bytes into a working RGB image, once.
+
+Every request path (analyze, grade, identity from bytes) goes through
+ingest_image_bytes so that:
+  - bytes are decoded exactly once
+  - oversized uploads are rejected from the header, before any pixel decode
+  - large JPEGs are decoded at reduced size via the JPEG decoder's draft mode
+    (DCT scaling), which is much cheaper than a full decode + resize
+  - EXIF orientation is applied, so phone photos arrive upright
+  - the trace hash is derived from the encoded bytes, not the decoded pixels
+
+The working resolution only needs to be large enough for the warp to produce
+a sharp 744x1040 canonical card; a 12 MP phone photo decoded at full size is
+mostly wasted CPU and memory.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+from dataclasses import dataclass
+from typing import Optional
+
+from PIL import Image, ImageOps
+
+
+# Reject uploads whose header declares more pixels than this (~50 MP).
+MAX_SOURCE_PIXELS = 50_000_000
+
+# Target long side of the decoded working image. Draft decoding only reduces
+# by powers of two and never below the requested size, so the result lands
+# between this value and twice it.
+WORKING_MAX_SIDE = 1600
+
+# working_max_side for photos holding several cards (binder pages): each card
+# is only a fraction of the photo, so it keeps the native pixels.
+FULL_RESOLUTION = 0
+
+# Only use draft decoding when native resolution is at least this many times
+# the working size; below that a full decode is already cheap enough.
+DRAFT_MIN_REDUCTION = 2
+
+
+class ImageTooLargeError(ValueError):
+    """Raised when an upload exceeds the configured pixel cap."""
+
+
+@dataclass(frozen=True)
+class IngestedImage:
+    image: Image.Image  # RGB, EXIF-upright, possibly draft-reduced
+    content_hash: str  # sha256 hex of the encoded bytes
+    source_format: str
+    source_size: tuple[int, int]  # (w, h) as declared by the file header
+    draft_scale: int  # 1 = full decode, 2/4/8 = JPEG DCT scaling
+    exif_transposed: bool
+
+    def trace(self) -> dict:
+        return {
+            "content_hash": self.content_hash[:16],
+            "source_format": self.source_format,
+            "source_size": list(self.source_size),
+            "decoded_size": list(self.image.size),
+            "draft_scale": self.draft_scale,
+            "exif_transposed": self.exif_transposed,
+        }
+
+
+def ingest_image_bytes(
+    image_bytes: bytes,
+    working_max_side: int = WORKING_MAX_SIDE,
+    max_pixels: int = MAX_SOURCE_PIXELS,
+) -> IngestedImage:
+    """Decode image bytes (JPEG, PNG, ...) into an upright RGB working image.
+
+    working_max_side: target long side of the draft decode; FULL_RESOLUTION
+    (0) decodes at native size.
+
+    Raises ImageTooLargeError if the header declares more than max_pixels,
+    and the underlying PIL error for undecodable payloads.
+    """
+    content_hash = hashlib.sha256(image_bytes).hexdigest()
+
+    img = Image.open(io.BytesIO(image_bytes))
+    source_format = img.format or "unknown"
+    src_w, src_h = img.size
+    if src_w * src_h > max_pixels:
+        raise ImageTooLargeError(
+            f"Image is {src_w}x{src_h} ({src_w * src_h} pixels); limit is {max_pixels} pixels."
+        )
+
+    draft_scale = 1
+    long_side = max(src_w, src_h)
+    if source_format == "JPEG" and working_max_side > 0 and long_side >= working_max_side * DRAFT_MIN_REDUCTION:
+        ratio = working_max_side / float(long_side)
+        requested = (max(1, int(round(src_w * ratio))), max(1, int(round(src_h * ratio))))
+        img.draft("RGB", requested)
+        draft_scale = max(1, src_w // img.size[0])
+
+    img.load()
+
+    # exif_transpose copies even when there is nothing to do; only call it
+    # when the orientation tag actually asks for a rotation/flip.
+    exif_transposed = _orientation_tag(img) in range(2, 9)
+    upright = ImageOps.exif_transpose(img) if exif_transposed else img
+
+    rgb = upright.convert("RGB") if upright.mode != "RGB" else upright
+
+    return IngestedImage(
+        image=rgb,
+        content_hash=content_hash,
+        source_format=source_format,
+        source_size=(src_w, src_h),
+        draft_scale=draft_scale,
+        exif_transposed=exif_transposed,
+    )
+
+
+def _orientation_tag(img: Image.Image) -> Optional[int]:
+    try:
+        return img.getexif().get(0x0112)
+    except Exception:
+        return None
@@ -0,0 +1,121 @@
+"""Per-role Tesseract model and dictionary selection.
+
+Every OCR call belongs to one role:
+  - "name":   name bands and the Trainer/Energy/full-card name fallbacks
+  - "number": collector-number crops
+  - "text":   header and full-card text read for card type / Trainer subtype
+
+Each role can use its own traineddata, loaded from a local directory:
+  - PREGRADE_TESSDATA_DIR: directory with *.traineddata (unset = tesseract's
+    own tessdata); e.g. tessdata_fast models for speed, tessdata_best for
+    accuracy
+  - PREGRADE_OCR_MODEL_NAME / _NUMBER / _TEXT: model per role (default "eng");
+    e.g. a digits-only model for "number"
+
+Lexical priors are generated, not shipped: the "name" role gets a
+--user-words file built from the services.pokemon_names lexicons, the
+"number" role a --user-patterns file of collector-number shapes. Files are
+written once, content-addressed, to PREGRADE_OCR_DICT_DIR (default: a
+pregrade-ocr directory in the system temp dir). PREGRADE_OCR_DICTIONARIES=0
+turns them off.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import shlex
+import tempfile
+from functools import lru_cache
+from typing import Optional
+
+from services.pokemon_names import (
+    get_all_pokemon_names,
+    get_energy_card_names,
+    get_mechanic_suffixes,
+    get_owner_prefixes,
+    get_trainer_card_names,
+    get_variant_prefixes,
+)
+
+
+ROLES = ("name", "number", "text")
+DEFAULT_MODEL = "eng"
+
+# Collector numbers: 1-3 digits over 2-3 digits ("4/102", "025/198").
+_NUMBER_PATTERNS = tuple(
+    "\\d" * num + "/" + "\\d" * total for num in (1, 2, 3) for total in (2, 3)
+)
+
+
+def tesseract_args(role: str, config: str) -> dict[str, str]:
+    """lang/config keyword arguments for pytesseract.image_to_string in one OCR role."""
+    if role not in ROLES:
+        raise ValueError(f"Unknown OCR role: {role}")
+    lang, extra = _role_args(
+        role,
+        os.environ.get(f"PREGRADE_OCR_MODEL_{role.upper()}", "").strip() or DEFAULT_MODEL,
+        os.environ.get("PREGRADE_TESSDATA_DIR", "").strip() or None,
+        _dictionaries_enabled() and _dict_dir() or None,
+    )
+    return {"lang": lang, "config": f"{config} {extra}".strip()}
+
+
+def _dictionaries_enabled() -> bool:
+    return os.environ.get("PREGRADE_OCR_DICTIONARIES", "").strip().lower() not in {"0", "false", "no"}
+
+
+def _dict_dir() -> str:
+    return os.environ.get("PREGRADE_OCR_DICT_DIR", "").strip() or os.path.join(tempfile.gettempdir(), "pregrade-ocr")
+
+
+@lru_cache(maxsize=16)
+def _role_args(role: str, model: str, tessdata_dir: Optional[str], dict_dir: Optional[str]) -> tuple[str, str]:
+    extra: list[str] = []
+    if tessdata_dir:
+        extra.append(f"--tessdata-dir {shlex.quote(tessdata_dir)}")
+    if dict_dir and role == "name":
+        path = _write_dictionary(dict_dir, "words", name_words())
+        if path:
+            extra.append(f"--user-words {shlex.quote(path)}")
+    if dict_dir and role == "number":
+        path = _write_dictionary(dict_dir, "patterns", _NUMBER_PATTERNS)
+        if path:
+            extra.append(f"--user-patterns {shlex.quote(path)}")
+    return model, " ".join(extra)
+
+
+def name_words() -> tuple[str, ...]:
+    """Words of every known card name, as printed (Title case) and as OCR'd (lower case)."""
+    names = (
+        get_all_pokemon_names()
+        | get_trainer_card_names()
+        | get_energy_card_names()
+        | get_owner_prefixes()
+        | get_variant_prefixes()
+        | get_mechanic_suffixes()
+    )
+    words: set[str] = set()
+    for name in names:
+        for word in name.split():
+            if len(word) >= 2:
+                words.update((word, word.capitalize()))
+    return tuple(sorted(words))
+
+
+def _write_dictionary(dict_dir: str, kind: str, lines: tuple[str, ...]) -> Optional[str]:
+    """Write lines to a content-addressed file in dict_dir; None if it can't be written."""
+    body = "\n".join(lines) + "\n"
+    digest = hashlib.sha256(body.encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(dict_dir, f"pregrade.user-{kind}.{digest}")
+    if os.path.exists(path):
+        return path
+    try:
+        os.makedirs(dict_dir, exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(body)
+        os.replace(tmp, path)
+    except OSError:
+        return None
+    return path
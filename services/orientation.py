@@ -0,0 +1,201 @@
+"""Cheap orientation normalization for warped cards.
+
+The warp maps the detected quad onto a portrait 744x1040 frame, which assumes
+the card was photographed upright. When it was not, every OCR region reads
+the wrong pixels. This module fixes the two common failure modes before
+identity runs:
+
+  - sideways (90/270): a portrait card photographed in landscape produces a
+    landscape quad that the warp squashes into portrait. We re-warp with the
+    quad corners rolled by one so the card keeps its real proportions.
+  - upside down (180): detected from layout, then rotated.
+
+Up/down uses layout cues on a downscaled gray image rather than OCR: text
+closes into horizontal line blobs, and on every Pokemon card layout the text
+block (attacks, rules, number band) sits in the lower half while the upper
+half is artwork. When the cues are weak (e.g. basic energy, card backs) the
+warp is left untouched.
+"""
+
+from __future__ import annotations
+
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError as e:
+    raise ImportError(
+        "opencv-python is required for orientation detection. "
+        "Install with: pip install opencv-python>=4.9.0"
+    ) from e
+
+from services.card_warp import order_corners, warp_card_array
+
+
+# Cues are computed at this fraction of canonical resolution (~248x347).
+_ANALYSIS_SCALE = 1.0 / 3.0
+
+# A warped quad whose width/height exceeds this was photographed sideways
+# (a real card is ~0.716 portrait).
+_SIDEWAYS_QUAD_RATIO = 1.15
+
+# Text-line blobs (after horizontal closing) at analysis scale.
+_LINE_MIN_H = 2
+_LINE_MAX_H = 16
+_LINE_MIN_ELONGATION = 3.0
+
+# Up/down decision: need enough text lines and a clear vertical skew.
+_MIN_TEXT_LINES = 6
+_INVERTED_CENTROID_MAX = 0.42  # text centroid (0=top, 1=bottom) below this => upside down
+_UPRIGHT_CENTROID_MIN = 0.58
+
+
+@dataclass(frozen=True)
+class OrientationDecision:
+    orientation: str  # "upright" | "rotated_180" | "rotated_90_cw" | "rotated_90_ccw" | "unknown"
+    corrected: bool  # True if the returned warp differs from the input warp
+    confidence: float
+    reason: str
+    cost_ms: float
+    cues: dict[str, Any] = field(default_factory=dict)
+
+    def to_trace(self) -> dict[str, Any]:
+        return {
+            "orientation": self.orientation,
+            "corrected": self.corrected,
+            "confidence": round(self.confidence, 3),
+            "reason": self.reason,
+            "cost_ms": round(self.cost_ms, 2),
+            "cues": self.cues,
+        }
+
+
+def orientation_enabled() -> bool:
+    return os.environ.get("PREGRADE_DISABLE_ORIENTATION", "").strip().lower() not in {"1", "true", "yes"}
+
+
+def layout_cues(rgb: np.ndarray) -> dict[str, Any]:
+    """Text-line layout cues on a warped card (HxWx3 RGB).
+
+    Returns counts/areas of horizontal and vertical line-like blobs and the
+    mean vertical position (0=top, 1=bottom) of the horizontal ones. The mean
+    is per blob, not area-weighted, so the large name header does not
+    outweigh many small lines of attack/rules text.
+    """
+    h, w = rgb.shape[:2]
+    small = cv2.resize(
+        rgb,
+        (max(1, int(round(w * _ANALYSIS_SCALE))), max(1, int(round(h * _ANALYSIS_SCALE)))),
+        interpolation=cv2.INTER_AREA,
+    )
+    gray = cv2.cvtColor(small, cv2.COLOR_RGB2GRAY)
+    grad = cv2.morphologyEx(gray, cv2.MORPH_GRADIENT, np.ones((3, 3), np.uint8))
+    _, binary = cv2.threshold(grad, 0, 255, cv2.THRESH_BINARY | cv2.THRESH_OTSU)
+
+    h_count, h_area, h_centroid = _line_blobs(binary, horizontal=True)
+    v_count, v_area, _ = _line_blobs(binary, horizontal=False)
+
+    return {
+        "h_lines": h_count,
+        "v_lines": v_count,
+        "h_area": h_area,
+        "v_area": v_area,
+        "text_centroid_y": round(h_centroid, 4) if h_centroid is not None else None,
+    }
+
+
+def _line_blobs(binary: np.ndarray, horizontal: bool) -> tuple[int, int, Optional[float]]:
+    kernel = np.ones((1, 7), np.uint8) if horizontal else np.ones((7, 1), np.uint8)
+    closed = cv2.morphologyEx(binary, cv2.MORPH_CLOSE, kernel)
+    n, _labels, stats, centroids = cv2.connectedComponentsWithStats(closed, connectivity=8)
+    if n <= 1:
+        return 0, 0, None
+
+    bw = stats[1:, cv2.CC_STAT_WIDTH].astype(np.float64)
+    bh = stats[1:, cv2.CC_STAT_HEIGHT].astype(np.float64)
+    area = stats[1:, cv2.CC_STAT_AREA].astype(np.float64)
+    if horizontal:
+        thin, long = bh, bw
+    else:
+        thin, long = bw, bh
+    mask = (thin >= _LINE_MIN_H) & (thin <= _LINE_MAX_H) & (long >= _LINE_MIN_ELONGATION * thin)
+    count = int(mask.sum())
+    if count == 0:
+        return 0, 0, None
+
+    cy = centroids[1:, 1][mask] / float(binary.shape[0])
+    return count, int(area[mask].sum()), float(cy.mean())
+
+
+def _quad_ratio(quad: np.ndarray) -> float:
+    tl, tr, br, bl = order_corners(quad)
+    width = (np.linalg.norm(tr - tl) + np.linalg.norm(br - bl)) / 2.0
+    height = (np.linalg.norm(bl - tl) + np.linalg.norm(br - tr)) / 2.0
+    return float(width / height) if height > 0 else 0.0
+
+
+def normalize_orientation(
+    source_rgb: np.ndarray,
+    warped_rgb: np.ndarray,
+    quad: Optional[np.ndarray],
+) -> tuple[np.ndarray, OrientationDecision]:
+    """Return an upright warp of the card plus the decision taken.
+
+    source_rgb/quad are only used to re-warp sideways cards; warped_rgb is the
+    output of the default warp. The input warp is returned unchanged when the
+    card already looks upright or the cues are inconclusive.
+    """
+    t0 = time.perf_counter()
+    out_h, out_w = warped_rgb.shape[:2]
+    candidate = warped_rgb
+    orientation = "upright"
+    reason = "layout_upright"
+    cues: dict[str, Any] = {}
+
+    # 1) Sideways: geometric cue from the quad, confirmed by text direction.
+    if quad is not None:
+        ratio = _quad_ratio(quad)
+        cues["quad_ratio"] = round(ratio, 4)
+        if ratio > _SIDEWAYS_QUAD_RATIO:
+            squashed = layout_cues(warped_rgb)
+            cues["squashed"] = squashed
+            if squashed["h_area"] <= squashed["v_area"] or squashed["h_lines"] < _MIN_TEXT_LINES:
+                # Assume the card's top points right (90 CW in the photo);
+                # the up/down check below flips it if it was the other way.
+                rolled = np.roll(order_corners(quad), -1, axis=0)
+                candidate = warp_card_array(source_rgb, rolled, out_w, out_h, reorder=False)
+                orientation = "rotated_90_cw"
+                reason = "landscape_quad"
+
+    # 2) Up/down on the (possibly re-warped) candidate.
+    layout = layout_cues(candidate)
+    cues["layout"] = layout
+    centroid = layout["text_centroid_y"]
+    confidence = 0.0
+    if layout["h_lines"] < _MIN_TEXT_LINES or centroid is None:
+        if orientation == "upright":
+            orientation, reason = "unknown", "too_few_text_lines"
+    elif centroid < _INVERTED_CENTROID_MAX:
+        candidate = np.ascontiguousarray(candidate[::-1, ::-1])
+        orientation = "rotated_90_ccw" if orientation == "rotated_90_cw" else "rotated_180"
+        reason = f"{reason}+text_above_art" if reason == "landscape_quad" else "text_above_art"
+        confidence = min(1.0, (_INVERTED_CENTROID_MAX - centroid) / 0.15 + 0.5)
+    elif centroid >= _UPRIGHT_CENTROID_MIN:
+        confidence = min(1.0, (centroid - _UPRIGHT_CENTROID_MIN) / 0.15 + 0.5)
+    elif orientation == "upright":
+        orientation, reason = "unknown", "ambiguous_layout"
+
+    decision = OrientationDecision(
+        orientation=orientation,
+        corrected=candidate is not warped_rgb,
+        confidence=confidence,
+        reason=reason,
+        cost_ms=(time.perf_counter() - t0) * 1000.0,
+        cues=cues,
+    )
+    return candidate, decision
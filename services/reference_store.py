@@ -0,0 +1,50 @@
+"""Local store of reference front scans, keyed by printing.
+
+When identity resolves to a specific printing (enrichment fills
+details["set_id"] / details["local_id"]), front centering can be measured by
+registering the canonical front against a centered scan of that printing
+instead of re-detecting borders (see services/grading/registration.py).
+
+Layout under PREGRADE_REFERENCE_DIR (default data/reference/fronts):
+
+  <set_id>/<local_id>.png   grayscale canonical scan (744x1040), centered
+  <set_id>/<local_id>.json  {"borders": {...}, "art_rect": [x, y, w, h]}
+
+The store is read-only and optional: a missing directory or printing just
+means no reference.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+from services.grading.registration import ReferenceImage, load_reference_image
+
+
+_DEFAULT_REFERENCE_DIR = "data/reference/fronts"
+
+# Set/local ids become path components: keep them to a safe alphabet.
+_KEY_RE = re.compile(r"^[A-Za-z0-9][A-Za-z0-9._-]{0,63}$")
+
+
+def reference_dir() -> Path:
+    return Path(os.environ.get("PREGRADE_REFERENCE_DIR", "").strip() or _DEFAULT_REFERENCE_DIR)
+
+
+def valid_reference_key(set_id: object, local_id: object) -> bool:
+    return (
+        isinstance(set_id, str)
+        and isinstance(local_id, str)
+        and bool(_KEY_RE.match(set_id))
+        and bool(_KEY_RE.match(local_id))
+    )
+
+
+def load_card_reference(set_id: str, local_id: str) -> Optional[ReferenceImage]:
+    """Reference front scan for a printing, or None if the store has none."""
+    if not valid_reference_key(set_id, local_id):
+        return None
+    return load_reference_image(str(reference_dir() / set_id / f"{local_id}.png"))
@@ -0,0 +1,232 @@
+"""Per-image cache of pipeline stage outputs.
+
+Partners resubmit the same photos: /v1/analyze then /v1/grade with the same
+front, or /v1/grade again with only the back re-shot. Stage outputs that
+depend on one image (canonical warp, detector results, identity) are cached
+under the image's content hash, so each side of a request reuses whatever was
+already computed for it.
+
+Entries are keyed by (image key, stage), namespaced by PIPELINE_VERSION and
+the environment switches that change stage outputs; bump PIPELINE_VERSION
+whenever a stage's output changes for the same input.
+
+Two tiers, both LRU and bounded in bytes:
+  - memory: PREGRADE_STAGE_CACHE_MAX_BYTES (default 128 MiB, 0 disables),
+            sized by an estimate (array and image buffers, strings, a small
+            constant per other object); values are not serialized
+  - disk:   PREGRADE_STAGE_CACHE_DIR (unset = no disk tier), bounded by
+            PREGRADE_STAGE_CACHE_DISK_MAX_BYTES (default 1 GiB), sized by
+            the pickled entry; values are pickled only for this tier
+
+The memory tier hands out the stored object itself, to every later request:
+cached values (frozen results, their details dicts, canonical images) must
+not be mutated.
+
+get_or_compute reports where a value came from ("memory", "disk" or
+"computed") so callers can put cache provenance in their traces.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Callable, Optional
+
+import numpy as np
+from PIL import Image
+
+
+PIPELINE_VERSION = "6"
+
+# Environment switches that change stage outputs for the same image.
+_PIPELINE_ENV = (
+    "PREGRADE_DISABLE_ORIENTATION",
+    "PREGRADE_SKIP_OCR",
+    "PREGRADE_ENABLE_ENRICHMENT",
+    "PREGRADE_TESSDATA_DIR",
+    "PREGRADE_OCR_MODEL_NAME",
+    "PREGRADE_OCR_MODEL_NUMBER",
+    "PREGRADE_OCR_MODEL_TEXT",
+    "PREGRADE_OCR_DICTIONARIES",
+)
+
+DEFAULT_MEMORY_MAX_BYTES = 128 * 1024 * 1024
+DEFAULT_DISK_MAX_BYTES = 1024 * 1024 * 1024
+
+# Size charged for a scalar or other small object in estimate_size.
+_OBJECT_BYTES = 64
+
+
+def image_key(content_hash: Optional[str], scale: float = 1.0) -> Optional[str]:
+    """Cache key for one image at a canonical scale (None: do not cache)."""
+    return None if not content_hash else f"{content_hash}@{scale}"
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate memory held by a cached value, without serializing it."""
+    seen: set[int] = set()
+    total = 0
+    stack = [value]
+    while stack:
+        item = stack.pop()
+        if id(item) in seen:
+            continue
+        seen.add(id(item))
+        if isinstance(item, np.ndarray):
+            total += item.nbytes
+        elif isinstance(item, Image.Image):
+            total += item.width * item.height * len(item.getbands())
+        elif isinstance(item, (bytes, bytearray, str)):
+            total += len(item)
+        elif isinstance(item, dict):
+            total += _OBJECT_BYTES
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset)):
+            total += _OBJECT_BYTES
+            stack.extend(item)
+        elif dataclasses.is_dataclass(item) and not isinstance(item, type):
+            total += _OBJECT_BYTES
+            stack.extend(getattr(item, f.name) for f in dataclasses.fields(item))
+        else:
+            total += _OBJECT_BYTES
+    return total
+
+
+def pipeline_namespace() -> str:
+    env = ";".join(f"{name}={os.environ.get(name, '').strip()}" for name in _PIPELINE_ENV)
+    return hashlib.sha256(f"{PIPELINE_VERSION}|{env}".encode("utf-8")).hexdigest()[:16]
+
+
+class StageCache:
+    """Two-tier (memory, optional disk) LRU of stage outputs. Thread-safe."""
+
+    def __init__(self, max_bytes: int, disk_dir: Optional[str] = None, disk_max_bytes: int = DEFAULT_DISK_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.disk_dir = disk_dir
+        self.disk_max_bytes = disk_max_bytes
+        self._entries: "OrderedDict[tuple[str, str, str], tuple[Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str, stage: str) -> tuple[Optional[str], Any]:
+        """(source, value) with source "memory" or "disk"; (None, None) on a miss."""
+        entry = (pipeline_namespace(), key, stage)
+        with self._lock:
+            hit = self._entries.get(entry)
+            if hit is not None:
+                self._entries.move_to_end(entry)
+                return "memory", hit[0]
+        blob = self._disk_read(entry)
+        if blob is None:
+            return None, None
+        try:
+            value = pickle.loads(blob)
+        except Exception:
+            return None, None
+        self._remember(entry, value, estimate_size(value))
+        return "disk", value
+
+    def put(self, key: str, stage: str, value: Any) -> None:
+        """Store value (not copied: it must not be mutated afterwards)."""
+        entry = (pipeline_namespace(), key, stage)
+        self._remember(entry, value, estimate_size(value))
+        if self.disk_dir:
+            self._disk_write(entry, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def get_or_compute(self, key: Optional[str], stage: str, compute: Callable[[], Any]) -> tuple[Any, str]:
+        """(value, source). With key None the value is computed and not cached."""
+        if key is not None:
+            source, value = self.get(key, stage)
+            if source is not None:
+                return value, source
+        value = compute()
+        if key is not None:
+            self.put(key, stage, value)
+        return value, "computed"
+
+    def _remember(self, entry: tuple[str, str, str], value: Any, size: int) -> None:
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(entry, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[entry] = (value, size)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def _disk_path(self, entry: tuple[str, str, str]) -> str:
+        name = hashlib.sha256("|".join(entry).encode("utf-8")).hexdigest()
+        return os.path.join(self.disk_dir or "", f"{name}.pkl")
+
+    def _disk_read(self, entry: tuple[str, str, str]) -> Optional[bytes]:
+        if not self.disk_dir:
+            return None
+        path = self._disk_path(entry)
+        try:
+            with open(path, "rb") as f:
+                blob = f.read()
+            os.utime(path)  # LRU: reads keep an entry from eviction
+            return blob
+        except OSError:
+            return None
+
+    def _disk_write(self, entry: tuple[str, str, str], blob: bytes) -> None:
+        if not self.disk_dir or len(blob) > self.disk_max_bytes:
+            return
+        try:
+            os.makedirs(self.disk_dir, exist_ok=True)
+            path = self._disk_path(entry)
+            tmp = f"{path}.{threading.get_ident()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(blob)
+            os.replace(tmp, path)
+            self._disk_evict()
+        except OSError:
+            pass
+
+    def _disk_evict(self) -> None:
+        entries = []
+        for item in os.scandir(self.disk_dir):
+            if item.is_file() and item.name.endswith(".pkl"):
+                st = item.stat()
+                entries.append((st.st_mtime, st.st_size, item.path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.disk_max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            total -= size
+
+
+def _env_bytes(name: str, default: int) -> int:
+    raw = os.environ.get(name, "").strip()
+    try:
+        return max(0, int(raw)) if raw else default
+    except ValueError:
+        return default
+
+
+def stage_cache() -> StageCache:
+    """The process-wide cache for the current PREGRADE_STAGE_CACHE_* settings."""
+    return _stage_cache(
+        _env_bytes("PREGRADE_STAGE_CACHE_MAX_BYTES", DEFAULT_MEMORY_MAX_BYTES),
+        os.environ.get("PREGRADE_STAGE_CACHE_DIR", "").strip() or None,
+        _env_bytes("PREGRADE_STAGE_CACHE_DISK_MAX_BYTES", DEFAULT_DISK_MAX_BYTES),
+    )
+
+
+@lru_cache(maxsize=4)
+def _stage_cache(max_bytes: int, disk_dir: Optional[str], disk_max_bytes: int) -> StageCache:
+    return StageCache(max_bytes, disk_dir, disk_max_bytes)
@@ -1,7 +1,27 @@
 import os
 import sys
 
+import cv2
+import numpy as np
+import pytest
+
 # Ensure repository root is on sys.path so tests can import "services", "domain", etc.
 REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 if REPO_ROOT not in sys.path:
     sys.path.insert(0, REPO_ROOT)
+
+
+def _card_photo(seed: int = 0, blur: float = 0.0) -> np.ndarray:
+    """RGB photo of a yellow-bordered card with textured art on a dark background."""
+    rng = np.random.default_rng(seed)
+    photo = np.full((1000, 800, 3), 30, dtype=np.uint8)
+    card = np.full((670, 480, 3), (230, 210, 90), dtype=np.uint8)
+    card[40:400, 40:440] = cv2.GaussianBlur(rng.integers(0, 255, (360, 400, 3), dtype=np.uint8), (9, 9), 0)
+    photo[165:835, 160:640] = card
+    return cv2.GaussianBlur(photo, (0, 0), blur) if blur else photo
+
+
+@pytest.fixture
+def card_photo():
+    """Factory for the shared synthetic card photo: card_photo(seed=0, blur=0.0)."""
+    return _card_photo
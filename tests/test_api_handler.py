@@ -87,3 +87,233 @@ def test_api_key_required_when_configured(monkeypatch):
     event["headers"]["X-API-Key"] = "k2"
     resp_ok = lambda_handler(event, None)
     assert resp_ok["statusCode"] == 200
+
+
+def _make_binder_png_b64(rows: int = 2, cols: int = 3) -> str:
+    import io
+
+    from PIL import ImageDraw
+
+    card_w, gap = 160, 30
+    card_h = int(card_w / 0.716)
+    width = cols * card_w + (cols + 1) * gap
+    height = rows * card_h + (rows + 1) * gap
+    img = Image.new("RGB", (width, height), color=(35, 35, 35))
+    draw = ImageDraw.Draw(img)
+    for r in range(rows):
+        for c in range(cols):
+            x0 = gap + c * (card_w + gap)
+            y0 = gap + r * (card_h + gap)
+            draw.rectangle([x0, y0, x0 + card_w, y0 + card_h], fill=(230, 210, 90))
+
+    buf = io.BytesIO()
+    img.save(buf, format="PNG")
+    return base64.b64encode(buf.getvalue()).decode("ascii")
+
+
+def _analyze_event(payload: dict) -> dict:
+    return {
+        "httpMethod": "POST",
+        "path": "/v1/analyze",
+        "headers": {"content-type": "application/json"},
+        "body": json.dumps(payload),
+        "isBase64Encoded": False,
+    }
+
+
+def test_analyze_multi_card_returns_cards_by_position(monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+
+    payload = {
+        "card_type": "pokemon",
+        "multi_card": True,
+        "front_image": {"encoding": "base64", "data": _make_binder_png_b64(), "media_type": "image/png"},
+    }
+    resp1 = lambda_handler(_analyze_event(payload), None)
+    resp2 = lambda_handler(_analyze_event(payload), None)
+
+    assert resp1["statusCode"] == 200
+    assert resp1["body"] == resp2["body"]
+
+    body = json.loads(resp1["body"])
+    result = body["result"]
+    assert result["multi_card"] is True
+    assert result["cards_detected"] == 6
+    positions = [(c["position"]["row"], c["position"]["col"]) for c in result["cards"]]
+    assert positions == [(0, 0), (0, 1), (0, 2), (1, 0), (1, 1), (1, 2)]
+    request_ids = {c["request_id"] for c in result["cards"]}
+    assert len(request_ids) == 6
+    assert all(rid.startswith(body["request_id"]) for rid in request_ids)
+
+    # Same bytes in single-card mode must not collide with the multi-card request id.
+    payload["multi_card"] = False
+    single = json.loads(lambda_handler(_analyze_event(payload), None)["body"])
+    assert single["request_id"] != body["request_id"]
+
+
+def test_analyze_multi_card_survives_a_failing_card(monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    from services import card_identity
+
+    hashes = []
+    real = card_identity.extract_card_identity
+
+    def flaky(image, requested_card_type=None, frame=None):
+        hashes.append(frame.content_hash)
+        if len(hashes) == 2:
+            raise RuntimeError("bad crop")
+        return real(image, requested_card_type=requested_card_type, frame=frame)
+
+    monkeypatch.setattr(card_identity, "extract_card_identity", flaky)
+    payload = {
+        "card_type": "pokemon",
+        "multi_card": True,
+        "front_image": {"encoding": "base64", "data": _make_binder_png_b64(), "media_type": "image/png"},
+    }
+    resp = lambda_handler(_analyze_event(payload), None)
+
+    assert resp["statusCode"] == 200
+    cards = json.loads(resp["body"])["result"]["cards"]
+    assert len(cards) == 6
+    assert "IMAGE_UNREADABLE" in cards[1]["gatekeeper_result"]["reason_codes"]
+    # Each card is traced by its own hash, not the photo's.
+    assert len(set(hashes)) == 6
+
+
+def test_analyze_multi_card_decodes_full_resolution(monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    import io
+
+    from services.card_frame import CardFrame
+
+    buf = io.BytesIO()
+    Image.open(io.BytesIO(base64.b64decode(_make_binder_png_b64()))).resize((3400, 2400)).save(buf, format="JPEG")
+    decoded = []
+    original = CardFrame.from_bytes.__func__
+
+    def record(cls, image_bytes, **kwargs):
+        frame = original(cls, image_bytes, **kwargs)
+        decoded.append(frame.ingest.draft_scale)
+        return frame
+
+    monkeypatch.setattr(CardFrame, "from_bytes", classmethod(record))
+    data = base64.b64encode(buf.getvalue()).decode("ascii")
+    payload = {"card_type": "pokemon", "front_image": {"encoding": "base64", "data": data}}
+    lambda_handler(_analyze_event(payload), None)
+    lambda_handler(_analyze_event(payload | {"multi_card": True}), None)
+    assert decoded == [2, 1]
+
+
+def test_analyze_multi_card_must_be_boolean(monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+
+    payload = {
+        "card_type": "pokemon",
+        "multi_card": "yes",
+        "front_image": {"encoding": "base64", "data": _make_png_b64(), "media_type": "image/png"},
+    }
+    resp = lambda_handler(_analyze_event(payload), None)
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"])["error_code"] == "INVALID_FIELD_VALUE"
+
+
+def _make_card_frames_b64() -> tuple[str, str]:
+    """(blurred, sharp) frames of the same card photo."""
+    import io
+
+    from PIL import ImageDraw, ImageFilter
+
+    img = Image.new("RGB", (400, 500), color=(30, 30, 30))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([100, 80, 300, 360], fill=(230, 210, 90))
+    for i in range(8):
+        draw.line([115, 110 + i * 28, 285, 110 + i * 28], fill=(20, 20, 20), width=2)
+
+    out = []
+    for frame in (img.filter(ImageFilter.GaussianBlur(5)), img):
+        buf = io.BytesIO()
+        frame.save(buf, format="PNG")
+        out.append(base64.b64encode(buf.getvalue()).decode("ascii"))
+    return out[0], out[1]
+
+
+def _count_prefilter_measures(monkeypatch) -> list:
+    # The prefilter measures a thumbnail only when the frame ranking did not.
+    from services.grading import photo_quality
+
+    calls = []
+    measure = photo_quality.thumbnail_quality
+    monkeypatch.setattr(photo_quality, "thumbnail_quality", lambda image: calls.append(1) or measure(image))
+    return calls
+
+
+def test_analyze_burst_selects_sharpest_frame(monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    measured = _count_prefilter_measures(monkeypatch)
+
+    blurred, sharp = _make_card_frames_b64()
+    payload = {
+        "card_type": "pokemon",
+        "front_images": [
+            {"encoding": "base64", "data": blurred},
+            {"encoding": "base64", "data": sharp},
+        ],
+    }
+    resp = lambda_handler(_analyze_event(payload), None)
+    assert resp["statusCode"] == 200
+
+    selection = json.loads(resp["body"])["result"]["frame_selection"]
+    assert selection["frames_received"] == 2
+    assert selection["ranking"][0]["index"] == 1
+    assert selection["fallback_index"] == 0
+    assert selection["selected_index"] in (0, 1)
+    assert measured == []
+
+
+def test_analyze_burst_rejects_too_many_frames(monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+
+    frame = {"encoding": "base64", "data": _make_png_b64()}
+    payload = {"card_type": "pokemon", "front_images": [frame] * 11}
+    resp = lambda_handler(_analyze_event(payload), None)
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"])["error_code"] == "INVALID_FIELD_VALUE"
+
+
+def test_grade_burst_reports_frame_selection(monkeypatch, tmp_path):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    monkeypatch.chdir(tmp_path)
+    measured = _count_prefilter_measures(monkeypatch)
+
+    blurred, sharp = _make_card_frames_b64()
+    payload = {
+        "card_type": "pokemon",
+        "front_images": [
+            {"encoding": "base64", "data": blurred},
+            {"encoding": "base64", "data": sharp},
+        ],
+        "back_image": {"encoding": "base64", "data": sharp},
+    }
+    event = {
+        "httpMethod": "POST",
+        "path": "/v1/grade",
+        "headers": {"content-type": "application/json"},
+        "body": json.dumps(payload),
+        "isBase64Encoded": False,
+    }
+    resp = lambda_handler(event, None)
+    assert resp["statusCode"] == 200
+
+    selection = json.loads(resp["body"])["result"]["frame_selection"]
+    assert selection["front"]["selected_index"] == 1
+    assert selection["back"] is None
+    assert measured == [1]  # the single back frame; the front reuses its ranking
+
+
+def test_request_hash_separates_frames_and_sides():
+    from api.http import content_hash_frames
+
+    a, b, c = b"A" * 8, b"B" * 8, b"C" * 8
+    assert content_hash_frames([a, b], [c]) != content_hash_frames([a], [b, c])
+    assert content_hash_frames([a + b]) != content_hash_frames([a, b])
+    assert content_hash_frames([a], [b]) == content_hash_frames([a], [b])
@@ -0,0 +1,79 @@
+"""Tests for back centering by registration against a reference back.
+
+These tests verify:
+1. Phase correlation recovers (sub-pixel) design offsets
+2. measure_centering uses the reference as the primary back method
+3. Missing references and unrelated images fall back to the old methods
+"""
+
+import json
+
+import cv2
+import numpy as np
+import pytest
+
+from services.grading.centering import measure_centering
+from services.grading.registration import load_back_reference, register_reference, register_translation
+
+_W, _H, _BORDER, _PAD = 744, 1040, 30, 60
+
+
+def _design_canvas(seed: int = 0) -> np.ndarray:
+    """Synthetic back design: flat border, swirl texture and a ball, with padding."""
+    rng = np.random.default_rng(seed)
+    canvas = np.full((_H + 2 * _PAD, _W + 2 * _PAD, 3), (40, 70, 160), dtype=np.uint8)
+    inner = cv2.GaussianBlur(rng.integers(0, 255, (_H - 2 * _BORDER, _W - 2 * _BORDER, 3), dtype=np.uint8), (0, 0), 4)
+    inner = cv2.normalize(inner, None, 0, 255, cv2.NORM_MINMAX)
+    cv2.circle(inner, (inner.shape[1] // 2, inner.shape[0] // 2), 150, (230, 60, 40), -1)
+    canvas[_PAD + _BORDER:_PAD + _H - _BORDER, _PAD + _BORDER:_PAD + _W - _BORDER] = inner
+    return canvas
+
+
+def _back(dx: float, dy: float) -> np.ndarray:
+    """Card back whose printed design is shifted by (dx, dy) px."""
+    m = np.float32([[1, 0, dx - _PAD], [0, 1, dy - _PAD]])
+    return cv2.warpAffine(_design_canvas(), m, (_W, _H), flags=cv2.INTER_LINEAR)
+
+
+@pytest.fixture
+def reference(tmp_path, monkeypatch):
+    path = tmp_path / "pokemon_back.png"
+    cv2.imwrite(path.as_posix(), cv2.cvtColor(_back(0, 0), cv2.COLOR_RGB2GRAY))
+    borders = {"left": _BORDER, "right": _BORDER, "top": _BORDER, "bottom": _BORDER}
+    path.with_suffix(".json").write_text(json.dumps({"borders": borders}))
+    monkeypatch.setenv("PREGRADE_BACK_REFERENCE_PATH", path.as_posix())
+    return load_back_reference()
+
+
+@pytest.mark.parametrize("dx,dy", [(0.0, 0.0), (6.5, -4.25), (-18.0, 12.0)])
+def test_register_translation_recovers_offset(reference, dx, dy):
+    gray = cv2.cvtColor(_back(dx, dy), cv2.COLOR_RGB2GRAY)
+    reg = register_translation(gray, reference.gray)
+    assert abs(reg.dx - dx) < 0.3
+    assert abs(reg.dy - dy) < 0.3
+    assert reg.response > 0.3
+
+
+def test_centering_uses_registration(reference):
+    back = _back(10.0, -6.0)
+    m = measure_centering(_back(0, 0), back)
+    assert m.details["back_method"] == "registration"
+    assert m.details["back_pokeball"] is None
+    left, right = _BORDER + 10.0, _BORDER - 10.0
+    assert abs(m.back_lr[0] - 100.0 * left / (left + right)) < 1.0
+    top, bottom = _BORDER - 6.0, _BORDER + 6.0
+    assert abs(m.back_tb[0] - 100.0 * top / (top + bottom)) < 1.0
+
+
+def test_unrelated_image_is_rejected(reference):
+    rng = np.random.default_rng(5)
+    noise = rng.integers(0, 255, (_H, _W), dtype=np.uint8)
+    assert register_reference(noise, reference) is None
+
+
+def test_missing_reference_falls_back(tmp_path, monkeypatch):
+    monkeypatch.setenv("PREGRADE_BACK_REFERENCE_PATH", (tmp_path / "missing.png").as_posix())
+    assert load_back_reference() is None
+    m = measure_centering(_back(0, 0), _back(5.0, 0.0))
+    assert m.details["back_method"] != "registration"
+    assert m.details["back_registration"] is None
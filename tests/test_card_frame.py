@@ -0,0 +1,97 @@
+"""Tests for the request-scoped CardFrame.
+
+These tests verify:
+1. The warp runs at most once per frame, however many consumers read it
+2. The canonical image matches the standalone canonicalize() output
+3. Frames decode from bytes and reject invalid payloads
+"""
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+import services.card_frame as card_frame_module
+from services.card_frame import CardFrame
+from services.grading.canonical import CANONICAL_W, CANONICAL_H, canonicalize
+
+
+def _create_card_photo(width: int = 800, height: int = 1000) -> Image.Image:
+    """Dark background with a light card-shaped rectangle in the middle."""
+    img = Image.new("RGB", (width, height), color=(30, 30, 30))
+    draw = ImageDraw.Draw(img)
+    card_w = int(width * 0.6)
+    card_h = int(card_w / 0.716)
+    x0 = (width - card_w) // 2
+    y0 = (height - card_h) // 2
+    draw.rectangle([x0, y0, x0 + card_w, y0 + card_h], fill=(230, 210, 90))
+    draw.rectangle([x0 + 30, y0 + 60, x0 + card_w - 30, y0 + card_h // 2], fill=(60, 120, 200))
+    return img
+
+
+class TestCardFrameWarpSharing:
+    """The warp is computed lazily and only once."""
+
+    def test_warp_runs_once(self, monkeypatch):
+        calls = []
+        original = card_frame_module.warp_card_best_effort_array
+
+        def counting(rgb, **kwargs):
+            calls.append(1)
+            return original(rgb, **kwargs)
+
+        monkeypatch.setattr(card_frame_module, "warp_card_best_effort_array", counting)
+
+        frame = CardFrame(_create_card_photo())
+        assert calls == []
+
+        _ = frame.warped
+        _ = frame.warped_rgb
+        _ = frame.quad
+        _ = frame.canonical
+        _ = frame.canonical_gray
+
+        assert len(calls) == 1
+
+    def test_canonical_matches_canonicalize(self):
+        img = _create_card_photo()
+        frame = CardFrame(img)
+        standalone = canonicalize(img)
+
+        assert frame.canonical.image.size == (CANONICAL_W, CANONICAL_H)
+        assert frame.canonical.warp_used == standalone.warp_used
+        assert frame.canonical.warp_reason == standalone.warp_reason
+        assert np.array_equal(np.array(frame.canonical.image), np.array(standalone.image))
+
+    def test_quad_reported_when_warp_used(self):
+        frame = CardFrame(_create_card_photo())
+        assert frame.warp_used
+        assert frame.quad is not None
+        assert frame.quad.shape == (4, 2)
+
+    def test_derived_planes_match_canonical(self):
+        frame = CardFrame(_create_card_photo())
+        assert frame.canonical_rgb.shape == (CANONICAL_H, CANONICAL_W, 3)
+        assert frame.canonical_gray.shape == (CANONICAL_H, CANONICAL_W)
+        assert np.array_equal(frame.canonical_rgb, np.array(frame.canonical.image))
+
+    def test_canonical_rgb_shares_warped_array(self):
+        frame = CardFrame(_create_card_photo())
+        assert frame.canonical_rgb is frame.warped_rgb
+        assert not frame.canonical_rgb.flags.writeable
+
+
+class TestCardFrameFromBytes:
+    """Frames decode from raw bytes."""
+
+    def test_decodes_png(self):
+        buf = io.BytesIO()
+        _create_card_photo().save(buf, format="PNG")
+        frame = CardFrame.from_bytes(buf.getvalue())
+        assert frame.size == (800, 1000)
+        assert frame.image.mode == "RGB"
+
+    def test_invalid_bytes_raise(self):
+        with pytest.raises(Exception):
+            CardFrame.from_bytes(b"not an image")
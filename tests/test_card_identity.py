@@ -847,6 +847,68 @@ class TestEnergyColorDetection:
         assert result is None or isinstance(result, str)
 
 
+def _basic_energy_card(color: tuple[int, int, int]) -> np.ndarray:
+    """Warped-size card: textured cream background, colored disc with a light glyph."""
+    import cv2
+    rng = np.random.default_rng(0)
+    card = np.full((1040, 744, 3), (215, 205, 170), dtype=np.int16) + rng.integers(-12, 12, (1040, 744, 3))
+    card = np.clip(card, 0, 255).astype(np.uint8)
+    cv2.circle(card, (372, 520), 220, color, -1)
+    cv2.fillPoly(card, [np.array([[372, 400], [300, 640], [444, 640]])], (250, 240, 220))
+    return card
+
+
+class TestBasicEnergyFastPath:
+    """Verify basic Energy cards are identified from their symbol, without OCR."""
+
+    @pytest.mark.parametrize("color,name", [
+        ((220, 40, 30), "Fire Energy"),
+        ((40, 170, 60), "Grass Energy"),
+        ((30, 90, 210), "Water Energy"),
+        ((240, 220, 40), "Lightning Energy"),
+    ])
+    def test_symbol_and_color(self, color, name):
+        from services.card_identity import _identify_basic_energy
+        assert _identify_basic_energy(_basic_energy_card(color))[0] == name
+
+    def test_no_symbol_no_fast_path(self):
+        from services.card_identity import _identify_basic_energy
+        assert _identify_basic_energy(np.full((1040, 744, 3), (220, 40, 30), dtype=np.uint8)) is None
+        rng = np.random.default_rng(1)
+        assert _identify_basic_energy(rng.integers(0, 255, (1040, 744, 3), dtype=np.uint8)) is None
+
+    def test_special_energy_disc_is_not_basic(self):
+        import cv2
+        from services.card_identity import _identify_basic_energy
+        # Plain disc: no glyph.
+        plain = _basic_energy_card((220, 40, 30))
+        cv2.circle(plain, (372, 520), 220, (220, 40, 30), -1)
+        assert _identify_basic_energy(plain) is None
+        # Double Colorless-like disc: two symbols instead of one glyph.
+        double = _basic_energy_card((200, 200, 200))
+        cv2.circle(double, (372, 520), 220, (200, 200, 200), -1)
+        for x in (300, 444):
+            cv2.circle(double, (x, 520), 55, (30, 30, 30), -1)
+        assert _identify_basic_energy(double) is None
+
+    def test_skips_ocr(self, monkeypatch):
+        from services import card_identity
+        from services.card_frame import CardFrame
+        monkeypatch.delenv("PYTEST_CURRENT_TEST")
+        monkeypatch.delenv("PREGRADE_SKIP_OCR", raising=False)
+        calls, enriched = [], []
+        monkeypatch.setattr(card_identity.pytesseract, "image_to_string", lambda *a, **k: calls.append(1) or "")
+        monkeypatch.setattr(card_identity, "enrich_identity", lambda identity: enriched.append(identity) or identity)
+
+        frame = CardFrame(Image.fromarray(_basic_energy_card((220, 40, 30))))
+        identity = extract_card_identity(frame.image, requested_card_type="energy", frame=frame)
+        assert identity.card_name == "Fire Energy" and identity.card_type == "energy"
+        assert identity.details["trace"]["basic_energy_fast_path"] is True
+        assert identity.match_method.startswith("basic_energy_symbol:")
+        assert identity.details["trace"]["energy_glyph"]["is_basic"] is True
+        assert calls == [] and enriched == [identity]
+
+
 class TestNumberRegionsByCardType:
     """Verify card type-aware number region selection."""
     
@@ -10,6 +10,7 @@ from services.card_warp import (
     order_corners,
     warp_card,
     detect_card_quad,
+    detect_card_quads,
     QuadCandidate,
     _passes_gates,
     _compute_gate_failures,
@@ -357,3 +358,50 @@ class TestWarpDebugPayload:
         assert quad is not None
         assert "gate_mode" in debug
         assert debug["gate_mode"] in ("strict", "relaxed", "strict_fallback")
+
+
+def _create_binder_page(rows: int = 3, cols: int = 3, card_w: int = 200, gap: int = 30) -> Image.Image:
+    """Dark binder page with a rows x cols grid of light card-shaped rectangles."""
+    card_h = int(card_w / 0.716)
+    width = cols * card_w + (cols + 1) * gap + 80
+    height = rows * card_h + (rows + 1) * gap + 80
+    img = Image.new("RGB", (width, height), color=(35, 35, 35))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([40, 40, width - 40, height - 40], fill=(70, 70, 80))
+    for r in range(rows):
+        for c in range(cols):
+            x0 = 40 + gap + c * (card_w + gap)
+            y0 = 40 + gap + r * (card_h + gap)
+            draw.rectangle([x0, y0, x0 + card_w, y0 + card_h], fill=(230, 210, 90))
+            # Art window: must not be reported as a separate card.
+            draw.rectangle([x0 + 15, y0 + 30, x0 + card_w - 15, y0 + card_h // 2], fill=(60, 120, 200))
+    return img
+
+
+class TestMultiCardDetection:
+    """detect_card_quads finds every card on a page, in reading order."""
+
+    @pytest.mark.parametrize("rows,cols", [(3, 3), (2, 4)])
+    def test_finds_all_cards_row_major(self, rows, cols):
+        quads, debug = detect_card_quads(_create_binder_page(rows, cols))
+
+        assert debug["cards_found"] == rows * cols
+        assert [(q.row, q.col) for q in quads] == [(r, c) for r in range(rows) for c in range(cols)]
+        assert [q.index for q in quads] == list(range(rows * cols))
+
+        centers = np.array([q.quad.mean(axis=0) for q in quads])
+        for r in range(rows):
+            row_centers = centers[r * cols:(r + 1) * cols]
+            assert np.all(np.diff(row_centers[:, 0]) > 0)
+
+    def test_cards_are_card_sized(self):
+        quads, _ = detect_card_quads(_create_binder_page())
+        for q in quads:
+            ordered = order_corners(q.quad)
+            width = float(np.linalg.norm(ordered[1] - ordered[0]))
+            assert 190 <= width <= 215
+            assert q.debug["gate_mode"] == "multi"
+
+    def test_max_cards_caps_result(self):
+        quads, _ = detect_card_quads(_create_binder_page(), max_cards=4)
+        assert len(quads) == 4
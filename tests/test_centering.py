@@ -0,0 +1,61 @@
+"""Tests for front border-width centering.
+
+These tests verify:
+1. Border transitions are found per profile in one vectorized pass
+2. Off-center borders give the expected LR/TB ratios
+3. The inner-artwork fallback only runs when border detection fails
+"""
+
+import cv2
+import numpy as np
+
+import services.grading.centering as centering
+from services.grading.centering import _first_border_transitions, measure_centering
+
+
+def _bordered_card(left: int, right: int, top: int, bottom: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    img = np.full((1040, 744, 3), (240, 210, 60), dtype=np.uint8)
+    art = rng.integers(0, 255, (1040 - top - bottom, 744 - left - right, 3), dtype=np.uint8)
+    img[top:1040 - bottom, left:744 - right] = cv2.GaussianBlur(art, (15, 15), 0) // 2
+    return img
+
+
+def test_first_transitions_per_profile():
+    profiles = np.full((3, 50), 200, dtype=np.uint8)
+    profiles[0, 20:] = 40  # border ends at 19
+    profiles[1, 2:] = 40  # change inside the minimum border width is ignored
+    transitions = _first_border_transitions(profiles)
+    assert transitions.tolist() == [19, 0, 0]
+
+
+def test_offset_borders_give_ratios():
+    img = _bordered_card(left=20, right=40, top=25, bottom=35)
+    m = measure_centering(img, img)
+    assert m.details["front_method"] == "border"
+    assert abs(m.front_lr[0] - 100.0 * 19 / 58) < 0.01
+    assert abs(m.front_tb[0] - 100.0 * 24 / 58) < 0.01
+    # Hundreds of rows/columns contribute, not a handful of samples.
+    assert min(m.details["front_border_samples"].values()) > 400
+    assert m.details["front_inner_rect"] == (19, 24, 744 - 39 - 19, 1040 - 34 - 24)
+
+
+def test_inner_rect_fallback_is_lazy(monkeypatch):
+    calls = []
+    original = centering._find_inner_artwork_rect
+
+    def counting(image):
+        calls.append(image)
+        return original(image)
+
+    monkeypatch.setattr(centering, "_find_inner_artwork_rect", counting)
+
+    img = _bordered_card(30, 30, 30, 30)
+    measure_centering(img, img)
+    assert len(calls) == 1  # back only
+
+    calls.clear()
+    flat = np.full((1040, 744, 3), 128, dtype=np.uint8)
+    m = measure_centering(flat, img)
+    assert len(calls) == 2
+    assert m.details["front_method"] != "border"
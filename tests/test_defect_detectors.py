@@ -7,22 +7,31 @@ These tests verify:
 """
 
 import io
+import cv2
 import numpy as np
 import pytest
 from PIL import Image, ImageDraw
 
 from services.grading.corners import (
     detect_corner_defects,
+    detect_corner_defects_batch,
+    _sobel3,
     CornersResult,
     WHITENING_BRIGHTNESS_THRESHOLD,
 )
 from services.grading.edges import (
     detect_edge_defects,
+    detect_edge_defects_batch,
     EdgesResult,
 )
 from services.grading.surface import (
+    _compute_line_contrasts,
+    _detect_scratches,
+    block_variance_map,
     detect_surface_defects,
     SurfaceResult,
+    SCRATCH_CONTRAST_THRESHOLD,
+    TEXTURE_MAX_SCRATCH_COUNT,
 )
 from services.grading.photo_quality import (
     detect_photo_quality,
@@ -539,3 +548,114 @@ class TestHolographicCardHandling:
         assert "edge_density" in result.details
         assert isinstance(result.details["edge_density"], float)
         assert 0.0 <= result.details["edge_density"] <= 1.0
+
+
+# ---------------------------------------------------------------------------
+# Scuff heatmap (integral-image block variance)
+# ---------------------------------------------------------------------------
+
+
+class TestScuffHeatmap:
+    """Tests for block variance maps and scuff localization."""
+
+    def test_block_variance_matches_per_block_var(self):
+        """Integral-image variance should match np.var on each block."""
+        rng = np.random.default_rng(0)
+        gray = rng.integers(0, 255, (200, 150), dtype=np.uint8)
+
+        vmap = block_variance_map(gray, 32, stride=16)
+        expected = [
+            [np.var(gray[y:y + 32, x:x + 32]) for x in range(0, 150 - 32, 16)]
+            for y in range(0, 200 - 32, 16)
+        ]
+        assert vmap.shape == (len(expected), len(expected[0]))
+        assert np.allclose(vmap, expected, rtol=0, atol=1e-9)
+
+    def test_small_image_gives_empty_map(self):
+        gray = np.zeros((20, 20), dtype=np.uint8)
+        assert block_variance_map(gray, 32).size == 0
+
+    def test_heatmap_localizes_scuff(self):
+        """A single rough patch on a clean card should be the top hotspot."""
+        img = np.array(_create_clean_card_image())
+        rng = np.random.default_rng(1)
+        img[500:540, 300:340] = rng.integers(0, 255, (40, 40, 3), dtype=np.uint8)
+
+        result = detect_surface_defects(img)
+        heatmap = result.details["scuff_heatmap"]
+        assert list(result.variance_map.shape) == heatmap["shape"]
+        assert heatmap["hotspot_count"] >= 1
+        top = heatmap["hotspots"][0]
+        assert top["x"] <= 320 <= top["x"] + top["w"]
+        assert top["y"] <= 520 <= top["y"] + top["h"]
+
+    def test_clean_card_has_no_hotspots(self):
+        result = detect_surface_defects(_create_clean_card_image())
+        assert result.details["scuff_heatmap"]["hotspots"] == []
+
+
+class TestScratchContrast:
+    """Tests for vectorized line contrast on Hough segments."""
+
+    def test_contrast_per_line(self):
+        gray = np.full((200, 200), 200, dtype=np.uint8)
+        cv2.line(gray, (20, 20), (180, 150), 40, 1)
+        lines = np.array(
+            [
+                [20, 20, 180, 150],  # dark line on bright background
+                [20, 180, 180, 180],  # flat region, no line drawn
+                [-50, -50, -10, -10],  # entirely outside the image
+            ],
+            dtype=np.int32,
+        )
+        contrast = _compute_line_contrasts(gray, lines)
+        assert contrast.shape == (3,)
+        assert contrast[0] > SCRATCH_CONTRAST_THRESHOLD
+        assert contrast[1] == 0.0
+        assert contrast[2] == 0.0
+
+    def test_textured_cutoff_applies(self):
+        """Many high-contrast diagonals on a textured card are treated as pattern."""
+        img = np.array(_create_holographic_pattern_image())
+        gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)
+        for i in range(TEXTURE_MAX_SCRATCH_COUNT + 5):
+            cv2.line(gray, (10 + i * 30, 10), (200 + i * 30, 500), 255, 3)
+        assert _detect_scratches(gray, is_textured=True) == []
+
+
+class TestBatchDetectors:
+    """Tests for the stacked (N, H, W, 3) corner/edge entry points."""
+
+    @staticmethod
+    def _stack() -> np.ndarray:
+        rng = np.random.default_rng(3)
+        noisy = np.array(_create_holographic_pattern_image()).astype(np.int16) + rng.integers(-30, 30, (1040, 744, 3))
+        return np.stack([
+            np.array(_create_clean_card_image()),
+            np.array(_create_whitened_corners_image()),
+            np.array(_create_whitened_edges_image()),
+            noisy.clip(0, 255).astype(np.uint8),
+        ])
+
+    @pytest.mark.parametrize(
+        "single,batch",
+        [(detect_corner_defects, detect_corner_defects_batch), (detect_edge_defects, detect_edge_defects_batch)],
+    )
+    def test_batch_matches_per_image(self, single, batch):
+        stack = self._stack()
+        results = batch(stack)
+        assert len(results) == len(stack)
+        for img, result in zip(stack, results):
+            assert result == single(img)
+
+    def test_grayscale_stack(self):
+        stack = self._stack()
+        gray = np.stack([cv2.cvtColor(img, cv2.COLOR_RGB2GRAY) for img in stack])
+        assert detect_corner_defects_batch(gray) == detect_corner_defects_batch(stack)
+        assert detect_edge_defects_batch(gray) == detect_edge_defects_batch(stack)
+
+    def test_sobel_matches_opencv(self):
+        patch = self._stack()[3, :83, :59, 0]
+        sx, sy = _sobel3(patch[None])
+        assert np.array_equal(sx[0], cv2.Sobel(patch, cv2.CV_64F, 1, 0, ksize=3))
+        assert np.array_equal(sy[0], cv2.Sobel(patch, cv2.CV_64F, 0, 1, ksize=3))
@@ -0,0 +1,101 @@
+"""Tests for layout-anchored name/number localization.
+
+These tests verify:
+1. The name line and the collector number are found from text anchors
+2. Cards without text anchors yield no ROIs
+3. Identity extraction reads the localized ROIs instead of sweeping fixed boxes, whatever the card type
+"""
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from services import card_identity
+from services.card_frame import CardFrame
+from services.field_layout import locate_fields
+
+
+def _card(number_at=(590, 975), illustrator_at=(60, 1000)) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    card = np.full((1040, 744, 3), (230, 210, 90), dtype=np.int16) + rng.integers(-10, 10, (1040, 744, 3))
+    card = np.clip(card, 0, 255).astype(np.uint8)
+    card[150:560, 60:684] = cv2.GaussianBlur(rng.integers(0, 255, (410, 624, 3), dtype=np.uint8), (9, 9), 0)
+    ink = (20, 20, 20)
+    cv2.putText(card, "Pikachu", (70, 95), cv2.FONT_HERSHEY_SIMPLEX, 1.6, ink, 3)
+    cv2.putText(card, "HP60", (520, 95), cv2.FONT_HERSHEY_SIMPLEX, 1.0, ink, 2)
+    cv2.putText(card, "Illus. Mitsuhiro Arita  (c)1999 Nintendo", illustrator_at, cv2.FONT_HERSHEY_SIMPLEX, 0.5, ink, 1)
+    cv2.putText(card, "025/198", number_at, cv2.FONT_HERSHEY_SIMPLEX, 0.7, ink, 1)
+    return card
+
+
+def _contains(box, x0, y0, x1, y1, w=744, h=1040) -> bool:
+    return (
+        box.left_ratio * w <= x0 and x1 <= box.right_ratio * w
+        and box.top_ratio * h <= y0 and y1 <= box.bottom_ratio * h
+    )
+
+
+@pytest.mark.parametrize("number_at,illustrator_at,corner", [
+    ((590, 975), (60, 1000), "bottom_right"),
+    ((40, 1010), (60, 975), "bottom_left"),
+    ((580, 1015), (60, 1015), "bottom_right"),
+])
+def test_locates_name_and_number(number_at, illustrator_at, corner):
+    layout = locate_fields(_card(number_at, illustrator_at))
+    assert _contains(layout.name, 72, 60, 260, 97)
+    assert layout.name.right_ratio * 744 < 523  # stops before the HP
+    assert layout.number_corner == corner
+    x, y = number_at
+    assert _contains(layout.number, x + 2, y - 16, x + 95, y)
+    assert set(layout.anchors) == {"hp", "name", "illustrator", "number"}
+
+
+def test_no_anchors_no_rois():
+    layout = locate_fields(np.full((1040, 744, 3), 200, dtype=np.uint8))
+    assert layout.name is None and layout.number is None and layout.anchors == {}
+
+
+def test_identity_reads_localized_rois(monkeypatch):
+    monkeypatch.delenv("PYTEST_CURRENT_TEST")
+    monkeypatch.delenv("PREGRADE_SKIP_OCR", raising=False)
+    monkeypatch.delenv("PREGRADE_ENABLE_ENRICHMENT", raising=False)
+    sizes = []
+    monkeypatch.setattr(
+        card_identity.pytesseract, "image_to_string", lambda image, **k: sizes.append(image.size) or "Pikachu 025/198"
+    )
+    monkeypatch.setattr(card_identity, "parse_card_number_from_crop", lambda crop: None)
+
+    photo = np.full((1240, 944, 3), 30, dtype=np.uint8)
+    photo[100:1140, 100:844] = _card()
+    frame = CardFrame(Image.fromarray(photo))
+    identity = card_identity.extract_card_identity(frame.image, requested_card_type="pokemon", frame=frame)
+
+    trace = identity.details["trace"]
+    assert trace["field_layout"]["name_found"] is True
+    assert identity.card_name == "Pikachu" and identity.card_number == "25/198"
+    assert trace["number_region_selected"] == "bottom_right:localized:ocr"
+    assert [c["region"] for c in trace["number_candidates"]] == ["bottom_right:localized"]
+    fixed = card_identity._crop_region(frame.warped, card_identity.NAME_REGION_MODERN_A).size
+    assert fixed not in sizes
+
+
+def test_localized_name_ends_sweep_for_unknown_type(monkeypatch):
+    monkeypatch.delenv("PYTEST_CURRENT_TEST")
+    monkeypatch.delenv("PREGRADE_SKIP_OCR", raising=False)
+    monkeypatch.delenv("PREGRADE_ENABLE_ENRICHMENT", raising=False)
+    monkeypatch.setattr(card_identity.pytesseract, "image_to_string", lambda image, **k: "Potion")
+    monkeypatch.setattr(card_identity, "parse_card_number_from_crop", lambda crop: None)
+    name_regions = []
+    monkeypatch.setattr(
+        card_identity, "_extract_name_text", lambda image, region: name_regions.append(region) or "Potion"
+    )
+
+    photo = np.full((1240, 944, 3), 30, dtype=np.uint8)
+    photo[100:1140, 100:844] = _card()
+    frame = CardFrame(Image.fromarray(photo))
+    identity = card_identity.extract_card_identity(frame.image, frame=frame)
+
+    assert identity.details["trace"]["early_card_type"] == "unknown"
+    assert identity.card_name == "Potion"
+    assert name_regions == [card_identity._field_region(locate_fields(frame.warped_rgb).name)]
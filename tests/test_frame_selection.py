@@ -0,0 +1,85 @@
+"""Tests for burst frame ranking and seeded quad search.
+
+These tests verify:
+1. Sharp frames rank above blurred ones, and glare is penalized
+2. Ranking is deterministic (ties keep request order)
+3. A seeded search window finds the card and ignores clutter outside it
+"""
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFilter
+
+from services.card_frame import CardFrame
+from services.card_warp import detect_card_quad, detect_card_quad_near
+from services.frame_selection import rank_frames, scale_quad
+
+
+def _create_card_photo(width: int = 800, height: int = 1000) -> Image.Image:
+    img = Image.new("RGB", (width, height), color=(30, 30, 30))
+    draw = ImageDraw.Draw(img)
+    card_w = int(width * 0.5)
+    card_h = int(card_w / 0.716)
+    x0 = (width - card_w) // 2
+    y0 = (height - card_h) // 2
+    draw.rectangle([x0, y0, x0 + card_w, y0 + card_h], fill=(230, 210, 90))
+    for i in range(12):
+        y = y0 + 40 + i * 25
+        draw.line([x0 + 20, y, x0 + card_w - 20, y], fill=(20, 20, 20), width=2)
+    return img
+
+
+class TestRankFrames:
+    def test_sharp_frame_ranks_first(self):
+        sharp = _create_card_photo()
+        blurred = sharp.filter(ImageFilter.GaussianBlur(6))
+        ranks = rank_frames([(0, blurred), (1, sharp)])
+        assert [r.index for r in ranks] == [1, 0]
+        assert ranks[0].laplacian_variance > ranks[1].laplacian_variance
+
+    def test_glare_is_penalized(self):
+        clean = _create_card_photo()
+        glare = clean.copy()
+        ImageDraw.Draw(glare).ellipse([200, 250, 600, 750], fill=(255, 255, 255))
+        ranks = rank_frames([(0, glare), (1, clean)])
+        assert ranks[0].index == 1
+        assert ranks[1].glare_ratio > ranks[0].glare_ratio
+
+    def test_ties_keep_request_order(self):
+        img = _create_card_photo()
+        ranks = rank_frames([(0, img), (1, img.copy()), (2, img.copy())])
+        assert [r.index for r in ranks] == [0, 1, 2]
+
+    def test_scale_quad(self):
+        quad = np.array([[10, 20], [110, 20], [110, 160], [10, 160]], dtype=np.float32)
+        scaled = scale_quad(quad, (200, 400), (400, 200))
+        assert np.allclose(scaled[0], [20, 10])
+        assert np.allclose(scaled[2], [220, 80])
+
+
+class TestSeededSearch:
+    def test_finds_card_near_seed(self):
+        img = _create_card_photo()
+        seed, _ = detect_card_quad(img)
+        assert seed is not None
+
+        quad, debug = detect_card_quad_near(img, seed)
+        assert quad is not None
+        assert "seed_window" in debug
+        assert np.abs(quad.mean(axis=0) - seed.mean(axis=0)).max() < 5.0
+
+    def test_window_excludes_clutter(self):
+        img = _create_card_photo(width=1600, height=1400)
+        # A second card-shaped distractor away from the seed.
+        ImageDraw.Draw(img).rectangle([20, 60, 360, 535], fill=(240, 240, 240))
+        seed, _ = detect_card_quad(_create_card_photo(width=1600, height=1400))
+
+        quad, _ = detect_card_quad_near(img, seed)
+        assert quad is not None
+        assert abs(float(quad.mean(axis=0)[0]) - float(seed.mean(axis=0)[0])) < 5.0
+
+    def test_frame_with_search_window_shares_arrays(self):
+        frame = CardFrame(_create_card_photo())
+        seeded = frame.with_search_window(frame.quad)
+        assert seeded.rgb is frame.rgb
+        assert seeded.warp_used
+        assert "seeded_" in seeded.warp_reason
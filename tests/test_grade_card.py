@@ -0,0 +1,69 @@
+"""Tests for grade_card stage scheduling.
+
+These tests verify:
+1. Parallel and inline execution give the same result
+2. Per-stage wall/CPU timings are reported in the trace
+3. PREGRADE_GRADE_PARALLELISM is parsed defensively
+"""
+
+from services.grading.grade import grade_card, grade_parallelism
+from services.grading.stages import GRADE_FIELDS
+
+_ALL_FIELDS = list(GRADE_FIELDS)  # overlays are opt-in
+
+
+def _without_timings(result) -> dict:
+    out = result.to_dict()
+    out["trace"] = {k: v for k, v in out["trace"].items() if k != "timings"}
+    for side in out["trace"]["canonical"].values():
+        if side.get("orientation"):
+            side["orientation"] = {k: v for k, v in side["orientation"].items() if k != "cost_ms"}
+    out.pop("explanations")
+    return out
+
+
+def test_parallel_matches_inline(card_photo, monkeypatch):
+    front, back = card_photo(0), card_photo(1)
+
+    monkeypatch.setenv("PREGRADE_GRADE_PARALLELISM", "1")
+    inline = grade_card(front, back, include=_ALL_FIELDS)
+    monkeypatch.setenv("PREGRADE_GRADE_PARALLELISM", "4")
+    parallel = grade_card(front, back, include=_ALL_FIELDS)
+
+    assert _without_timings(inline) == _without_timings(parallel)
+    assert inline.trace["timings"]["parallelism"] == 1
+    assert parallel.trace["timings"]["parallelism"] == 4
+    for key in ("front_overlay_image", "back_overlay_image"):
+        a = inline.explanations["centering"][key]
+        b = parallel.explanations["centering"][key]
+        assert a.tobytes() == b.tobytes()
+
+
+def test_stage_timings_in_trace(card_photo, monkeypatch):
+    monkeypatch.setenv("PREGRADE_GRADE_PARALLELISM", "2")
+    result = grade_card(card_photo(0), card_photo(1), include=_ALL_FIELDS)
+    timings = result.trace["timings"]
+    assert list(timings["stages"]) == [
+        "canonicalize_front",
+        "canonicalize_back",
+        "centering",
+        "photo_quality",
+        "corners",
+        "edges",
+        "surface",
+        "overlay_front",
+        "overlay_back",
+    ]
+    for stage in timings["stages"].values():
+        assert stage["wall_ms"] >= 0.0
+        assert stage["cpu_ms"] >= 0.0
+    assert timings["wall_ms"] > 0.0
+
+
+def test_parallelism_env(monkeypatch):
+    monkeypatch.setenv("PREGRADE_GRADE_PARALLELISM", "3")
+    assert grade_parallelism() == 3
+    monkeypatch.setenv("PREGRADE_GRADE_PARALLELISM", "0")
+    assert grade_parallelism() == 1
+    monkeypatch.setenv("PREGRADE_GRADE_PARALLELISM", "lots")
+    assert grade_parallelism() >= 1
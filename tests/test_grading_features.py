@@ -0,0 +1,93 @@
+"""Tests for the shared derived-plane cache used by the grading detectors.
+
+These tests verify:
+1. Detectors give identical results on an image and on its CanonicalFeatures
+2. Planes are computed once and shared (read-only)
+3. Region Canny matches Canny of the cropped gray plane
+4. Concurrent detector threads build each plane once
+"""
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from services.card_frame import CardFrame
+from services.grading.centering import measure_centering
+from services.grading.corners import detect_corner_defects
+from services.grading.edges import detect_edge_defects
+from services.grading.features import CanonicalFeatures
+from services.grading.photo_quality import detect_photo_quality
+from services.grading.surface import detect_surface_defects
+
+
+def _create_textured_card(seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    img = np.full((1040, 744, 3), (235, 205, 60), dtype=np.uint8)
+    art = cv2.GaussianBlur(rng.integers(0, 255, (600, 620, 3), dtype=np.uint8), (9, 9), 0)
+    img[60:660, 62:682] = art
+    cv2.line(img, (120, 720), (600, 960), (250, 250, 250), 2)
+    cv2.rectangle(img, (0, 0), (40, 40), (255, 255, 255), -1)
+    return img
+
+
+@pytest.mark.parametrize(
+    "detector",
+    [detect_corner_defects, detect_edge_defects, detect_surface_defects, detect_photo_quality],
+)
+def test_detectors_identical_with_features(detector):
+    img = _create_textured_card()
+    assert repr(detector(img)) == repr(detector(CanonicalFeatures(img)))
+
+
+def test_centering_identical_with_features():
+    front, back = _create_textured_card(0), _create_textured_card(1)
+    plain = measure_centering(front, back)
+    shared = measure_centering(CanonicalFeatures(front), CanonicalFeatures(back))
+    assert repr(plain) == repr(shared)
+
+
+def test_planes_are_cached_and_read_only():
+    img = _create_textured_card()
+    features = CanonicalFeatures(img)
+    assert features.gray is features.gray
+    assert features.canny(50, 100) is features.canny(50, 100)
+    assert not features.gray.flags.writeable
+    assert not features.laplacian.flags.writeable
+    # The caller's array is left writeable.
+    assert img.flags.writeable
+    assert CanonicalFeatures.of(features) is features
+
+
+def test_region_canny_matches_crop():
+    img = _create_textured_card()
+    features = CanonicalFeatures(img)
+    region = (30, 40, 500, 700)
+    gray = cv2.cvtColor(img, cv2.COLOR_RGB2GRAY)[40:740, 30:530]
+    assert np.array_equal(features.canny(50, 100, region=region), cv2.Canny(gray, 50, 100))
+
+
+def test_planes_built_once_across_threads(monkeypatch):
+    from concurrent.futures import ThreadPoolExecutor
+
+    import services.grading.features as features_module
+
+    calls = []
+    real_canny = cv2.Canny
+
+    def slow_canny(src, low, high):
+        calls.append((low, high))
+        return real_canny(src, low, high)
+
+    monkeypatch.setattr(features_module.cv2, "Canny", slow_canny)
+    features = CanonicalFeatures(_create_textured_card())
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        planes = list(pool.map(lambda _: (features.laplacian, features.canny(50, 150, blurred=True)), range(16)))
+    assert all(p[0] is planes[0][0] and p[1] is planes[0][1] for p in planes)
+    assert calls == [(50, 150)]
+
+
+def test_card_frame_shares_features():
+    frame = CardFrame(Image.fromarray(_create_textured_card()))
+    assert frame.canonical_features is frame.canonical_features
+    assert frame.canonical_gray is frame.canonical_features.gray
@@ -0,0 +1,100 @@
+"""Tests for the visual header-band classifier.
+
+These tests verify:
+1. Header layout cues decide pokemon / trainer (with subtype) / energy
+2. Ambiguous or cue-less cards stay "unknown" so OCR decides
+3. Identity extraction skips header and subtype OCR when the classifier is sure
+"""
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from services import card_identity
+from services.card_frame import CardFrame
+from services.header_band import classify_header_band
+
+
+def _card(frame_color) -> np.ndarray:
+    rng = np.random.default_rng(0)
+    card = np.full((1040, 744, 3), frame_color, dtype=np.int16) + rng.integers(-10, 10, (1040, 744, 3))
+    card = np.clip(card, 0, 255).astype(np.uint8)
+    card[150:560, 60:684] = cv2.GaussianBlur(rng.integers(0, 255, (410, 624, 3), dtype=np.uint8), (9, 9), 0)
+    return card
+
+
+def _pokemon_card() -> np.ndarray:
+    card = _card((230, 210, 90))
+    cv2.putText(card, "Pikachu", (70, 95), cv2.FONT_HERSHEY_SIMPLEX, 1.6, (20, 20, 20), 3)
+    cv2.putText(card, "HP60", (520, 95), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (20, 20, 20), 2)
+    cv2.circle(card, (665, 78), 26, (240, 210, 40), -1)
+    cv2.circle(card, (665, 78), 26, (30, 30, 30), 2)
+    return card
+
+
+def _trainer_card(badge_color, frame_color=(200, 200, 205)) -> np.ndarray:
+    card = _card(frame_color)
+    cv2.rectangle(card, (40, 30), (200, 80), badge_color, -1)
+    cv2.putText(card, "TRAINER", (480, 70), cv2.FONT_HERSHEY_SIMPLEX, 1.2, (20, 20, 20), 3)
+    cv2.putText(card, "Potion", (60, 130), cv2.FONT_HERSHEY_SIMPLEX, 1.4, (20, 20, 20), 3)
+    return card
+
+
+def test_pokemon_type_symbol():
+    pred = classify_header_band(_pokemon_card())
+    assert (pred.card_type, pred.confident, pred.features) == ("pokemon", True, ("type_symbol",))
+
+
+@pytest.mark.parametrize("frame", [(200, 200, 205), (235, 205, 60)], ids=["grey_border", "yellow_border"])
+@pytest.mark.parametrize("color,subtype", [
+    ((40, 90, 210), "item"),
+    ((240, 130, 30), "supporter"),
+    ((40, 170, 60), "stadium"),
+    ((150, 60, 200), "pokemon_tool"),
+])
+def test_trainer_subtype_badge(color, subtype, frame):
+    pred = classify_header_band(_trainer_card(color, frame))
+    assert (pred.card_type, pred.trainer_subtype, pred.confident) == ("trainer", subtype, True)
+
+
+def test_energy_symbol():
+    card = np.full((1040, 744, 3), (215, 205, 170), dtype=np.uint8)
+    cv2.circle(card, (372, 520), 220, (220, 40, 30), -1)
+    assert classify_header_band(card).card_type == "energy"
+
+
+def test_unsure_is_unknown():
+    rng = np.random.default_rng(3)
+    noise = cv2.GaussianBlur(rng.integers(0, 255, (1040, 744, 3), dtype=np.uint8), (5, 5), 0)
+    assert not classify_header_band(noise).confident
+
+    both = _trainer_card((40, 90, 210))
+    cv2.circle(both, (665, 78), 26, (30, 30, 30), 3)
+    pred = classify_header_band(both)
+    assert pred.card_type == "unknown" and set(pred.features) == {"type_symbol", "subtype_badge"}
+
+
+def test_identity_skips_type_ocr(monkeypatch):
+    monkeypatch.delenv("PYTEST_CURRENT_TEST")
+    monkeypatch.delenv("PREGRADE_SKIP_OCR", raising=False)
+    sizes = []
+    monkeypatch.setattr(card_identity.pytesseract, "image_to_string", lambda image, **k: sizes.append(image.size) or "")
+    monkeypatch.setattr(card_identity, "parse_card_number_from_crop", lambda crop: None)
+    monkeypatch.setattr(card_identity, "wotc_number_fallback", lambda *a, **k: (None, {}))
+
+    def no_header_ocr(image):
+        raise AssertionError("header OCR should not run")
+
+    monkeypatch.setattr(card_identity, "_detect_card_type_early", no_header_ocr)
+
+    photo = np.full((1240, 944, 3), 30, dtype=np.uint8)
+    photo[100:1140, 100:844] = _trainer_card((40, 90, 210))
+    frame = CardFrame(Image.fromarray(photo))
+    identity = card_identity.extract_card_identity(frame.image, frame=frame)
+    trace = identity.details["trace"]
+    assert trace["early_card_type"] == "trainer"
+    assert trace["header_band"]["method"] == "heuristic"
+    assert identity.card_type == "trainer" and identity.trainer_subtype == "item"
+    # No full-card OCR pass for the type or the subtype.
+    assert frame.warped.size not in sizes
@@ -0,0 +1,61 @@
+"""Tests for the PIL / numpy boundary helpers and array-accepting entry points."""
+
+import numpy as np
+import pytest
+from PIL import Image, ImageDraw
+
+from services.card_warp import warp_card, warp_card_array, detect_card_quad
+from services.grading.corners import detect_corner_defects
+from services.image_arrays import as_pil, as_rgb_array, image_size
+
+
+def _card_photo() -> Image.Image:
+    img = Image.new("RGB", (800, 1000), color=(30, 30, 30))
+    draw = ImageDraw.Draw(img)
+    draw.rectangle([160, 165, 640, 835], fill=(230, 210, 90))
+    return img
+
+
+class TestAsRgbArray:
+    def test_rgb_array_is_returned_without_copy(self):
+        arr = np.zeros((10, 12, 3), dtype=np.uint8)
+        assert as_rgb_array(arr) is arr
+
+    def test_gray_and_rgba_arrays_normalized(self):
+        gray = np.full((4, 5), 7, dtype=np.uint8)
+        assert as_rgb_array(gray).shape == (4, 5, 3)
+        rgba = np.zeros((4, 5, 4), dtype=np.uint8)
+        out = as_rgb_array(rgba)
+        assert out.shape == (4, 5, 3)
+        assert out.flags["C_CONTIGUOUS"]
+
+    def test_pil_matches_convert(self):
+        img = Image.new("L", (6, 4), color=99)
+        assert np.array_equal(as_rgb_array(img), np.array(img.convert("RGB")))
+
+    def test_rejects_non_uint8(self):
+        with pytest.raises(ValueError):
+            as_rgb_array(np.zeros((4, 4, 3), dtype=np.float32))
+
+    def test_as_pil_and_size(self):
+        arr = np.zeros((10, 12, 3), dtype=np.uint8)
+        assert as_pil(arr).size == (12, 10)
+        assert image_size(arr) == (12, 10)
+
+
+class TestArrayEntryPoints:
+    def test_detect_quad_accepts_array(self):
+        img = _card_photo()
+        quad_pil, _ = detect_card_quad(img)
+        quad_arr, _ = detect_card_quad(np.array(img))
+        assert quad_pil is not None
+        assert np.array_equal(quad_pil, quad_arr)
+
+    def test_warp_array_matches_pil_warp(self):
+        img = _card_photo()
+        quad, _ = detect_card_quad(img)
+        assert np.array_equal(np.array(warp_card(img, quad)), warp_card_array(np.array(img), quad))
+
+    def test_detector_accepts_array(self):
+        img = _card_photo().resize((744, 1040))
+        assert detect_corner_defects(img).severity == detect_corner_defects(np.array(img)).severity
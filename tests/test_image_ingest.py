@@ -0,0 +1,92 @@
+"""Tests for decode-once image ingestion.
+
+These tests verify:
+1. The content hash is derived from the encoded bytes
+2. Large JPEGs are decoded at reduced size via draft mode; small ones (and full-resolution requests) are not
+3. EXIF orientation is applied
+4. Oversized uploads are rejected before decoding
+"""
+
+import hashlib
+import io
+
+import pytest
+from PIL import Image
+
+from services.image_ingest import (
+    FULL_RESOLUTION,
+    ImageTooLargeError,
+    ingest_image_bytes,
+)
+
+
+def _encode(img: Image.Image, fmt: str, **kwargs) -> bytes:
+    buf = io.BytesIO()
+    img.save(buf, format=fmt, **kwargs)
+    return buf.getvalue()
+
+
+class TestIngestBasics:
+    def test_hash_is_sha256_of_bytes(self):
+        data = _encode(Image.new("RGB", (300, 400), color=(10, 20, 30)), "PNG")
+        ingested = ingest_image_bytes(data)
+        assert ingested.content_hash == hashlib.sha256(data).hexdigest()
+
+    def test_png_is_full_decode_rgb(self):
+        data = _encode(Image.new("RGBA", (300, 400), color=(10, 20, 30, 255)), "PNG")
+        ingested = ingest_image_bytes(data)
+        assert ingested.image.mode == "RGB"
+        assert ingested.image.size == (300, 400)
+        assert ingested.draft_scale == 1
+        assert ingested.source_format == "PNG"
+
+    def test_invalid_bytes_raise(self):
+        with pytest.raises(Exception):
+            ingest_image_bytes(b"not an image")
+
+
+class TestDraftDecoding:
+    def test_large_jpeg_uses_draft(self):
+        data = _encode(Image.new("RGB", (3200, 4000), color=(200, 180, 60)), "JPEG")
+        ingested = ingest_image_bytes(data, working_max_side=1000)
+        assert ingested.source_size == (3200, 4000)
+        assert ingested.draft_scale > 1
+        assert max(ingested.image.size) >= 1000
+        assert max(ingested.image.size) < 4000
+
+    def test_small_jpeg_is_not_drafted(self):
+        data = _encode(Image.new("RGB", (800, 1000), color=(200, 180, 60)), "JPEG")
+        ingested = ingest_image_bytes(data, working_max_side=1000)
+        assert ingested.draft_scale == 1
+        assert ingested.image.size == (800, 1000)
+
+    def test_full_resolution_skips_draft(self):
+        data = _encode(Image.new("RGB", (3200, 4000), color=(200, 180, 60)), "JPEG")
+        ingested = ingest_image_bytes(data, working_max_side=FULL_RESOLUTION)
+        assert ingested.draft_scale == 1
+        assert ingested.image.size == (3200, 4000)
+
+
+class TestExifOrientation:
+    def test_rotated_jpeg_is_transposed(self):
+        img = Image.new("RGB", (400, 300), color=(50, 60, 70))
+        exif = Image.Exif()
+        exif[0x0112] = 6  # rotate 90 CW on display
+        data = _encode(img, "JPEG", exif=exif.tobytes())
+
+        ingested = ingest_image_bytes(data)
+        assert ingested.exif_transposed
+        assert ingested.image.size == (300, 400)
+
+    def test_no_orientation_tag_is_untouched(self):
+        data = _encode(Image.new("RGB", (400, 300)), "JPEG")
+        ingested = ingest_image_bytes(data)
+        assert not ingested.exif_transposed
+        assert ingested.image.size == (400, 300)
+
+
+class TestPixelCap:
+    def test_oversized_upload_rejected(self):
+        data = _encode(Image.new("RGB", (500, 500)), "PNG")
+        with pytest.raises(ImageTooLargeError):
+            ingest_image_bytes(data, max_pixels=100_000)
@@ -0,0 +1,144 @@
+"""Tests for the image store and on-demand grade overlays.
+
+These tests verify:
+1. Stored images are content-addressed and written by the background writer
+2. The store evicts the oldest files past its size limit
+3. PNG / WebP / JPEG encodings are selectable
+4. /v1/grade does no overlay work by default and serves overlays lazily by request_id
+5. include=["overlays"] writes them through the store
+"""
+
+import base64
+import io
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from api import handler_grade, image_store
+from api.handler import lambda_handler
+
+
+def _image(seed: int, size: int = 64) -> Image.Image:
+    rng = np.random.default_rng(seed)
+    return Image.fromarray(rng.integers(0, 255, (size, size, 3), dtype=np.uint8))
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("PREGRADE_IMAGE_STORE_DIR", tmp_path.as_posix())
+    monkeypatch.delenv("PREGRADE_IMAGE_STORE_MAX_BYTES", raising=False)
+    return tmp_path
+
+
+def test_save_is_content_addressed(store):
+    a = image_store.save_image(_image(0))
+    b = image_store.save_image(_image(0))
+    image_store.flush()
+    assert a == b and os.path.dirname(a) == store.as_posix()
+    assert os.listdir(store) == [os.path.basename(a)]
+    assert Image.open(a).tobytes() == _image(0).tobytes()
+
+
+def test_eviction_keeps_store_under_limit(store, monkeypatch):
+    monkeypatch.setenv("PREGRADE_IMAGE_STORE_MAX_BYTES", "30000")
+    paths = [image_store.save_image(_image(seed)) for seed in range(4)]  # ~12 KB each
+    image_store.flush()
+    assert sum(os.path.getsize(p) for p in store.iterdir()) <= 30000
+    assert os.path.exists(paths[-1]) and not os.path.exists(paths[0])
+
+
+@pytest.mark.parametrize("fmt,content_type,magic", [
+    ("png", "image/png", b"\x89PNG"),
+    ("webp", "image/webp", b"RIFF"),
+    ("jpeg", "image/jpeg", b"\xff\xd8"),
+])
+def test_encodings(fmt, content_type, magic):
+    data, ct = image_store.encode_image(_image(0), fmt)
+    assert ct == content_type and data.startswith(magic)
+    with pytest.raises(ValueError):
+        image_store.encode_image(_image(0), "gif")
+
+
+def _card_b64(seed: int) -> dict:
+    rng = np.random.default_rng(seed)
+    photo = np.full((1000, 800, 3), 30, dtype=np.uint8)
+    card = np.full((670, 480, 3), (230, 210, 90), dtype=np.uint8)
+    card[40:400, 40:440] = cv2.GaussianBlur(rng.integers(0, 255, (360, 400, 3), dtype=np.uint8), (9, 9), 0)
+    photo[165:835, 160:640] = card
+    buf = io.BytesIO()
+    Image.fromarray(photo).save(buf, format="PNG")
+    return {"encoding": "base64", "data": base64.b64encode(buf.getvalue()).decode("ascii")}
+
+
+def _event(method: str, path: str, payload=None, query=None) -> dict:
+    return {
+        "httpMethod": method,
+        "path": path,
+        "headers": {"content-type": "application/json"},
+        "queryStringParameters": query,
+        "body": json.dumps(payload) if payload is not None else None,
+        "isBase64Encoded": False,
+    }
+
+
+def test_grade_overlays_are_lazy(store, monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    payload = {"card_type": "pokemon", "front_image": _card_b64(0), "back_image": _card_b64(1)}
+    resp = lambda_handler(_event("POST", "/v1/grade", payload), None)
+    assert resp["statusCode"] == 200
+    body = json.loads(resp["body"])
+    request_id = body["request_id"]
+    cent = body["result"]["explanations"]["centering"]
+    assert cent == {
+        "front_overlay_url": f"/v1/grade/{request_id}/overlays/front",
+        "back_overlay_url": f"/v1/grade/{request_id}/overlays/back",
+    }
+    assert "overlay_front" not in body["result"]["trace"]["timings"]["stages"]
+    image_store.flush()
+    assert list(store.iterdir()) == []
+
+    got = lambda_handler(_event("GET", cent["back_overlay_url"], query={"format": "webp"}), None)
+    assert got["statusCode"] == 200 and got["isBase64Encoded"] is True
+    assert got["headers"]["content-type"] == "image/webp"
+    assert Image.open(io.BytesIO(base64.b64decode(got["body"]))).size == (744, 1040)
+
+    missing = lambda_handler(_event("GET", "/v1/grade/unknown_id/overlays/front"), None)
+    assert missing["statusCode"] == 404
+    assert json.loads(missing["body"])["error_code"] == "INVALID_REQUEST_FORMAT"
+    bad_side = lambda_handler(_event("GET", f"/v1/grade/{request_id}/overlays/left"), None)
+    assert bad_side["statusCode"] == 400
+
+
+def test_overlay_source_reads_canonicals_from_stage_cache(store, monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    payload = {"card_type": "pokemon", "front_image": _card_b64(0), "back_image": _card_b64(1)}
+    body = json.loads(lambda_handler(_event("POST", "/v1/grade", payload), None)["body"])
+    source = handler_grade._OVERLAY_SOURCES[body["request_id"]]
+    assert not any(isinstance(v, Image.Image) for v in vars(source).values())
+
+    # Canonical images evicted (here: a fresh, empty stage cache): no overlay.
+    monkeypatch.setenv("PREGRADE_STAGE_CACHE_MAX_BYTES", str(64 * 1024 * 1024))
+    url = body["result"]["explanations"]["centering"]["front_overlay_url"]
+    assert lambda_handler(_event("GET", url), None)["statusCode"] == 404
+
+
+def test_included_overlays_are_stored(store, monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    payload = {
+        "card_type": "pokemon",
+        "front_image": _card_b64(0),
+        "back_image": _card_b64(1),
+        "include": ["centering", "overlays"],
+        "overlay_format": "jpeg",
+    }
+    resp = lambda_handler(_event("POST", "/v1/grade", payload), None)
+    assert resp["statusCode"] == 200
+    cent = json.loads(resp["body"])["result"]["explanations"]["centering"]
+    image_store.flush()
+    for side in ("front", "back"):
+        path = cent[f"{side}_overlay_path"]
+        assert path.endswith(".jpg") and os.path.exists(path)
@@ -0,0 +1,99 @@
+"""Tests for per-role Tesseract model and dictionary selection.
+
+These tests verify:
+1. Each OCR role gets its own model, defaulting to eng
+2. Name OCR gets a user-words file of card names, number OCR a user-patterns file
+3. A local tessdata directory and disabling dictionaries are honoured
+4. Identity extraction passes the role's model and dictionaries to tesseract
+"""
+
+import shlex
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from services import card_identity
+from services.ocr_config import tesseract_args
+
+
+@pytest.fixture(autouse=True)
+def ocr_env(monkeypatch, tmp_path):
+    for name in ("PREGRADE_TESSDATA_DIR", "PREGRADE_OCR_DICTIONARIES",
+                 "PREGRADE_OCR_MODEL_NAME", "PREGRADE_OCR_MODEL_NUMBER", "PREGRADE_OCR_MODEL_TEXT"):
+        monkeypatch.delenv(name, raising=False)
+    monkeypatch.setenv("PREGRADE_OCR_DICT_DIR", str(tmp_path / "dicts"))
+    return tmp_path
+
+
+def _option(config: str, flag: str) -> str:
+    parts = shlex.split(config)
+    return parts[parts.index(flag) + 1]
+
+
+def test_default_models_and_base_config_kept():
+    for role in ("name", "number", "text"):
+        args = tesseract_args(role, "--psm 7 --oem 1")
+        assert args["lang"] == "eng"
+        assert args["config"].startswith("--psm 7 --oem 1")
+    assert "--user" not in tesseract_args("text", "--psm 6")["config"]
+
+
+def test_models_per_role(monkeypatch):
+    monkeypatch.setenv("PREGRADE_OCR_MODEL_NUMBER", "digits")
+    monkeypatch.setenv("PREGRADE_OCR_MODEL_NAME", "eng_fast")
+    assert tesseract_args("number", "")["lang"] == "digits"
+    assert tesseract_args("name", "")["lang"] == "eng_fast"
+    assert tesseract_args("text", "")["lang"] == "eng"
+
+
+def test_unknown_role_rejected():
+    with pytest.raises(ValueError):
+        tesseract_args("art", "")
+
+
+def test_name_words_file():
+    with open(_option(tesseract_args("name", "--psm 7")["config"], "--user-words"), encoding="utf-8") as f:
+        words = set(f.read().split())
+    assert {"Pikachu", "pikachu", "Charizard", "Professor", "Energy"} <= words
+
+
+def test_number_patterns_file():
+    with open(_option(tesseract_args("number", "--psm 7")["config"], "--user-patterns"), encoding="utf-8") as f:
+        patterns = f.read().split()
+    assert "\\d/\\d\\d\\d" in patterns and "\\d\\d\\d/\\d\\d\\d" in patterns
+
+
+def test_dictionary_files_written_once(ocr_env):
+    first = tesseract_args("name", "")["config"]
+    assert tesseract_args("name", "--psm 8")["config"].endswith(first)
+    assert len(list((ocr_env / "dicts").iterdir())) == 1
+
+
+def test_tessdata_dir_and_dictionaries_off(monkeypatch, tmp_path):
+    monkeypatch.setenv("PREGRADE_TESSDATA_DIR", str(tmp_path / "my models"))
+    monkeypatch.setenv("PREGRADE_OCR_DICTIONARIES", "0")
+    config = tesseract_args("name", "--psm 7")["config"]
+    assert _option(config, "--tessdata-dir") == str(tmp_path / "my models")
+    assert "--user-words" not in config
+
+
+def test_identity_uses_role_args(monkeypatch):
+    monkeypatch.delenv("PYTEST_CURRENT_TEST")
+    monkeypatch.delenv("PREGRADE_SKIP_OCR", raising=False)
+    monkeypatch.delenv("PREGRADE_ENABLE_ENRICHMENT", raising=False)
+    monkeypatch.setenv("PREGRADE_OCR_MODEL_NUMBER", "digits")
+    calls = []
+    monkeypatch.setattr(
+        card_identity.pytesseract, "image_to_string", lambda image, **k: calls.append(k) or ""
+    )
+    monkeypatch.setattr(card_identity, "parse_card_number_from_crop", lambda crop: None)
+
+    photo = np.full((1240, 944, 3), 30, dtype=np.uint8)
+    photo[100:1140, 100:844] = (230, 210, 90)
+    card_identity.extract_card_identity(Image.fromarray(photo), requested_card_type="pokemon")
+
+    number_calls = [k for k in calls if "--user-patterns" in k["config"]]
+    name_calls = [k for k in calls if "--user-words" in k["config"]]
+    assert number_calls and all(k["lang"] == "digits" for k in number_calls)
+    assert name_calls and all(k["lang"] == "eng" for k in name_calls)
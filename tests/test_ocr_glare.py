@@ -0,0 +1,123 @@
+"""Tests for glare-aware OCR region pruning.
+
+These tests verify:
+1. Glare coverage is measured per box; white card stock around print is not glare
+2. WOTC subcrops washed out by glare never reach tesseract
+3. Identity extraction skips glary name/number regions and traces why
+"""
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from services import card_identity, card_identity_wotc
+from services.card_frame import CardFrame
+from services.grading.photo_quality import box_glare_ratio, glare_mask, ocr_glare_mask
+
+
+def _white_trainer_card() -> np.ndarray:
+    """Well-exposed Trainer card with a white body (saturated paper, black text)."""
+    card = np.full((1040, 744, 3), (235, 205, 60), dtype=np.uint8)
+    card[30:1010, 30:714] = 253
+    ink = (15, 15, 15)
+    cv2.putText(card, "TRAINER", (50, 75), cv2.FONT_HERSHEY_SIMPLEX, 0.9, ink, 2)
+    cv2.putText(card, "Potion", (70, 140), cv2.FONT_HERSHEY_SIMPLEX, 1.5, ink, 3)
+    card[180:560, 60:684] = (120, 160, 200)
+    for y in range(620, 820, 40):
+        cv2.putText(card, "Heal 30 damage from 1 of your Pokemon.", (60, y), cv2.FONT_HERSHEY_SIMPLEX, 0.7, ink, 2)
+    cv2.putText(card, "Illus. 5ban Graphics", (50, 985), cv2.FONT_HERSHEY_SIMPLEX, 0.5, ink, 1)
+    cv2.putText(card, "145/198", (590, 985), cv2.FONT_HERSHEY_SIMPLEX, 0.6, ink, 1)
+    return card
+
+
+@pytest.fixture
+def tesseract_calls(monkeypatch):
+    # The real OCR path, with tesseract replaced by a recorder.
+    monkeypatch.delenv("PREGRADE_SKIP_OCR", raising=False)
+    monkeypatch.delenv("PREGRADE_ENABLE_ENRICHMENT", raising=False)
+    calls = []
+
+    def fake(image, *args, **kwargs):
+        calls.append(image.size)
+        return ""
+
+    monkeypatch.setattr(card_identity.pytesseract, "image_to_string", fake)
+    monkeypatch.setattr(card_identity, "parse_card_number_from_crop", lambda crop: None)
+    return calls
+
+
+def test_box_glare_ratio():
+    gray = np.zeros((100, 100), dtype=np.uint8)
+    gray[:50, :] = 255
+    mask = glare_mask(gray)
+    assert box_glare_ratio(mask, (0, 0, 100, 100)) == 0.5
+    assert box_glare_ratio(mask, (0, 0, 100, 25)) == 1.0
+    assert box_glare_ratio(mask, (0, 60, 100, 100)) == 0.0
+    assert box_glare_ratio(mask, (10, 10, 10, 10)) == 0.0
+
+
+def test_white_card_stock_is_not_glare():
+    gray = cv2.cvtColor(_white_trainer_card(), cv2.COLOR_RGB2GRAY)
+    assert box_glare_ratio(glare_mask(gray), (0, 0, 744, 1040)) > 0.5
+    mask = ocr_glare_mask(gray)
+    for region in (
+        card_identity.NAME_REGION_TRAINER_A,
+        card_identity.NAME_REGION_TRAINER_B,
+        card_identity.NAME_REGION_TRAINER_C,
+        card_identity.CARD_NUMBER_BR_WIDE,
+        card_identity.CARD_NUMBER_BR_TIGHT,
+    ):
+        assert card_identity._region_glare(mask, region) < 0.05
+
+    # A blown-out patch with no print in it is still glare.
+    blank = np.full((1040, 744), 200, dtype=np.uint8)
+    blank[850:, 400:] = 255
+    assert box_glare_ratio(ocr_glare_mask(blank), (400, 850, 744, 1040)) == 1.0
+
+
+def test_wotc_skips_glary_subcrops(tesseract_calls):
+    card = np.full((1040, 744, 3), 200, dtype=np.uint8)
+    card[850:, 400:] = 255
+    image = Image.fromarray(card)
+    mask = ocr_glare_mask(cv2.cvtColor(card, cv2.COLOR_RGB2GRAY))
+
+    number, meta = card_identity_wotc.wotc_number_fallback(image, glare_mask=mask)
+    assert number is None and tesseract_calls == []
+    assert [s["region"] for s in meta["glare_skipped"]] == ["sub_0.2_0.15", "sub_0.3_0.25", "sub_0.35_0.3"]
+
+    card_identity_wotc.wotc_number_fallback(image)
+    assert len(tesseract_calls) == 3 * 9 * 3
+
+
+def test_identity_skips_glary_regions(card_photo, tesseract_calls, monkeypatch):
+    monkeypatch.delenv("PYTEST_CURRENT_TEST")  # pytest sets it again for each phase
+    clean = CardFrame(Image.fromarray(card_photo()))
+    identity = card_identity.extract_card_identity(clean.image, requested_card_type="pokemon", frame=clean)
+    assert identity.details["trace"]["ocr_glare_skipped"] == []
+    clean_calls = len(tesseract_calls)
+
+    tesseract_calls.clear()
+    glary = CardFrame(Image.fromarray(card_photo()))
+    glary.warped_rgb  # warp before the glare is painted onto the card
+    rgb = glary.warped_rgb.copy()
+    rgb[:200] = 255
+    rgb[-150:] = 255
+    glary.__dict__["warped_rgb"] = rgb
+    glary.__dict__["warped"] = Image.fromarray(rgb)
+
+    identity = card_identity.extract_card_identity(glary.image, requested_card_type="pokemon", frame=glary)
+    skipped = [s["region"] for s in identity.details["trace"]["ocr_glare_skipped"]]
+    assert {"name_0", "name_1", "bottom_right:tight", "bottom_right:wide"} <= set(skipped)
+    assert any(r.startswith("bottom_right:wotc_") for r in skipped)
+    assert len(tesseract_calls) < clean_calls
+
+
+def test_white_trainer_card_skips_nothing(tesseract_calls, monkeypatch):
+    monkeypatch.delenv("PYTEST_CURRENT_TEST")
+    photo = np.full((1240, 944, 3), 30, dtype=np.uint8)
+    photo[100:1140, 100:844] = _white_trainer_card()
+    frame = CardFrame(Image.fromarray(photo))
+    identity = card_identity.extract_card_identity(frame.image, requested_card_type="trainer", frame=frame)
+    assert identity.details["trace"]["ocr_glare_skipped"] == []
+    assert tesseract_calls
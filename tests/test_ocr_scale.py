@@ -0,0 +1,49 @@
+"""Tests for OCR input resolution normalization.
+
+These tests verify:
+1. Text height is measured from ink components, in either polarity
+2. Crops are rescaled to the target text height, or by the fallback factor
+3. The OCR preprocessors no longer blow up crops that already have large text
+"""
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from services.card_identity import _preprocess_image, _preprocess_name_region
+from services.ocr_scale import TARGET_X_HEIGHT, measure_text_height, resize_for_ocr
+
+
+def _text(font_scale: float, dark_on_light: bool = True, size=(400, 90)) -> Image.Image:
+    bg, ink = (235, 20) if dark_on_light else (20, 235)
+    arr = np.full((size[1], size[0]), bg, dtype=np.uint8)
+    cv2.putText(arr, "025 198 HP", (8, size[1] * 2 // 3), cv2.FONT_HERSHEY_SIMPLEX, font_scale, ink, 2)
+    return Image.fromarray(arr)
+
+
+@pytest.mark.parametrize("dark_on_light", [True, False])
+def test_measures_glyph_height(dark_on_light):
+    small, large = measure_text_height(_text(0.6, dark_on_light)), measure_text_height(_text(1.8, dark_on_light))
+    assert 12 <= small <= 20
+    assert large == pytest.approx(3 * small, rel=0.2)
+
+
+def test_blank_crop_is_unmeasurable():
+    assert measure_text_height(Image.new("L", (200, 50), 128)) is None
+    assert resize_for_ocr(Image.new("L", (200, 50), 128), fallback=2.0).size == (400, 100)
+
+
+@pytest.mark.parametrize("font_scale", [0.5, 1.0, 2.5])
+def test_rescales_to_target_height(font_scale):
+    out = resize_for_ocr(_text(font_scale, size=(600, 120)), fallback=1.0)
+    assert measure_text_height(out) == pytest.approx(TARGET_X_HEIGHT, rel=0.25)
+
+
+def test_preprocessors_follow_text_height():
+    large = _text(2.5, size=(600, 120))
+    assert _preprocess_image(large).size[0] < 2 * large.size[0]
+    assert _preprocess_name_region(large)[0].size[0] < 3 * large.size[0]
+
+    tiny = _text(0.35, size=(200, 40))
+    assert _preprocess_image(tiny).size[0] > 2 * tiny.size[0]
@@ -0,0 +1,100 @@
+"""Tests for orientation normalization of warped cards.
+
+These tests verify:
+1. Upright cards are left untouched
+2. Upside-down cards are rotated 180
+3. Sideways photos are re-warped with rolled corners (both directions)
+4. Decisions (and their cost) are reported on the frame
+"""
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from services.card_frame import CardFrame
+from services.card_warp import warp_card_best_effort_array
+from services.orientation import normalize_orientation
+
+
+def _create_card(w: int = 744, h: int = 1040) -> np.ndarray:
+    """Card-like layout: name header, art window in the top half, text lines below."""
+    img = np.full((h, w, 3), (235, 205, 60), dtype=np.uint8)
+    img[30:h - 30, 30:w - 30] = (240, 240, 235)
+    cv2.putText(img, "Pikachu", (60, 95), cv2.FONT_HERSHEY_SIMPLEX, 1.6, (10, 10, 10), 4)
+    cv2.putText(img, "60 HP", (560, 95), cv2.FONT_HERSHEY_SIMPLEX, 1.0, (10, 10, 10), 3)
+
+    rng = np.random.default_rng(0)
+    art = cv2.GaussianBlur(rng.integers(0, 255, (400, 640, 3), dtype=np.uint8), (31, 31), 0)
+    art = cv2.normalize(art, None, 0, 255, cv2.NORM_MINMAX)
+    cv2.circle(art, (320, 200), 120, (250, 220, 30), -1)
+    img[120:520, 52:692] = art
+
+    y = 600
+    for text in ["Gnaw  10", "Thunder Jolt  30", "Flip a coin. If tails, Pikachu", "does 10 damage to itself."]:
+        cv2.putText(img, text, (70, y), cv2.FONT_HERSHEY_SIMPLEX, 0.9, (20, 20, 20), 2)
+        y += 60
+    for text in ["weakness  resistance  retreat", "Illus. Mitsuhiro Arita   58/102"]:
+        cv2.putText(img, text, (60, y + 40), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (20, 20, 20), 1)
+        y += 40
+    return img
+
+
+def _photo(card: np.ndarray, rotation: int) -> np.ndarray:
+    """Place the card (rotated clockwise by `rotation` degrees) on a dark background."""
+    rotated = np.ascontiguousarray(np.rot90(card, -(rotation // 90)))
+    rotated = cv2.resize(rotated, (rotated.shape[1] * 3 // 4, rotated.shape[0] * 3 // 4))
+    photo = np.full((1400, 1400, 3), 30, dtype=np.uint8)
+    y0 = (1400 - rotated.shape[0]) // 2
+    x0 = (1400 - rotated.shape[1]) // 2
+    photo[y0:y0 + rotated.shape[0], x0:x0 + rotated.shape[1]] = rotated
+    return photo
+
+
+def _normalize(photo: np.ndarray):
+    warped, used, _reason, _debug, quad = warp_card_best_effort_array(photo)
+    assert used
+    return normalize_orientation(photo, warped, quad)
+
+
+def _close_to(card: np.ndarray, out: np.ndarray) -> bool:
+    return float(np.abs(out.astype(np.int16) - card.astype(np.int16)).mean()) < 20.0
+
+
+class TestNormalizeOrientation:
+    @pytest.mark.parametrize(
+        "rotation,expected",
+        [(0, "upright"), (180, "rotated_180"), (90, "rotated_90_cw"), (270, "rotated_90_ccw")],
+    )
+    def test_recovers_upright_card(self, rotation, expected):
+        card = _create_card()
+        out, decision = _normalize(_photo(card, rotation))
+        assert decision.orientation == expected
+        assert decision.corrected == (rotation != 0)
+        assert out.shape == card.shape
+        assert _close_to(card, out)
+
+    def test_featureless_card_left_untouched(self):
+        card = np.full((1040, 744, 3), (235, 205, 60), dtype=np.uint8)
+        card[30:-30, 30:-30] = (200, 40, 40)
+        warped, _used, _reason, _debug, quad = warp_card_best_effort_array(_photo(card, 0))
+        out, decision = normalize_orientation(_photo(card, 0), warped, quad)
+        assert out is warped
+        assert decision.orientation == "unknown"
+        assert not decision.corrected
+
+
+class TestFrameOrientation:
+    def test_frame_reports_decision(self):
+        frame = CardFrame(Image.fromarray(_photo(_create_card(), 180)))
+        decision = frame.orientation
+        assert decision is not None
+        assert decision.orientation == "rotated_180"
+        assert decision.cost_ms >= 0.0
+        assert frame.canonical.orientation["orientation"] == "rotated_180"
+
+    def test_disabled_by_env(self, monkeypatch):
+        monkeypatch.setenv("PREGRADE_DISABLE_ORIENTATION", "1")
+        frame = CardFrame(Image.fromarray(_photo(_create_card(), 180)))
+        assert frame.orientation is None
+        assert frame.canonical.orientation is None
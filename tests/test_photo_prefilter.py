@@ -0,0 +1,103 @@
+"""Tests for the photo quality prefilter and detector gate.
+
+These tests verify:
+1. The thumbnail prefilter passes a sharp photo and names why others fail
+2. grade_card skips the defect detectors on a clearly unusable canonical image,
+   and discards their results when they already ran in parallel
+3. /v1/analyze rejects unusable photos through the gatekeeper, before OCR
+4. /v1/grade rejects unusable photos with PHOTO_UNUSABLE
+"""
+
+import base64
+import io
+import json
+
+import numpy as np
+from PIL import Image
+
+from api.handler import lambda_handler
+from services.grading.grade import grade_card
+from services.grading.photo_quality import prefilter_photo
+
+
+def test_prefilter_reasons(card_photo):
+    assert prefilter_photo(card_photo()).usable
+
+    blurry = prefilter_photo(card_photo(blur=8))
+    assert not blurry.usable and blurry.reason_codes == ("PHOTO_TOO_BLURRY",)
+
+    dark = prefilter_photo((card_photo() * 0.05).astype(np.uint8))
+    assert dark.reason_codes == ("PHOTO_TOO_DARK",)
+
+    glare = card_photo()
+    glare[:500] = 255
+    assert prefilter_photo(glare).reason_codes == ("PHOTO_GLARE",)
+
+
+def test_grade_card_gates_detectors(card_photo, monkeypatch):
+    monkeypatch.setenv("PREGRADE_GRADE_PARALLELISM", "1")
+    back = card_photo(1)
+
+    sharp = grade_card(card_photo(), back)
+    assert sharp.trace["detector_gate"] == []
+    assert sharp.defects.corners_severity is not None
+
+    # Passes the (lenient) thumbnail prefilter, but the canonical image is mush.
+    soft = card_photo(blur=3)
+    assert prefilter_photo(soft).usable
+    gated = grade_card(Image.fromarray(soft), back)
+    assert gated.trace["detector_gate"] == ["PHOTO_TOO_BLURRY"]
+    assert gated.defects.corners_severity is None and gated.p_psa10 is None
+    assert gated.skipped == ("grade", "corners", "edges", "surface", "overlays")
+    assert gated.photo_quality is not None and not gated.photo_quality.usable
+    assert gated.centering is not None
+    assert "corners" not in gated.trace["timings"]["stages"]
+
+
+def test_gate_applied_to_parallel_detectors(card_photo, monkeypatch):
+    # With a pool the detectors start alongside photo quality; the gate
+    # discards whatever they report.
+    monkeypatch.setenv("PREGRADE_GRADE_PARALLELISM", "4")
+    gated = grade_card(card_photo(blur=3), card_photo(1))
+    assert gated.trace["detector_gate"] == ["PHOTO_TOO_BLURRY"]
+    assert gated.defects.corners_severity is None and gated.defects.details == {}
+    assert gated.skipped == ("grade", "corners", "edges", "surface", "overlays")
+    assert "corners" not in gated.trace["timings"]["stages"]
+
+
+def _b64(rgb: np.ndarray) -> dict:
+    buf = io.BytesIO()
+    Image.fromarray(rgb).save(buf, format="PNG")
+    return {"encoding": "base64", "data": base64.b64encode(buf.getvalue()).decode("ascii")}
+
+
+def _post(path: str, payload: dict) -> dict:
+    event = {
+        "httpMethod": "POST",
+        "path": path,
+        "headers": {"content-type": "application/json"},
+        "body": json.dumps(payload),
+        "isBase64Encoded": False,
+    }
+    return lambda_handler(event, None)
+
+
+def test_analyze_rejects_unusable_photo(card_photo, monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    resp = _post("/v1/analyze", {"card_type": "pokemon", "front_image": _b64(card_photo(blur=8))})
+    assert resp["statusCode"] == 200
+    result = json.loads(resp["body"])["result"]
+    assert result["gatekeeper_result"]["accepted"] is False
+    assert result["gatekeeper_result"]["reason_codes"] == ["PHOTO_TOO_BLURRY"]
+    assert result["card_identity"] is None
+
+
+def test_grade_rejects_unusable_photo(card_photo, monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    payload = {"card_type": "pokemon", "front_image": _b64(card_photo()), "back_image": _b64(card_photo(1, blur=8))}
+    resp = _post("/v1/grade", payload)
+    assert resp["statusCode"] == 400
+    body = json.loads(resp["body"])
+    assert body["error_code"] == "PHOTO_UNUSABLE"
+    assert [d["field"] for d in body["details"]] == ["back_image"]
+    assert body["details"][0]["issue"].startswith("PHOTO_TOO_BLURRY")
@@ -0,0 +1,101 @@
+"""Tests for preview (half / quarter resolution) grading.
+
+These tests verify:
+1. Preview scales are validated and give exact fractions of the canonical size
+2. Canonical-pixel lengths scale with the image and are unchanged at full size
+3. Preview grades agree with full resolution on a synthetic off-center card
+4. /v1/grade validates preview_scale
+"""
+
+import base64
+import io
+import json
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from api.handler import lambda_handler
+from services.grading.canonical import PREVIEW_SCALES, canonical_size, canonicalize
+from services.grading.features import CanonicalFeatures
+from services.grading.grade import grade_card
+from services.grading.surface import _is_textured_surface
+
+
+def _card(left: int = 40, top: int = 30) -> np.ndarray:
+    """Yellow-bordered card (744x1040) whose art window is offset by (left, top)."""
+    rng = np.random.default_rng(0)
+    card = np.full((1040, 744, 3), (235, 205, 60), dtype=np.uint8)
+    art = cv2.GaussianBlur(rng.integers(0, 255, (1040 - 60, 744 - 60, 3), dtype=np.uint8), (0, 0), 4)
+    card[top:top + art.shape[0], left:left + art.shape[1]] = cv2.normalize(art, None, 0, 255, cv2.NORM_MINMAX)
+    return card
+
+
+def _photo(card: np.ndarray) -> Image.Image:
+    photo = np.full((1400, 1200, 3), 30, dtype=np.uint8)
+    small = cv2.resize(card, (558, 780), interpolation=cv2.INTER_AREA)
+    photo[310:1090, 321:879] = small
+    return Image.fromarray(photo)
+
+
+def test_canonical_sizes():
+    assert canonical_size() == (744, 1040)
+    assert canonical_size(0.5) == (372, 520)
+    assert canonical_size(0.25) == (186, 260)
+    with pytest.raises(ValueError):
+        canonical_size(0.3)
+
+
+@pytest.mark.parametrize("scale", PREVIEW_SCALES)
+def test_canonicalize_at_preview_scale(scale):
+    cimg = canonicalize(_photo(_card()), scale)
+    assert cimg.image.size == canonical_size(scale)
+    assert cimg.warp_used
+
+
+def test_px_scales_canonical_lengths():
+    full = CanonicalFeatures(np.zeros((1040, 744, 3), dtype=np.uint8))
+    quarter = CanonicalFeatures(np.zeros((260, 186, 3), dtype=np.uint8))
+    assert full.scale == 1.0 and full.px(32) == 32
+    assert quarter.scale == 0.25 and quarter.px(32) == 8
+    assert quarter.px(2) == 1  # never below the minimum
+
+
+def test_edge_density_is_resolution_normalized():
+    gray = cv2.cvtColor(_card(), cv2.COLOR_RGB2GRAY)
+    _, full = _is_textured_surface(gray)
+    small = cv2.resize(gray, (186, 260), interpolation=cv2.INTER_AREA)
+    _, quarter = _is_textured_surface(small, scale=0.25)
+    _, raw = _is_textured_surface(small)
+    assert abs(quarter - full) < abs(raw - full)
+
+
+@pytest.mark.parametrize("scale,tolerance", [(0.5, 2.0), (0.25, 4.0)])
+def test_preview_centering_agrees_with_full(scale, tolerance):
+    # Borders are measured in whole preview pixels: ~1 px of a ~16 px total at quarter scale.
+    front, back = _photo(_card(left=40, top=30)), _photo(_card(left=30, top=30))
+    full = grade_card(front, back)
+    preview = grade_card(front, back, scale=scale)
+    assert preview.trace["scale"] == scale
+    assert preview.trace["centering"]["front_method"] == "border"
+    assert abs(preview.centering.lr_ratio - full.centering.lr_ratio) < tolerance
+    assert abs(preview.centering.tb_ratio - full.centering.tb_ratio) < tolerance
+
+
+def test_grade_rejects_invalid_preview_scale(monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 64), (200, 200, 200)).save(buf, format="PNG")
+    image = {"encoding": "base64", "data": base64.b64encode(buf.getvalue()).decode("ascii")}
+    payload = {"card_type": "pokemon", "front_image": image, "back_image": image, "preview_scale": 0.3}
+    event = {
+        "httpMethod": "POST",
+        "path": "/v1/grade",
+        "headers": {"content-type": "application/json"},
+        "body": json.dumps(payload),
+        "isBase64Encoded": False,
+    }
+    resp = lambda_handler(event, None)
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"])["error_code"] == "INVALID_FIELD_VALUE"
@@ -0,0 +1,128 @@
+"""Tests for front centering against per-printing reference scans.
+
+These tests verify:
+1. Store keys are validated and missing printings mean no reference (until added)
+2. A registered front reference gives front centering directly
+3. A rejected registration still constrains the border search
+4. /v1/grade validates the optional reference field
+"""
+
+import base64
+import io
+import json
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from api.handler import lambda_handler
+from services.grading.centering import _measure_border_widths, measure_centering
+from services.reference_store import load_card_reference, valid_reference_key
+
+_W, _H, _BORDER, _PAD = 744, 1040, 30, 60
+_ART = (_BORDER + 40, _BORDER + 50, _W - 2 * _BORDER - 80, 520)
+
+
+def _front(dx: float = 0.0, dy: float = 0.0, stripe: bool = False) -> np.ndarray:
+    """Synthetic front (yellow border, textured art) with its design shifted by (dx, dy) px."""
+    rng = np.random.default_rng(0)
+    canvas = np.full((_H + 2 * _PAD, _W + 2 * _PAD, 3), (235, 205, 60), dtype=np.uint8)
+    inner = cv2.GaussianBlur(rng.integers(0, 255, (_H - 2 * _BORDER, _W - 2 * _BORDER, 3), dtype=np.uint8), (0, 0), 4)
+    canvas[_PAD + _BORDER:_PAD + _H - _BORDER, _PAD + _BORDER:_PAD + _W - _BORDER] = cv2.normalize(
+        inner, None, 0, 255, cv2.NORM_MINMAX
+    )
+    m = np.float32([[1, 0, dx - _PAD], [0, 1, dy - _PAD]])
+    img = cv2.warpAffine(canvas, m, (_W, _H), flags=cv2.INTER_LINEAR)
+    if stripe:
+        # A printed line inside the border that the unconstrained scan mistakes for the art edge.
+        cv2.rectangle(img, (12, 12), (_W - 13, _H - 13), (120, 100, 30), 2)
+    return img
+
+
+def _write_reference(root, set_id: str, local_id: str, gray: np.ndarray, borders: float) -> None:
+    path = root / set_id / f"{local_id}.png"
+    path.parent.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(path.as_posix(), gray)
+    meta = {"borders": {side: borders for side in ("left", "right", "top", "bottom")}, "art_rect": list(_ART)}
+    path.with_suffix(".json").write_text(json.dumps(meta))
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    monkeypatch.setenv("PREGRADE_REFERENCE_DIR", tmp_path.as_posix())
+    return tmp_path
+
+
+@pytest.mark.parametrize(
+    "set_id,local_id,ok",
+    [("sv3", "125", True), ("base1", "4a", True), ("..", "1", False), ("sv3", "a/b", False), ("", "1", False), ("sv3", 125, False)],
+)
+def test_reference_keys_are_path_safe(set_id, local_id, ok):
+    assert valid_reference_key(set_id, local_id) is ok
+
+
+def test_missing_printing_has_no_reference(store):
+    assert load_card_reference("sv3", "999") is None
+    assert load_card_reference("..", "etc") is None
+
+
+def test_reference_added_later_is_loaded(store):
+    assert load_card_reference("sv3", "127") is None
+    _write_reference(store, "sv3", "127", cv2.cvtColor(_front(), cv2.COLOR_RGB2GRAY), _BORDER)
+    assert load_card_reference("sv3", "127").borders["left"] == _BORDER
+
+
+def test_front_registration_measures_centering(store):
+    _write_reference(store, "sv3", "125", cv2.cvtColor(_front(), cv2.COLOR_RGB2GRAY), _BORDER)
+    reference = load_card_reference("sv3", "125")
+    assert reference is not None and reference.art_rect == _ART
+
+    m = measure_centering(_front(9.0, -5.0), _front(), front_reference=reference)
+    assert m.details["front_method"] == "registration"
+    assert m.details["front_registration"]["reference"] == "sv3/125.png"
+    assert m.details["front_border_prior"] is False
+    left, right = _BORDER + 9.0, _BORDER - 9.0
+    assert abs(m.front_lr[0] - 100.0 * left / (left + right)) < 1.0
+    top, bottom = _BORDER - 5.0, _BORDER + 5.0
+    assert abs(m.front_tb[0] - 100.0 * top / (top + bottom)) < 1.0
+    assert m.details["front_inner_rect"] == (_ART[0] + 9, _ART[1] - 5, _ART[2], _ART[3])
+
+
+def test_rejected_registration_constrains_borders(store):
+    # Reference borders are right but its image does not match: no registration.
+    noise = np.random.default_rng(5).integers(0, 255, (_H, _W), dtype=np.uint8)
+    _write_reference(store, "sv3", "126", noise, _BORDER - 1)
+    reference = load_card_reference("sv3", "126")
+
+    front = _front(stripe=True)
+    assert _measure_border_widths(front)["left"] < 15
+
+    m = measure_centering(front, _front(), front_reference=reference)
+    assert m.details["front_method"] == "border"
+    assert m.details["front_border_prior"] is True
+    assert m.details["front_registration"] is None
+    assert all(abs(v - (_BORDER - 1)) <= 1 for v in m.details["front_borders"].values())
+
+
+def test_grade_rejects_invalid_reference(monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 64), (200, 200, 200)).save(buf, format="PNG")
+    image = {"encoding": "base64", "data": base64.b64encode(buf.getvalue()).decode("ascii")}
+    payload = {
+        "card_type": "pokemon",
+        "front_image": image,
+        "back_image": image,
+        "reference": {"set_id": "../..", "local_id": "1"},
+    }
+    event = {
+        "httpMethod": "POST",
+        "path": "/v1/grade",
+        "headers": {"content-type": "application/json"},
+        "body": json.dumps(payload),
+        "isBase64Encoded": False,
+    }
+    resp = lambda_handler(event, None)
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"])["error_code"] == "INVALID_FIELD_VALUE"
@@ -0,0 +1,181 @@
+"""Tests for the per-image stage cache.
+
+These tests verify:
+1. Entries are LRU-evicted by size and report where they came from
+   (memory entries are sized by estimate, not by pickling)
+2. The disk tier survives a new process-level cache
+3. Pipeline switches in the environment invalidate entries
+4. Re-grading reuses per-image stages, including with a re-shot back
+5. /v1/analyze leaves the front's canonical image for /v1/grade
+6. Centering entries are keyed by the reference scans' contents
+"""
+
+import base64
+import io
+import json
+import os
+
+import cv2
+import numpy as np
+import pytest
+from PIL import Image
+
+from api.handler import lambda_handler
+from services.grading.grade import _stage_keys, grade_card
+from services.grading.registration import load_reference_image
+from services.stage_cache import StageCache, estimate_size, image_key, stage_cache
+
+
+@pytest.fixture
+def fresh_cache(tmp_path, monkeypatch):
+    # A new disk dir gives a new process-level cache.
+    monkeypatch.setenv("PREGRADE_STAGE_CACHE_DIR", (tmp_path / "stages").as_posix())
+    monkeypatch.setenv("PREGRADE_GRADE_PARALLELISM", "1")
+    return stage_cache()
+
+
+def test_memory_lru_by_size():
+    cache = StageCache(max_bytes=2500)
+    blob = b"x" * 1000
+    cache.put("a", "s", blob)
+    cache.put("b", "s", blob)
+    assert cache.get("a", "s") == ("memory", blob)  # a is now most recent
+    cache.put("c", "s", blob)
+    assert cache.get("b", "s") == (None, None)
+    assert cache.get("a", "s")[0] == "memory"
+
+    calls = []
+    value, source = cache.get_or_compute("c", "s", lambda: calls.append(1))
+    assert (value, source, calls) == (blob, "memory", [])
+    assert cache.get_or_compute(None, "s", lambda: 7) == (7, "computed")
+    assert cache.get_or_compute(None, "s", lambda: 8) == (8, "computed")
+
+
+def test_memory_tier_sizes_without_pickling(monkeypatch):
+    import services.stage_cache as stage_cache_module
+
+    monkeypatch.setattr(stage_cache_module.pickle, "dumps", lambda *a, **k: pytest.fail("pickled"))
+    image = Image.new("RGB", (100, 50))
+    value = {"mask": np.zeros((10, 10), dtype=np.float32), "image": image}
+    assert estimate_size(value) >= 10 * 10 * 4 + 100 * 50 * 3
+    assert estimate_size(image) == 100 * 50 * 3
+
+    cache = StageCache(max_bytes=20_000)
+    cache.put("k", "canonical", value)
+    assert cache.get("k", "canonical") == ("memory", value)
+    assert cache.get("k", "canonical")[1] is value
+    cache.put("big", "canonical", Image.new("RGB", (100, 100)))
+    assert cache.get("big", "canonical") == (None, None)
+
+
+def test_disk_tier(tmp_path):
+    StageCache(max_bytes=0, disk_dir=tmp_path.as_posix()).put("k", "corners", {"severity": 0.2})
+    fresh = StageCache(max_bytes=1 << 20, disk_dir=tmp_path.as_posix())
+    assert fresh.get("k", "corners") == ("disk", {"severity": 0.2})
+    assert fresh.get("k", "corners") == ("memory", {"severity": 0.2})
+
+    small = StageCache(max_bytes=0, disk_dir=tmp_path.as_posix(), disk_max_bytes=230)
+    small.put("k2", "corners", b"y" * 200)
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+
+
+def test_pipeline_switches_invalidate(monkeypatch):
+    cache = StageCache(max_bytes=1 << 20)
+    monkeypatch.delenv("PREGRADE_DISABLE_ORIENTATION", raising=False)
+    cache.put("k", "canonical", 1)
+    monkeypatch.setenv("PREGRADE_DISABLE_ORIENTATION", "1")
+    assert cache.get("k", "canonical") == (None, None)
+
+
+def _comparable(result) -> dict:
+    out = result.to_dict()
+    out["trace"] = {k: v for k, v in out["trace"].items() if k not in ("timings", "cache")}
+    return out
+
+
+def test_regrade_reuses_stages(card_photo, fresh_cache):
+    front, back, reshot = card_photo(0), card_photo(1), card_photo(2)
+    first = grade_card(front, back, front_hash="f", back_hash="b")
+    assert set(first.trace["cache"].values()) == {"computed"}
+
+    again = grade_card(front, back, front_hash="f", back_hash="b")
+    assert set(again.trace["cache"].values()) == {"memory"}
+    assert _comparable(again) == _comparable(first)
+
+    new_back = grade_card(front, reshot, front_hash="f", back_hash="r")
+    assert new_back.trace["cache"] == {
+        "canonicalize_front": "memory",
+        "canonicalize_back": "computed",
+        "centering": "computed",
+        "corners": "memory",
+        "edges": "memory",
+        "surface": "memory",
+        "photo_quality": "memory",
+    }
+    assert _comparable(new_back)["centering"] == _comparable(grade_card(front, reshot))["centering"]
+
+    preview = grade_card(front, back, scale=0.5, front_hash="f", back_hash="b")
+    assert preview.trace["cache"]["canonicalize_front"] == "computed"
+    assert grade_card(front, back).trace["cache"] == {}
+
+
+def _b64(rgb: np.ndarray) -> dict:
+    buf = io.BytesIO()
+    Image.fromarray(rgb).save(buf, format="PNG")
+    return {"encoding": "base64", "data": base64.b64encode(buf.getvalue()).decode("ascii")}
+
+
+def _post(path: str, payload: dict) -> dict:
+    event = {
+        "httpMethod": "POST",
+        "path": path,
+        "headers": {"content-type": "application/json"},
+        "body": json.dumps(payload),
+        "isBase64Encoded": False,
+    }
+    resp = lambda_handler(event, None)
+    assert resp["statusCode"] == 200
+    return json.loads(resp["body"])
+
+
+def test_analyze_then_grade_shares_front(card_photo, fresh_cache, monkeypatch):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    monkeypatch.setenv("PREGRADE_SKIP_OCR", "1")
+    front, back = _b64(card_photo(0)), _b64(card_photo(1))
+    _post("/v1/analyze", {"card_type": "pokemon", "front_image": front})
+    body = _post("/v1/grade", {"card_type": "pokemon", "front_image": front, "back_image": back})
+    cache = body["result"]["trace"]["cache"]
+    assert cache["canonicalize_front"] == "memory"
+    assert cache["canonicalize_back"] == "computed"
+
+
+def _write_reference(path, value: int) -> None:
+    cv2.imwrite(path.as_posix(), np.full((1040, 744), value, dtype=np.uint8))
+    path.with_suffix(".json").write_text(json.dumps({"borders": {s: 30 for s in ("left", "right", "top", "bottom")}}))
+
+
+def test_centering_key_follows_reference_contents(tmp_path, monkeypatch):
+    back_ref = tmp_path / "back.png"
+    monkeypatch.setenv("PREGRADE_BACK_REFERENCE_PATH", back_ref.as_posix())
+    no_reference = _stage_keys("f", "b", None, 1.0)["centering"]
+
+    _write_reference(back_ref, 100)
+    with_back = _stage_keys("f", "b", None, 1.0)["centering"]
+    _write_reference(back_ref, 120)
+    os.utime(back_ref, ns=(1, 1))  # same path, new contents
+    replaced = _stage_keys("f", "b", None, 1.0)["centering"]
+    assert len({no_reference, with_back, replaced}) == 3
+
+    front_ref = tmp_path / "front.png"
+    _write_reference(front_ref, 50)
+    first = _stage_keys("f", "b", load_reference_image(front_ref.as_posix()), 1.0)["centering"]
+    _write_reference(front_ref, 60)
+    os.utime(front_ref, ns=(2, 2))
+    second = _stage_keys("f", "b", load_reference_image(front_ref.as_posix()), 1.0)["centering"]
+    assert first != second and first != replaced
+
+
+def test_image_key():
+    assert image_key(None) is None
+    assert image_key("abc") == "abc@1.0"
+    assert image_key("abc", 0.25) == "abc@0.25"
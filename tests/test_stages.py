@@ -0,0 +1,115 @@
+"""Tests for field-selective grading (the `include` parameter).
+
+These tests verify:
+1. Included fields resolve to the stages they depend on, transitively
+2. include values are validated
+3. grade_card runs only the needed stages and reports the rest as skipped
+4. The default result computes every field except the rendered overlays
+5. /v1/grade and /v1/analyze reject unknown fields
+"""
+
+import base64
+import io
+import json
+
+import pytest
+from PIL import Image
+
+from api.handler import lambda_handler
+from services.grading.grade import grade_card
+from services.grading.stages import (
+    ANALYZE_FIELDS,
+    GRADE_FIELDS,
+    GRADE_STAGE_ORDER,
+    parse_include,
+    resolve_stages,
+    skipped_fields,
+)
+
+
+def test_all_fields_need_every_stage():
+    assert resolve_stages(None) == frozenset(GRADE_STAGE_ORDER)
+    assert skipped_fields(resolve_stages(None)) == ()
+
+
+def test_dependencies_are_transitive():
+    assert resolve_stages(["overlays"]) == {
+        "canonicalize_front",
+        "canonicalize_back",
+        "centering",
+        "overlay_front",
+        "overlay_back",
+    }
+    assert resolve_stages(["corners"]) == {"canonicalize_front", "photo_quality", "corners"}
+    assert skipped_fields(resolve_stages(["centering", "corners"])) == ("grade", "edges", "surface", "overlays")
+
+
+@pytest.mark.parametrize("value", ["grade", [], ["grade", 3], ["grade", "price"]])
+def test_parse_include_rejects_bad_values(value):
+    with pytest.raises(ValueError):
+        parse_include(value, GRADE_FIELDS)
+
+
+def test_parse_include():
+    assert parse_include(None, GRADE_FIELDS) is None
+    assert parse_include(["card_identity"], ANALYZE_FIELDS) == {"card_identity"}
+
+
+def test_grade_card_runs_only_included_stages(card_photo, monkeypatch):
+    monkeypatch.setenv("PREGRADE_GRADE_PARALLELISM", "1")
+    front, back = card_photo(0), card_photo(1)
+    full = grade_card(front, back)
+
+    corners = grade_card(front, back, include=["corners"])
+    assert list(corners.trace["timings"]["stages"]) == ["canonicalize_front", "photo_quality", "corners"]
+    assert corners.defects.corners_severity == full.defects.corners_severity
+    assert corners.defects.edges_severity is None
+    assert corners.centering is None and corners.p_psa10 is None
+    assert "centering" not in corners.explanations
+    assert list(corners.trace["canonical"]) == ["front"]
+
+    out = corners.to_dict()
+    assert out["skipped"] == ["grade", "centering", "edges", "surface", "overlays"]
+    assert out["centering"] is None and out["grade_distribution"] is None
+    assert out["defects"]["edges"] is None
+    assert list(out["defects"]["details"]) == ["corners"]
+
+    centering = grade_card(front, back, include=["centering"])
+    assert centering.centering == full.centering
+    assert "overlay_front" not in centering.trace["timings"]["stages"]
+
+
+def test_default_result_skips_only_overlays(card_photo, monkeypatch):
+    monkeypatch.setenv("PREGRADE_GRADE_PARALLELISM", "1")
+    result = grade_card(card_photo(0), card_photo(1))
+    out = result.to_dict()
+    assert out["skipped"] == ["overlays"]
+    assert all(out[k] is not None for k in ("grade_distribution", "p_psa10", "centering", "photo_quality"))
+    assert result.explanations == {}
+    # Overlays are drawn later from the cached canonical images, by content hash.
+    assert result.overlay_source is None
+    hashed = grade_card(card_photo(0), card_photo(1), front_hash="f" * 64, back_hash="b" * 64)
+    assert hashed.overlay_source.render("back").size == (744, 1040)
+
+
+def _post(path: str, payload: dict) -> dict:
+    event = {
+        "httpMethod": "POST",
+        "path": path,
+        "headers": {"content-type": "application/json"},
+        "body": json.dumps(payload),
+        "isBase64Encoded": False,
+    }
+    return lambda_handler(event, None)
+
+
+@pytest.mark.parametrize("path", ["/v1/grade", "/v1/analyze"])
+def test_handlers_reject_unknown_fields(monkeypatch, path):
+    monkeypatch.delenv("PREGRADE_API_KEYS", raising=False)
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 64), (200, 200, 200)).save(buf, format="PNG")
+    image = {"encoding": "base64", "data": base64.b64encode(buf.getvalue()).decode("ascii")}
+    payload = {"card_type": "pokemon", "front_image": image, "back_image": image, "include": ["price"]}
+    resp = _post(path, payload)
+    assert resp["statusCode"] == 400
+    assert json.loads(resp["body"])["error_code"] == "INVALID_FIELD_VALUE"